@@ -0,0 +1,251 @@
+# Mide el rendimiento de GenesPy sobre los casos de cases.py, barriendo el
+# tamaño de la población y la longitud del genoma. El resultado es un JSON con
+# generaciones/s, evaluaciones/s, tiempo por fase y memoria pico de cada
+# combinación. Con 'compare' (o con --baseline) se comparan dos resultados y se
+# señalan las regresiones.
+#
+# Uso (desde la raíz del repositorio):
+#
+#   PYTHONPATH=. python benchmarks/bench.py run --cases float,onemax \
+#       --sizes 500,5000 --lengths 10,100 --output current.json
+#   PYTHONPATH=. python benchmarks/bench.py compare baseline.json current.json
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+from genespy.stats import RunStats
+from cases import CASES
+
+
+def _int_list(text):
+    """ Convierte una lista separada por comas en una lista de enteros.
+
+    """
+
+    return [int(value) for value in text.split(',') if value]
+
+
+def run_case(name, n, length, generations, seed):
+    """ Ejecuta un caso una vez, con instrumentación.
+
+    Args:
+        name (str): El nombre del caso.
+        n (int): Individuos.
+        length (int): Longitud del genoma.
+        generations (int): Generaciones.
+        seed (int): Semilla del generador de números aleatorios.
+
+    Returns:
+        tuple: El tiempo total en segundos y los totales de *RunStats*.
+
+    """
+
+    random.seed(seed)
+    task, algorithm = CASES[name](n, length, seed)
+    stats = RunStats(fitness=False)
+
+    start = perf_counter()
+    algorithm(task, generations, stats)
+    wall = perf_counter() - start
+
+    return wall, stats.get_totals()
+
+
+def peak_memory(name, n, length, generations, seed):
+    """ Ejecuta un caso una vez bajo *tracemalloc* (que lo hace más lento, por
+    eso no se mezcla con la medición de tiempo), y regresa la memoria pico.
+
+    Returns:
+        int: La memoria pico en bytes, incluyendo la construcción de la tarea.
+
+    """
+
+    random.seed(seed)
+    tracemalloc.start()
+    try:
+        task, algorithm = CASES[name](n, length, seed)
+        algorithm(task, generations, None)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(cases, sizes, lengths, generations, repeat, seed, memory):
+    """ Ejecuta el barrido completo. De cada combinación se conserva la
+    repetición más rápida, la menos afectada por el ruido del sistema.
+
+    Returns:
+        dict: El resultado, listo para guardarse como JSON.
+
+    """
+
+    results = []
+    for name in cases:
+        for n in sizes:
+            for length in lengths:
+                best = None
+                for _ in range(repeat):
+                    wall, totals = run_case(name, n, length, generations, seed)
+                    if best is None or wall < best[0]:
+                        best = (wall, totals)
+
+                wall, totals = best
+                gens = totals['generations']
+                evaluations = totals['counters'].get('evaluations', 0)
+                result = {
+                    'case': name,
+                    'size': n,
+                    'length': length,
+                    'generations': gens,
+                    'seconds': wall,
+                    'gens_per_sec': gens / wall,
+                    'evaluations': evaluations,
+                    'evals_per_sec': evaluations / wall,
+                    'phases': {phase: times['wall'] for phase, times
+                               in totals['phases'].items()},
+                    'peak_memory': None
+                }
+                if memory:
+                    result['peak_memory'] = peak_memory(name, n, length,
+                                                        generations, seed)
+
+                results.append(result)
+                print('{case} n={size} length={length}: '
+                      '{gens_per_sec:.2f} gen/s, {evals_per_sec:.0f} eval/s'
+                      .format(**result), file=sys.stderr)
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'generations': generations,
+        'repeat': repeat,
+        'seed': seed,
+        'results': results
+    }
+
+
+def compare(baseline, current, threshold):
+    """ Compara dos resultados, por caso, tamaño y longitud. Una combinación
+    es una regresión si sus generaciones/s bajan, o su memoria pico sube, más
+    de *threshold* (fracción) respecto a la línea base.
+
+    Args:
+        baseline (dict): El resultado de referencia.
+        current (dict): El resultado nuevo.
+        threshold (float): La tolerancia, p.ej. 0.1 para un 10%.
+
+    Returns:
+        list: Las regresiones, como textos descriptivos.
+
+    """
+
+    reference = {(r['case'], r['size'], r['length']): r
+                 for r in baseline['results']}
+    regressions = []
+
+    for r in current['results']:
+        key = (r['case'], r['size'], r['length'])
+        old = reference.get(key)
+        if old is None:
+            continue
+
+        label = '{0} n={1} length={2}'.format(*key)
+        speed = r['gens_per_sec'] / old['gens_per_sec']
+        line = '{0}: {1:.2f} -> {2:.2f} gen/s ({3:+.1%})'.format(
+            label, old['gens_per_sec'], r['gens_per_sec'], speed - 1.0)
+        if speed < 1.0 - threshold:
+            regressions.append(line)
+        print(line, file=sys.stderr)
+
+        if r['peak_memory'] and old['peak_memory']:
+            growth = r['peak_memory'] / old['peak_memory']
+            line = '{0}: {1} -> {2} bytes peak ({3:+.1%})'.format(
+                label, old['peak_memory'], r['peak_memory'], growth - 1.0)
+            if growth > 1.0 + threshold:
+                regressions.append(line)
+            print(line, file=sys.stderr)
+
+    return regressions
+
+
+def _report_regressions(regressions):
+    """ Imprime las regresiones y regresa el código de salida del programa.
+
+    """
+
+    if not regressions:
+        print('No regressions.', file=sys.stderr)
+        return 0
+
+    print('REGRESSIONS:', file=sys.stderr)
+    for line in regressions:
+        print('  ' + line, file=sys.stderr)
+
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='GenesPy benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the benchmark sweep')
+    run.add_argument('--cases', default=','.join(CASES),
+                     help='comma separated cases (default: all)')
+    run.add_argument('--sizes', type=_int_list, default=[100, 1000],
+                     help='comma separated population sizes')
+    run.add_argument('--lengths', type=_int_list, default=[10, 50],
+                     help='comma separated genome lengths')
+    run.add_argument('--generations', type=int, default=20)
+    run.add_argument('--repeat', type=int, default=3,
+                     help='runs per combination (the fastest is kept)')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--no-memory', action='store_true',
+                     help='skip the tracemalloc run')
+    run.add_argument('--output', help='JSON file (default: stdout)')
+    run.add_argument('--baseline', help='compare against this JSON file')
+    run.add_argument('--threshold', type=float, default=0.1)
+
+    comp = commands.add_parser('compare', help='compare two JSON results')
+    comp.add_argument('baseline')
+    comp.add_argument('current')
+    comp.add_argument('--threshold', type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        return _report_regressions(compare(baseline, current, args.threshold))
+
+    cases = args.cases.split(',')
+    for name in cases:
+        if name not in CASES:
+            parser.error('unknown case: ' + name)
+
+    result = benchmark(cases, args.sizes, args.lengths, args.generations,
+                       args.repeat, args.seed, not args.no_memory)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return _report_regressions(compare(baseline, result, args.threshold))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
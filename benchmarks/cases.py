@@ -0,0 +1,189 @@
+# Casos de prueba de rendimiento. Cada caso construye una tarea de tamaño
+# arbitrario (individuos y longitud del genoma) y la ejecuta cierta cantidad de
+# generaciones. Los tres primeros reproducen los scripts de examples/; el resto
+# son casos sintéticos para medir el escalamiento.
+
+from random import Random
+from genespy.task import Task
+from genespy.utils import create_distance_matrix, travel_cost
+from genespy.mutators import mutate_flip, mutate_normal, mutate_insert, \
+    mutate_multiple, mutate_swap
+from genespy.crossovers import crossover_one_point, crossover_scx
+from genespy.selectors import select_vasconcelos
+from genespy.algorithms import general_ga, cos_mutation_ga
+from genespy.initiators import init_binary_pop, init_float_pop, \
+    init_permutation_pop
+
+
+def beale_pairs(genome, data):
+    """ Función de Beale (la de los ejemplos), sumada sobre cada par de genes
+    consecutivos, de modo que la longitud del genoma sea arbitraria.
+
+    Args:
+        genome (list): Un arreglo con los argumentos codificados en el genoma.
+        data (object): Un objeto arbitrario asociado al problema.
+
+    Returns:
+        float: El fitness asociado a los argumentos proporcionados.
+
+    """
+
+    total = 0.0
+    for i in range(0, len(genome) - 1, 2):
+        x = genome[i]
+        y = genome[i + 1]
+        total += (1.5 - x + x * y) ** 2.0 + \
+                 (2.25 - x + x * y ** 2.0) ** 2.0 + \
+                 (2.625 - x + x * y ** 3.0) ** 2.0
+
+    return total
+
+
+def sphere(genome, data):
+    """ Suma de cuadrados.
+
+    Args:
+        genome (list): Un arreglo con los argumentos codificados en el genoma.
+        data (object): Un objeto arbitrario asociado al problema.
+
+    Returns:
+        float: El fitness asociado a los argumentos proporcionados.
+
+    """
+
+    return sum(x * x for x in genome)
+
+
+def onemax(genome, data):
+    """ Cantidad de unos en el genoma.
+
+    Args:
+        genome (list): Un arreglo con los argumentos codificados en el genoma.
+        data (object): Un objeto arbitrario asociado al problema.
+
+    Returns:
+        float: El fitness asociado a los argumentos proporcionados.
+
+    """
+
+    return sum(genome)
+
+
+def _run_cos(task, generations, stats):
+    """ Ejecuta el algoritmo de los ejemplos (*cos_mutation_ga*, con elitismo
+    total), con la probabilidad de mutación máxima ya asignada a la tarea.
+
+    """
+
+    max_mp = task.get_mutator_args()['mp']
+
+    return cos_mutation_ga(task, max_mp, 100.0, 1.0, float('inf'),
+                           generations, stats=stats)
+
+
+def _run_general(task, generations, stats):
+    """ Ejecuta *general_ga* con 10% de elitismo.
+
+    """
+
+    return general_ga(task, 0.1, float('inf'), generations, stats=stats)
+
+
+def build_binary(n, length, seed):
+    """ Caso de examples/test-binary.py: *length* variables binarias con signo,
+    5 bits enteros y 5 de mantisa.
+
+    """
+
+    struct = tuple((True, 5, 5) for _ in range(length))
+
+    task = Task()
+    task.set_population(init_binary_pop(n, struct))
+    task.set_evals([beale_pairs], [-1.0])
+    task.set_mutator(mutate_flip, {'mp': 0.05})
+    task.set_crossover(crossover_one_point)
+    task.set_selector(select_vasconcelos, {'cp': 0.3})
+
+    return task, _run_cos
+
+
+def build_float(n, length, seed):
+    """ Caso de examples/test-float.py: *length* variables de punto flotante.
+
+    """
+
+    task = Task()
+    task.set_population(init_float_pop(n, length, -5.0, 5.0))
+    task.set_evals([beale_pairs], [-1.0])
+    task.set_mutator(mutate_normal, {'mp': 0.5, 'sd': 0.5, 'integer': False})
+    task.set_crossover(crossover_one_point)
+    task.set_selector(select_vasconcelos, {'cp': 0.3})
+
+    return task, _run_cos
+
+
+def build_salesman(n, length, seed):
+    """ Caso de examples/test-salesman.py, con *length* destinos generados al
+    azar (con la semilla dada) en la misma zona que el ejemplo.
+
+    """
+
+    rng = Random(seed)
+    locations = [{'id': i,
+                  'latitude': rng.uniform(19.30, 19.56),
+                  'longitude': rng.uniform(-99.30, -99.01)}
+                 for i in range(length + 1)]
+
+    task = Task()
+    task.set_data({'start': 0,
+                   'circuit': False,
+                   'cost': create_distance_matrix(locations)})
+    task.set_population(init_permutation_pop(n, list(range(1, length + 1))))
+    task.set_evals([travel_cost], [-1.0])
+    task.set_mutator(mutate_multiple,
+                     {'operators': [mutate_swap, mutate_insert], 'mp': 0.1})
+    task.set_crossover(crossover_scx)
+    task.set_selector(select_vasconcelos, {'cp': 0.3})
+
+    return task, _run_cos
+
+
+def build_sphere(n, length, seed):
+    """ Caso sintético: esfera de *length* dimensiones.
+
+    """
+
+    task = Task()
+    task.set_population(init_float_pop(n, length, -5.0, 5.0))
+    task.set_evals([sphere], [-1.0])
+    task.set_mutator(mutate_normal, {'mp': 0.1, 'sd': 0.3, 'integer': False})
+    task.set_crossover(crossover_one_point)
+    task.set_selector(select_vasconcelos, {'cp': 0.5})
+
+    return task, _run_general
+
+
+def build_onemax(n, length, seed):
+    """ Caso sintético: *OneMax* de *length* bits, con genomas empacados.
+
+    """
+
+    struct = tuple((False, 1, 0) for _ in range(length))
+
+    task = Task()
+    task.set_population(init_binary_pop(n, struct, packed=True))
+    task.set_evals([onemax], [1.0])
+    task.set_mutator(mutate_flip, {'mp': 1.0 / length})
+    task.set_crossover(crossover_one_point)
+    task.set_selector(select_vasconcelos, {'cp': 0.5})
+
+    return task, _run_general
+
+
+CASES = {
+    'binary': build_binary,
+    'float': build_float,
+    'salesman': build_salesman,
+    'sphere': build_sphere,
+    'onemax': build_onemax
+}
@@ -0,0 +1,112 @@
+# Un script de ejemplo, con una función objetivo asíncrona que consulta un
+# servicio de simulación (aquí, un servidor local que lo imita)
+
+import asyncio
+import json
+from random import uniform
+from genespy.task import Task
+from genespy.mutators import mutate_normal
+from genespy.crossovers import crossover_one_point
+from genespy.selectors import select_vasconcelos
+from genespy.algorithms import async_general_ga
+from genespy.initiators import init_float_pop
+
+
+async def simulation_handler(reader, writer):
+    """ Servidor local que imita un servicio de simulación lento. Recibe un
+    genoma por línea, en JSON, y responde con su evaluación después de una
+    demora variable.
+
+    Args:
+        reader (StreamReader): El flujo de entrada de la conexión.
+        writer (StreamWriter): El flujo de salida de la conexión.
+
+    """
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+
+        x, y = json.loads(line)
+        await asyncio.sleep(uniform(0.001, 0.01))
+
+        value = (1.5 - x + x * y) ** 2.0 + \
+                (2.25 - x + x * y ** 2.0) ** 2.0 + \
+                (2.625 - x + x * y ** 3.0) ** 2.0
+        writer.write((json.dumps(value) + '\n').encode())
+        await writer.drain()
+
+    writer.close()
+
+
+async def remote_evaluation_function(genome, data):
+    """ Función de evaluación asíncrona de ejemplo: consulta al servicio de
+    simulación.
+
+    Args:
+        genome (list): Un arreglo con los argumentos codificados en el genoma.
+        data (object): Un objeto arbitrario asociado al problema (aquí, la
+            dirección del servicio).
+
+    Returns:
+        float: El fitness asociado a los argumentos proporcionados.
+
+    """
+
+    reader, writer = await asyncio.open_connection(data['host'], data['port'])
+    try:
+        writer.write((json.dumps(genome) + '\n').encode())
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def my_example():
+    """ Esta función inicia el servicio, prepara la tarea y ejecuta el
+    algoritmo genético.
+
+    """
+
+    n = 200  # Individuos
+    gen = 30  # Generaciones máximas
+    cp = 0.3  # Probabilidad de cruza
+    mp = 0.2  # Probabilidad de mutación
+    elitism = 0.1  # Porcentaje de elitismo
+    duration = float('inf')  # Duración máxima en segundos
+    verbose = 10  # Frecuencia de reporte
+    concurrency = 50  # Llamadas simultáneas al servicio
+    timeout = 1.0  # Segundos máximos por llamada
+
+    server = await asyncio.start_server(simulation_handler, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    # Se crea la tarea
+    task = Task()
+    task.set_data({'host': '127.0.0.1', 'port': port})
+
+    # Se crea y asigna la población inicial
+    task.set_population(init_float_pop(n, 2, -5.0, 5.0))
+
+    # Se establecen funciones de cruza, mutacion y selección
+    task.set_evals([remote_evaluation_function], [-1.0])
+    task.set_mutator(mutate_normal, {'mp': mp, 'sd': 0.5, 'integer': False})
+    task.set_crossover(crossover_one_point)
+    task.set_selector(select_vasconcelos, {'cp': cp})
+
+    # Inicia el algoritmo
+    async with server:
+        sol = await async_general_ga(task,
+                                     elitism,
+                                     duration,
+                                     gen,
+                                     verbose,
+                                     concurrency=concurrency,
+                                     timeout=timeout)
+
+    print(sol)
+    print('Genome only:', sol.get_genome())
+
+
+asyncio.run(my_example())
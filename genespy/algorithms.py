@@ -15,6 +15,177 @@
 
 from time import time
 from math import floor, pi, cos
+from random import seed as random_seed
+from concurrent.futures import wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from multiprocessing import Process, Queue
+from queue import Empty
+from pickle import dumps
+from traceback import format_exc
+from .utils import spawn_random
+from .stopping import StopCriteria
+
+# Rondas seguidas sin individuos nuevos tras las que se desiste de completar
+# la población (p.ej. si el espacio de genomas distintos es muy pequeño)
+_MAX_EMPTY_ROUNDS = 10
+
+# Segundos entre revisiones del estado de las islas, mientras se esperan sus
+# poblaciones finales
+_POLL_PERIOD = 0.5
+
+# Fase que no mide nada, para correr sin instrumentación (ver _phase)
+_NO_PHASE = nullcontext()
+
+
+def _phase(stats, name):
+    """ Regresa el administrador de contexto que mide una fase (ver
+    *RunStats.phase*), o uno que no hace nada si no hay instrumentación.
+
+    Args:
+        stats (RunStats|None): La instrumentación.
+        name (str): El nombre de la fase.
+
+    Returns:
+        object: El administrador de contexto.
+
+    """
+
+    if stats is None:
+        return _NO_PHASE
+
+    return stats.phase(name)
+
+
+def _refill(task, interrupt=None, stats=None):
+    """ Completa la población hasta su tamaño deseado, evalúa a los
+    individuos nuevos y la ordena. Si se eliminan repetidos antes de evaluar
+    (ver *Task.set_dedupe*), la evaluación puede descartar parte de los
+    nuevos, así que se repite hasta completarla, o hasta acumular
+    *_MAX_EMPTY_ROUNDS* rondas seguidas sin individuos nuevos.
+
+    Args:
+        task (Task): La tarea, con su población ordenada.
+        interrupt (function|None): Función que indica si se debe detener la
+            evaluación.
+        stats (RunStats|None): La instrumentación.
+
+    """
+
+    size = task.get_size()
+    empty = 0
+    while empty < _MAX_EMPTY_ROUNDS:
+        with _phase(stats, 'adjust'):
+            grown = task.adjust_population_size()
+        if not grown:
+            break
+        with _phase(stats, 'evaluation'):
+            interrupted = task.evaluate(interrupt)
+        with _phase(stats, 'order'):
+            task.order_population()
+        if interrupted:
+            break
+        empty = empty + 1 if task.get_size() <= size else 0
+        size = task.get_size()
+
+
+def _generation_step(task, n_elite, interrupt=None, stats=None):
+    """ Ejecuta una generación del algoritmo genético genérico: conserva la
+    élite, aplica selección (y cruzamiento), mutación y evaluación, elimina
+    repetidos y ajusta el tamaño de la población. Al terminar, la población
+    queda ordenada.
+
+    Si la evaluación se interrumpe (ver *Task.evaluate*), los hijos sin
+    evaluar se descartan, y la población no se completa; la élite se conserva
+    siempre.
+
+    Con *stats* se mide cada fase y se registra el tamaño de la población
+    antes y después de eliminar repetidos. La población se ordena entonces
+    en su propia fase, antes de eliminar repetidos; el orden dentro de
+    *remove_duplicates* ya no cuesta, pues las llaves de orden están
+    memorizadas y la lista ya está ordenada.
+
+    Args:
+        task (Task): La tarea, con su población ordenada.
+        n_elite (int): Cantidad de individuos elite.
+        interrupt (function|None): Función que indica si se debe detener la
+            evaluación.
+        stats (RunStats|None): La instrumentación.
+
+    """
+
+    with _phase(stats, 'elite'):
+        elite_pop = task.get_subpopulation_copy(slice(n_elite))
+    with _phase(stats, 'selection'):
+        task.apply_selection()
+    with _phase(stats, 'mutation'):
+        task.mutate()
+    with _phase(stats, 'evaluation'):
+        interrupted = task.evaluate(interrupt)
+    with _phase(stats, 'elite'):
+        task.append_population(elite_pop, True)
+    if stats is not None:
+        with stats.phase('order'):
+            task.order_population()
+        stats.set_value('size_before_dedupe', task.get_size())
+    with _phase(stats, 'dedupe'):
+        task.remove_duplicates()
+    if stats is not None:
+        stats.set_value('size_after_dedupe', task.get_size())
+    if not interrupted:
+        _refill(task, interrupt, stats)
+
+
+async def _generation_step_async(task, n_elite, concurrency, timeout):
+    """ Versión asíncrona de *_generation_step*, que evalúa con
+    *Task.evaluate_async*.
+
+    Args:
+        task (Task): La tarea, con su población ordenada.
+        n_elite (int): Cantidad de individuos elite.
+        concurrency (int|None): Cantidad máxima de llamadas simultáneas.
+        timeout (float|None): Segundos máximos por llamada.
+
+    """
+
+    elite_pop = task.get_subpopulation_copy(slice(n_elite))
+    task.apply_selection()
+    task.mutate()
+    await task.evaluate_async(concurrency, timeout)
+    task.append_population(elite_pop, True)
+    task.remove_duplicates()
+    size = task.get_size()
+    empty = 0
+    while empty < _MAX_EMPTY_ROUNDS and task.adjust_population_size():
+        await task.evaluate_async(concurrency, timeout)
+        task.order_population()
+        empty = empty + 1 if task.get_size() <= size else 0
+        size = task.get_size()
+
+
+def _report_progress(task, g, report):
+    """ Reporta el avance de la generación actual, con la función *report* o
+    imprimiéndolo.
+
+    Args:
+        task (Task): La tarea, con su población ordenada.
+        g (int): La generación actual.
+        report (function|None): Función de reporte.
+
+    """
+
+    if report is not None:
+        report(
+            g,
+            task.get_individual(0).get_fitness(),
+            task.get_individual(0).get_genome()
+        )
+    else:
+        print('Generation:', g)
+        print(
+            'Best fitness:',
+            task.get_individual(0).get_fitness(),
+            '\n'
+        )
 
 
 def general_ga(task,
@@ -22,7 +193,10 @@ def general_ga(task,
                sec,
                gen=float('inf'),
                verbose=float('inf'),
-               report=None):
+               report=None,
+               checkpoint=None,
+               stats=None,
+               stop=None):
     """ Ejecuta una algoritmo genético genérico, con posibilidad de elitismo.
 
     Args:
@@ -36,6 +210,16 @@ def general_ga(task,
         report (function|None): Función de reporte. Recibirá la generación y
             mejor fitness de la iteración actual, cada tantas generaciones como
             se especifique según *verbose*.
+        checkpoint (Checkpointer|None): Guarda puntos de control periódicos
+            de la corrida. Si ya existe uno, la corrida se reanuda desde él.
+        stats (RunStats|None): Instrumentación de la corrida: tiempos por
+            fase, contadores y estadísticas del fitness de cada generación.
+        stop (StopCriterion|list|None): Criterios de paro adicionales (ver
+            *genespy.stopping*). Una lista se combina en un *StopCriteria*;
+            para consultar cuál se cumplió, se puede pasar uno directamente.
+            Si se cumplen durante una evaluación, incluida la inicial, los
+            individuos sin evaluar se descartan, y la población regresada
+            puede ser menor que la original.
 
     Returns:
         Individual: El individuo con mejor aptitud al momento de finalizar la
@@ -48,48 +232,71 @@ def general_ga(task,
     # Se inicia la toma de tiempo
     start_time = time()
 
+    # Se reanuda la corrida, si hay un punto de control
+    first_gen = 0
+    if checkpoint is not None:
+        first_gen = checkpoint.restore(task)
+
     # Se precalcula el número de individuos elite
     n_elite = floor(task.get_size() * elitism)
 
-    task.evaluate()
-    task.order_population()
+    # Se preparan los criterios de paro
+    interrupt = None
+    if stop is not None:
+        if isinstance(stop, (list, tuple)):
+            stop = StopCriteria(stop)
+        stop.start(task)
+        if stop.can_interrupt():
+            interrupt = stop.interrupt
+
+    # Los individuos restaurados conservan su fitness
+    if stats is not None:
+        task.set_stats(stats)
+    with _phase(stats, 'evaluation'):
+        interrupted = task.evaluate(interrupt)
+    with _phase(stats, 'order'):
+        task.order_population()
+
+    # Si los criterios de paro se cumplen en la evaluación inicial, no se
+    # ejecuta ninguna generación
+    if interrupted:
+        gen = first_gen
+        if verbose != inf:
+            print('Stopped by:', stop.describe(), '\n')
 
-    for g in range(gen):
+    last_gen = None
+    for g in range(first_gen, gen):
         task.set_generation(g)
 
-        elite_pop = task.get_subpopulation_copy(slice(n_elite))
-        task.apply_selection()
-        task.mutate()
-        task.evaluate()
-        task.append_population(elite_pop, True)
-        task.remove_duplicate_fitness()
-        if task.adjust_population_size():
-            task.evaluate()
-            task.order_population()
+        _generation_step(task, n_elite, interrupt, stats)
+        if stats is not None:
+            stats.end_generation(task, g)
 
         # Se verifica si se debe imprimir
-        if verbose != inf:
-            if g % verbose == 0:
-                if report is not None:
-                    report(
-                        g,
-                        task.get_individual(0).get_fitness(),
-                        task.get_individual(0).get_genome()
-                    )
-                else:
-                    print('Generation:', g)
-                    print(
-                        'Best fitness:',
-                        task.get_individual(0).get_fitness(),
-                        '\n'
-                    )
+        if verbose != inf and g % verbose == 0:
+            _report_progress(task, g, report)
+
+        last_gen = g
+        if checkpoint is not None:
+            checkpoint.update(task, g)
 
         # Verificamos si se ha cumplido el tiempo
         current_time = time() - start_time
         if current_time > sec:
             break
 
+        # Verificamos los criterios de paro
+        if stop is not None and stop.check(task):
+            if verbose != inf:
+                print('Stopped by:', stop.describe(), '\n')
+            break
+
+    if checkpoint is not None and last_gen is not None:
+        checkpoint.save(task, last_gen)
+
     task.set_generation(None)
+    if stats is not None:
+        task.set_stats(None)
 
     # Se regresa la solución (el mejor es el primer elemento)
     return task.get_individual(0)
@@ -102,7 +309,10 @@ def cos_mutation_ga(task,
                     sec,
                     gen=float('inf'),
                     verbose=float('inf'),
-                    report=None):
+                    report=None,
+                    checkpoint=None,
+                    stats=None,
+                    stop=None):
     """ Ejecuta una algoritmo genético genérico, con posibilidad de elitismo,
     que genera una probabilidad de mutación *mp* variable a lo largo de las
     generaciones, de acuerdo a una función coseno.
@@ -121,6 +331,16 @@ def cos_mutation_ga(task,
         report (function|None): Función de reporte. Recibirá la generación y
             mejor fitness de la iteración actual, cada tantas generaciones como
             se especifique según *verbose*.
+        checkpoint (Checkpointer|None): Guarda puntos de control periódicos
+            de la corrida. Si ya existe uno, la corrida se reanuda desde él.
+        stats (RunStats|None): Instrumentación de la corrida: tiempos por
+            fase, contadores y estadísticas del fitness de cada generación.
+        stop (StopCriterion|list|None): Criterios de paro adicionales (ver
+            *genespy.stopping*). Una lista se combina en un *StopCriteria*;
+            para consultar cuál se cumplió, se puede pasar uno directamente.
+            Si se cumplen durante una evaluación, incluida la inicial, los
+            individuos sin evaluar se descartan, y la población regresada
+            puede ser menor que la original.
 
     Returns:
         Individual: El individuo con mejor aptitud al momento de finalizar la
@@ -140,13 +360,40 @@ def cos_mutation_ga(task,
     # Calculamos la probabilidad de mutación para ésta generación
     task.set_mutator_arg('mp', max_mp)
 
+    # Se reanuda la corrida, si hay un punto de control
+    first_gen = 0
+    if checkpoint is not None:
+        first_gen = checkpoint.restore(task)
+
     # Se precalcula el número de individuos elite
     n_elite = floor(task.get_size() * elitism)
 
-    task.evaluate()
-    task.order_population()
+    # Se preparan los criterios de paro
+    interrupt = None
+    if stop is not None:
+        if isinstance(stop, (list, tuple)):
+            stop = StopCriteria(stop)
+        stop.start(task)
+        if stop.can_interrupt():
+            interrupt = stop.interrupt
+
+    # Los individuos restaurados conservan su fitness
+    if stats is not None:
+        task.set_stats(stats)
+    with _phase(stats, 'evaluation'):
+        interrupted = task.evaluate(interrupt)
+    with _phase(stats, 'order'):
+        task.order_population()
+
+    # Si los criterios de paro se cumplen en la evaluación inicial, no se
+    # ejecuta ninguna generación
+    if interrupted:
+        gen = first_gen
+        if verbose != inf:
+            print('Stopped by:', stop.describe(), '\n')
 
-    for g in range(gen):
+    last_gen = None
+    for g in range(first_gen, gen):
         task.set_generation(g)
 
         # Calculamos la probabilidad de mutación para ésta generación
@@ -154,39 +401,570 @@ def cos_mutation_ga(task,
                 'mp',
                 (cos(g * cycle_mp) * half_max_mp) + half_max_mp)
 
-        elite_pop = task.get_subpopulation_copy(slice(n_elite))
-        task.apply_selection()
-        task.mutate()
-        task.evaluate()
-        task.append_population(elite_pop, True)
-        task.remove_duplicate_fitness()
-        if task.adjust_population_size():
-            task.evaluate()
-            task.order_population()
+        _generation_step(task, n_elite, interrupt, stats)
+        if stats is not None:
+            stats.end_generation(task, g)
 
         # Se verifica si se debe imprimir
-        if verbose != inf:
-            if g % verbose == 0:
-                if report is not None:
-                    report(
-                        g,
-                        task.get_individual(0).get_fitness(),
-                        task.get_individual(0).get_genome()
-                    )
-                else:
-                    print('Generation:', g)
-                    print(
-                        'Best fitness:',
-                        task.get_individual(0).get_fitness(),
-                        '\n'
-                    )
+        if verbose != inf and g % verbose == 0:
+            _report_progress(task, g, report)
+
+        last_gen = g
+        if checkpoint is not None:
+            checkpoint.update(task, g)
 
         # Verificamos si se ha cumplido el tiempo
         current_time = time() - start_time
         if current_time > sec:
             break
 
+        # Verificamos los criterios de paro
+        if stop is not None and stop.check(task):
+            if verbose != inf:
+                print('Stopped by:', stop.describe(), '\n')
+            break
+
+    if checkpoint is not None and last_gen is not None:
+        checkpoint.save(task, last_gen)
+
     task.set_generation(None)
+    if stats is not None:
+        task.set_stats(None)
 
     # Se regresa la solución (el mejor es el primer elemento)
     return task.get_individual(0)
+
+
+async def async_general_ga(task,
+                           elitism,
+                           sec,
+                           gen=float('inf'),
+                           verbose=float('inf'),
+                           report=None,
+                           concurrency=None,
+                           timeout=None):
+    """ Versión asíncrona de *general_ga*, para funciones objetivo y de
+    restricción definidas con *async def* que esperan E/S (p.ej. un servicio
+    de simulación). En cada generación, las evaluaciones se ejecutan de forma
+    concurrente (ver *Task.evaluate_async*), y el resto del ciclo espera a
+    que terminen.
+
+    Se ejecuta dentro de un ciclo de eventos, p.ej.:
+
+    asyncio.run(async_general_ga(task, 0.1, 60))
+
+    Args:
+        task (Task): Un objeto *Task* con los parámetros y la población
+            requerida para la ejecución del algoritmo.
+        elitism (float): Porcentaje de individuos que se guardarán como elite
+            para la siguiente generación.
+        sec (float): Segundos que aproximadamente correrá el algoritmo.
+        gen (int): Generaciones que se ejecutara el algoritmo genético.
+        verbose (int): Indica cada cuantas generaciones se reportan avances.
+        report (function|None): Función de reporte (ver *general_ga*).
+        concurrency (int|None): Cantidad máxima de llamadas simultáneas a las
+            funciones asíncronas. *None* si no hay límite.
+        timeout (float|None): Segundos máximos por llamada. Un individuo cuya
+            evaluación excede el tiempo recibe el peor fitness posible.
+
+    Returns:
+        Individual: El individuo con mejor aptitud al momento de finalizar la
+            corrida.
+
+    """
+
+    inf = float('inf')
+
+    # Se inicia la toma de tiempo
+    start_time = time()
+
+    # Se precalcula el número de individuos elite
+    n_elite = floor(task.get_size() * elitism)
+
+    await task.evaluate_async(concurrency, timeout)
+    task.order_population()
+
+    for g in range(gen):
+        task.set_generation(g)
+
+        await _generation_step_async(task, n_elite, concurrency, timeout)
+
+        # Se verifica si se debe imprimir
+        if verbose != inf and g % verbose == 0:
+            _report_progress(task, g, report)
+
+        # Verificamos si se ha cumplido el tiempo
+        current_time = time() - start_time
+        if current_time > sec:
+            break
+
+    task.set_generation(None)
+
+    # Se regresa la solución (el mejor es el primer elemento)
+    return task.get_individual(0)
+
+
+def _breed(task, cp):
+    """ Genera dos descendientes para el algoritmo de estado estable. Los
+    padres se eligen por torneo binario sobre la población ordenada; se
+    cruzan con probabilidad *cp* (o se clonan), y se mutan.
+
+    Args:
+        task (Task): La tarea, con su población ordenada.
+        cp (float): Probabilidad de cruzamiento.
+
+    Returns:
+        list: Los descendientes.
+
+    """
+
+    rng = task.get_random()
+    randrange = rng.randrange
+    size = task.get_size()
+    ind_a = task.get_individual(min(randrange(size), randrange(size)))
+    ind_b = task.get_individual(min(randrange(size), randrange(size)))
+
+    if rng.random() < cp:
+        childs = list(task.apply_crossover(ind_a, ind_b))
+    else:
+        childs = [ind_a.copy(), ind_b.copy()]
+
+    task.mutate(childs)
+
+    return childs
+
+
+def steady_state_ga(task,
+                    sec,
+                    evaluations=float('inf'),
+                    cp=1.0,
+                    in_flight=None,
+                    verbose=float('inf'),
+                    report=None):
+    """ Ejecuta un algoritmo genético de estado estable, sin barrera entre
+    generaciones: mientras el evaluador de la tarea calcula el fitness de
+    unos descendientes, se generan otros. Cada descendiente evaluado se
+    inserta de inmediato en la población ordenada, reemplazando al peor (ver
+    *Task.insert_individual*). Así los trabajadores del evaluador no esperan
+    a la evaluación más lenta de cada generación.
+
+    Los padres se eligen por torneo binario, y se usan el cruzamiento y el
+    mutador de la tarea (el selector no se usa). La población debe ser una
+    lista.
+
+    Los clones que la mutación deja sin cambios conservan su fitness y se
+    descartan. Si en *_MAX_EMPTY_ROUNDS* rondas seguidas sólo se generan
+    clones así (p.ej. la población convergió), la corrida termina.
+
+    Args:
+        task (Task): Un objeto *Task* con los parámetros y la población
+            requerida para la ejecución del algoritmo.
+        sec (float): Segundos que aproximadamente correrá el algoritmo.
+        evaluations (int): Cantidad máxima de descendientes a evaluar.
+        cp (float): Probabilidad de cruzamiento de cada pareja de padres.
+        in_flight (int|None): Cantidad de evaluaciones en curso que se
+            mantienen. Por omisión, el doble de trabajadores del evaluador.
+        verbose (int): Indica cada cuantas evaluaciones se reportan avances.
+        report (function|None): Función de reporte. Recibirá la cantidad de
+            evaluaciones, y el fitness y genoma del mejor individuo (ver
+            *general_ga*).
+
+    Returns:
+        Individual: El individuo con mejor aptitud al momento de finalizar la
+            corrida.
+
+    """
+
+    inf = float('inf')
+
+    # Se inicia la toma de tiempo
+    start_time = time()
+
+    if not isinstance(task.get_population(), list):
+        raise TypeError('steady_state_ga requires a list population')
+
+    if in_flight is None:
+        in_flight = 2 * task.get_evaluator().get_workers()
+
+    task.evaluate()
+    task.order_population()
+
+    size = task.get_desired_size()
+    pending = {}  # Evaluaciones en curso, y su descendiente
+    done = 0
+    empty = 0  # Rondas seguidas sin descendientes que evaluar
+    next_report = 0
+
+    try:
+        while True:
+            # Se mantiene ocupado al evaluador
+            for _ in range(in_flight):
+                if len(pending) >= in_flight or \
+                        done + len(pending) >= evaluations:
+                    break
+                # Los clones sin cambios conservan su fitness, y se descartan
+                for child in _breed(task, cp):
+                    if child.get_fitness() is None:
+                        pending[task.submit_evaluation(child)] = child
+
+            if not pending:
+                empty += 1
+                if done >= evaluations or empty >= _MAX_EMPTY_ROUNDS:
+                    break
+            else:
+                empty = 0
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    child = pending.pop(future)
+                    task.finish_evaluation(child, future.result())
+                    task.insert_individual(child)
+                    done += 1
+
+                task.set_generation(done // size)
+
+            # Se verifica si se debe imprimir
+            if verbose != inf and done >= next_report:
+                _report_progress(task, done, report)
+                while next_report <= done:
+                    next_report += verbose
+
+            # Verificamos si se ha cumplido el tiempo
+            if time() - start_time > sec:
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+        task.set_generation(None)
+
+    # Se regresa la solución (el mejor es el primer elemento)
+    return task.get_individual(0)
+
+
+def _pack_individuals(task, n):
+    """ Regresa los primeros *n* individuos de la población en forma compacta:
+    tuplas (genoma en bruto, fitness), sin los objetos *Individual*.
+
+    Args:
+        task (Task): La tarea, con su población ordenada.
+        n (int): Cantidad de individuos.
+
+    Returns:
+        list: Un arreglo de tuplas (genoma en bruto, fitness).
+
+    """
+
+    pop = task.get_population()
+    return [(pop[i].get_raw_genome(), pop[i].get_fitness())
+            for i in range(min(n, len(pop)))]
+
+
+def _unpack_individuals(prototype, packed):
+    """ Reconstruye individuos a partir de su forma compacta.
+
+    Args:
+        prototype (Individual): Un individuo del mismo tipo que servirá de
+            plantilla.
+        packed (list): Un arreglo de tuplas (genoma en bruto, fitness).
+
+    Returns:
+        list: Un arreglo de individuos.
+
+    """
+
+    individuals = []
+    for raw, fit in packed:
+        ind = prototype.copy()
+        ind.set_genome_from_raw(raw)
+        ind.set_fitness(fit)
+        individuals.append(ind)
+
+    return individuals
+
+
+def _island_targets(i, n, topology):
+    """ Regresa las islas que reciben a los migrantes de la isla *i*, con una
+    topología fija.
+
+    Args:
+        i (int): El índice de la isla.
+        n (int): Cantidad de islas.
+        topology (str): 'ring' o 'full'.
+
+    Returns:
+        list: Los índices de las islas destino.
+
+    """
+
+    if topology == 'ring':
+        targets = [(i + 1) % n]
+    elif topology == 'full':
+        targets = range(n)
+    else:
+        raise ValueError('unknown topology: ' + repr(topology))
+
+    return [j for j in targets if j != i]
+
+
+class _RemoteTraceback(Exception):
+    """ Traza de una excepción ocurrida en otro proceso, que se encadena como
+    causa de la excepción relanzada en el proceso principal.
+
+    """
+
+    def __init__(self, trace):
+        """ Constructor de la clase *_RemoteTraceback*.
+
+        Args:
+            trace (str): La traza, ya formateada.
+
+        """
+
+        super().__init__(trace)
+        self._trace = trace
+
+    def __str__(self):
+        return self._trace
+
+
+def _island_worker(i, *args):
+    """ Punto de entrada del proceso de una isla (ver *_run_island*). Envía a
+    la cola *results* la tupla (i, población final, None) o, si la isla falla,
+    (i, None, (excepción, traza)), para que el proceso principal la relance.
+
+    Args:
+        i (int): El índice de la isla.
+        *args: El resto de argumentos de *_run_island*, entre ellos la
+            cola *results*.
+
+    """
+
+    results = args[-3]
+    try:
+        packed = _run_island(i, *args)
+    except Exception as error:
+        trace = format_exc()
+        try:
+            dumps(error)
+        except Exception:
+            error = RuntimeError(repr(error))
+        results.put((i, None, (error, trace)))
+    else:
+        results.put((i, packed, None))
+
+
+def _run_island(i,
+                task,
+                elitism,
+                sec,
+                gen,
+                interval,
+                migrants,
+                topology,
+                seed,
+                inboxes,
+                results,
+                verbose,
+                report):
+    """ Ejecuta el algoritmo genético genérico en una isla (un proceso), con
+    migración periódica hacia las islas vecinas.
+
+    Args:
+        i (int): El índice de la isla.
+        task (Task): La tarea de la isla.
+        elitism (float): Porcentaje de individuos elite.
+        sec (float): Segundos que aproximadamente correrá la isla.
+        gen (int): Generaciones que se ejecutará la isla.
+        interval (int): Generaciones entre migraciones.
+        migrants (int): Cantidad de individuos que migran.
+        topology (str): 'ring', 'full' o 'random'.
+        seed (int|None): Semilla de la corrida.
+        inboxes (list): La cola de entrada de cada isla.
+        results (Queue): La cola donde se envía la población final.
+        verbose (int): Indica cada cuantas generaciones se reportan avances.
+        report (function|None): Función de reporte.
+
+    Returns:
+        list: La población final, en forma compacta.
+
+    """
+
+    inf = float('inf')
+
+    # Cada isla requiere su propia secuencia aleatoria. El módulo *random*
+    # también se siembra, para los operadores propios que lo usen
+    n = len(inboxes)
+    if seed is None:
+        random_seed()
+    else:
+        random_seed(seed * n + i)
+        task.set_random(spawn_random(seed, i))
+    rng = task.get_random()
+
+    if topology != 'random':
+        targets = _island_targets(i, n, topology)
+    others = [j for j in range(n) if j != i]
+
+    # Los migrantes sin leer se descartan al terminar, sin bloquear la isla
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+    start_time = time()
+    n_elite = floor(task.get_size() * elitism)
+
+    task.evaluate()
+    task.order_population()
+
+    g = 0
+    while g < gen:
+        task.set_generation(g)
+
+        _generation_step(task, n_elite)
+
+        if (g + 1) % interval == 0:
+            # Se envían los mejores a las islas vecinas
+            if topology == 'random':
+                targets = [rng.choice(others)] if others else []
+            if targets:
+                packed = _pack_individuals(task, migrants)
+                for j in targets:
+                    inboxes[j].put(packed)
+
+            # Se reciben los migrantes, que reemplazan a los peores
+            arrivals = []
+            try:
+                while True:
+                    arrivals.extend(inboxes[i].get_nowait())
+            except Empty:
+                pass
+
+            if arrivals:
+                task.append_population(
+                    _unpack_individuals(task.get_individual(0), arrivals))
+                task.order_population()
+                task.adjust_population_size()
+
+        if verbose != inf and g % verbose == 0:
+            if report is None:
+                print('Island:', i)
+            _report_progress(task, g, report)
+
+        g += 1
+
+        # Verificamos si se ha cumplido el tiempo
+        if time() - start_time > sec:
+            break
+
+    task.set_generation(None)
+
+    return _pack_individuals(task, task.get_size())
+
+
+def island_ga(tasks,
+              elitism,
+              sec,
+              gen=float('inf'),
+              interval=10,
+              migrants=2,
+              topology='ring',
+              seed=None,
+              verbose=float('inf'),
+              report=None):
+    """ Ejecuta un algoritmo genético de islas: cada tarea de *tasks* es una
+    isla que corre el algoritmo genético genérico en su propio proceso, con
+    su propia población, selector y mutador. Cada *interval* generaciones,
+    cada isla envía a sus vecinas sus *migrants* mejores individuos, que
+    reemplazan a los peores de la isla destino.
+
+    La topología de migración puede ser 'ring' (cada isla envía a la
+    siguiente), 'full' (cada isla envía a todas las demás) o 'random' (en cada
+    migración, cada isla envía a otra elegida al azar).
+
+    Los migrantes viajan en forma compacta, como tuplas (genoma en bruto,
+    fitness). Las tareas, sus operadores y sus datos deben poder serializarse
+    con *pickle* (funciones definidas a nivel de módulo).
+
+    Al terminar, la población final de cada isla reemplaza a la de su tarea.
+    Si una isla falla, o su proceso termina sin enviar su población, se
+    detienen las demás y se lanza la excepción en el proceso principal.
+
+    Args:
+        tasks (list): Un arreglo de objetos *Task*, uno por isla.
+        elitism (float): Porcentaje de individuos que se guardarán como elite
+            para la siguiente generación, en cada isla.
+        sec (float): Segundos que aproximadamente correrá el algoritmo.
+        gen (int): Generaciones que se ejecutará cada isla.
+        interval (int): Generaciones entre migraciones.
+        migrants (int): Cantidad de individuos que envía cada isla en cada
+            migración.
+        topology (str): La topología de migración: 'ring', 'full' o
+            'random'.
+        seed (int|None): Semilla para las secuencias aleatorias de las islas.
+            La isla *i* recibe el generador *spawn_random(seed, i)*. Si es
+            *None*, cada isla conserva el generador de su tarea (o, si no
+            tiene uno propio, usa una semilla del sistema operativo).
+        verbose (int): Indica cada cuantas generaciones se reportan avances.
+        report (function|None): Función de reporte, llamada desde cada isla
+            (ver *general_ga*).
+
+    Returns:
+        Individual: El individuo con mejor aptitud de todas las islas al
+            momento de finalizar la corrida.
+
+    """
+
+    n = len(tasks)
+
+    if topology != 'random':
+        _island_targets(0, n, topology)  # Se valida la topología
+
+    inboxes = [Queue() for _ in range(n)]
+    results = Queue()
+
+    processes = []
+    for i, task in enumerate(tasks):
+        process = Process(target=_island_worker,
+                          args=(i, task, elitism, sec, gen, interval,
+                                migrants, topology, seed, inboxes, results,
+                                verbose, report))
+        process.start()
+        processes.append(process)
+
+    # Se reciben las poblaciones finales antes de esperar a los procesos. Una
+    # isla que termina sin enviar nada (p.ej. el proceso murió) ya no lo hará
+    finals = {}
+    try:
+        while len(finals) < n:
+            lost = [j for j, process in enumerate(processes)
+                    if j not in finals and process.exitcode is not None]
+            try:
+                i, packed, failure = results.get(timeout=_POLL_PERIOD)
+            except Empty:
+                if lost:
+                    raise RuntimeError(
+                        'island {0} exited with code {1} without a result'
+                        .format(lost[0], processes[lost[0]].exitcode))
+                continue
+
+            if failure is not None:
+                error, trace = failure
+                raise error from _RemoteTraceback(trace)
+            finals[i] = packed
+    except BaseException:
+        # Se interrumpe la corrida en todas las islas
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for process in processes:
+            process.join()
+
+    bests = []
+    for i, task in enumerate(tasks):
+        pop = task.get_population()
+        new_pop = _unpack_individuals(task.get_individual(0), finals[i])
+        if not isinstance(pop, list):
+            new_pop = pop.__class__.from_individuals(new_pop)
+        task.replace_population(new_pop)
+        bests.append(task.get_individual(0))
+
+    return tasks[0].get_best(bests)
@@ -13,12 +13,15 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
 
+from math import floor
+from functools import lru_cache
 from .individual import Individual
-from .utils import dec_to_bin
 
 
-class BinaryInd(Individual):
-    """ Clase para individuos con genoma binario.
+class BinaryLayout:
+    """ Estructura de codificación compartida por todos los individuos
+    binarios de una población. Se calcula una sola vez a partir de la
+    estructura de las variables.
 
     Attributes:
         _var_bits (tuple): Arreglo que indica cuantos bits usa cada variable
@@ -30,78 +33,414 @@ class BinaryInd(Individual):
             correcto.
         _struct (tuple): Un arreglo de arreglos que indican la forma en que se
             codifica cada variable almacenado en el genoma.
+        _total_bits (int): La cantidad total de bits del genoma.
+        _shifts (tuple): Para cada variable, el desplazamiento de sus bits
+            cuando el genoma se empaqueta en un entero (ver *PackedBinaryInd*).
+        _fields (tuple): El decodificador precalculado. Para cada variable:
+            desplazamiento, máscara de sus bits, máscara del bit de signo (0 si
+            no tiene) y factor de ajuste.
+        _encoders (tuple): El codificador precalculado. Para cada variable:
+            cantidad de bits, bit de signo (0 si no tiene), factor de escala,
+            valor absoluto máximo representable y máscara de su magnitud.
+
+    """
+
+    __slots__ = ('_var_bits',
+                 '_sign_bits',
+                 '_precalc',
+                 '_struct',
+                 '_total_bits',
+                 '_shifts',
+                 '_fields',
+                 '_encoders')
+
+    def __init__(self, structure):
+        """ Constructor de la clase *BinaryLayout*.
+
+        Args:
+            structure (tuple): Un arreglo que especifica cómo se codifican las
+                variables en el genoma. Para cada variable hay un elemento con
+                tres valores: bit de signo, bits de parte entera, bits de
+                mantisa.
+
+        """
+
+        var_bits = []
+        sign_bits = []
+        precalc = []
+        for i in structure:
+            var_bits.append(sum(i))
+            sign_bits.append(i[0])
+            precalc.append(1.0 / (2**i[2]))
+
+        self._var_bits = tuple(var_bits)
+        self._sign_bits = tuple(sign_bits)
+        self._precalc = tuple(precalc)
+        self._struct = tuple(structure)
+        self._total_bits = sum(var_bits)
+
+        # El primer bit del genoma es el más significativo del entero
+        shifts = []
+        left = 0
+        for v in var_bits:
+            left += v
+            shifts.append(self._total_bits - left)
+        self._shifts = tuple(shifts)
+
+        # Decodificador: se extrae cada variable del genoma como entero
+        fields = []
+        for v, s, p, shift in zip(var_bits, sign_bits, precalc, shifts):
+            fields.append((shift, (1 << v) - 1, (1 << (v - 1)) if s else 0, p))
+        self._fields = tuple(fields)
+
+        # Codificador: equivalente a dec_to_bin, pero con aritmética entera
+        encoders = []
+        for v, (s, i_dig, d_dig) in zip(var_bits, structure):
+            max_abs_value = (2**i_dig - 1) + (2**d_dig - 1) / 2**d_dig
+            encoders.append((v,
+                             (1 << (i_dig + d_dig)) if s else 0,
+                             2**d_dig,
+                             max_abs_value,
+                             (1 << (i_dig + d_dig)) - 1))
+        self._encoders = tuple(encoders)
+
+    def get_struct(self):
+        """ Regresa la estructura de las variables.
+
+        Returns:
+            tuple: La estructura de las variables.
+
+        """
+
+        return self._struct
+
+    def get_total_bits(self):
+        """ Regresa la cantidad total de bits del genoma.
+
+        Returns:
+            int: La cantidad total de bits.
+
+        """
+
+        return self._total_bits
+
+    def decode(self, genome):
+        """ Decodifica un genoma empaquetado en un entero en una sola pasada.
+        El primer bit del genoma es el más significativo del entero.
+
+        Args:
+            genome (int): El genoma en bruto, como entero.
+
+        Returns:
+            list: El genoma en forma amigable.
+
+        """
+
+        nice_genome = []
+        for shift, mask, sign, p in self._fields:
+            field = (genome >> shift) & mask
+            if field & sign:  # negativo
+                nice_genome.append(-(field ^ sign) * p)
+            else:
+                nice_genome.append(field * p)
+
+        return nice_genome
+
+    def encode(self, genome):
+        """ Codifica un genoma en forma amigable en un entero, con el mismo
+        resultado que concatenar *dec_to_bin* para cada variable. El primer
+        bit del genoma es el más significativo del entero.
+
+        Args:
+            genome (iterable): El genoma en forma amigable.
+
+        Returns:
+            int: El genoma en bruto, como entero.
+
+        """
+
+        raw = 0
+        for num, (v, sign, scale, max_abs_value, ones) in zip(genome,
+                                                              self._encoders):
+            if num < 0.0:
+                if not sign:  # Debe ser cero
+                    raw <<= v
+                    continue
+                num = -num
+                field = sign
+            else:
+                field = 0
+
+            if num >= max_abs_value:
+                field |= ones
+            else:
+                field |= floor(num * scale)
+
+            raw = (raw << v) | field
+
+        return raw
+
+    def to_ascii(self, genome):
+        """ Convierte un genoma empaquetado en un entero a su forma ASCII (un
+        byte '0' o '1' por bit), usada por *BinaryInd*.
+
+        Args:
+            genome (int): El genoma en bruto, como entero.
+
+        Returns:
+            bytearray: El genoma en bruto, en forma ASCII.
+
+        """
+
+        return bytearray('{0:b}'.format(genome).zfill(self._total_bits),
+                         'ascii')
+
+
+@lru_cache(maxsize=None)
+def _shared_layout(structure):
+    """ Regresa la estructura de codificación de *structure*, construida una
+    sola vez, para los individuos creados con la forma anterior del
+    constructor de *BinaryInd*.
+
+    Args:
+        structure (tuple): La estructura de las variables, como tupla de
+            tuplas.
+
+    Returns:
+        BinaryLayout: La estructura de codificación.
+
+    """
+
+    return BinaryLayout(structure)
+
+
+class BinaryInd(Individual):
+    """ Clase para individuos con genoma binario.
+
+    Attributes:
+        _layout (BinaryLayout): La estructura de codificación del genoma,
+            compartida con el resto de individuos de la población.
+        _decoded (list|None): El genoma en forma amigable, decodificado en la
+            última llamada a *get_genome*. Se invalida al cambiar el genoma o
+            al descartar el fitness (el genoma en bruto pudo editarse in situ).
 
     """
 
-    def __init__(self,
-                 genome,
-                 var_bits,
-                 sign_bits,
-                 precalc,
-                 struct,
-                 data=None,
-                 fitness=None):
+    __slots__ = ('_layout', '_decoded')
+
+    def __init__(self, genome, layout, *args, data=None, fitness=None):
         """ Constructor de la clase *BinaryInd*.
 
+        Por compatibilidad, también acepta la forma anterior
+        (genome, var_bits, sign_bits, precalc, struct, data, fitness): la
+        estructura de codificación se construye a partir de *struct*, y se
+        comparte entre los individuos con la misma estructura.
+
         Args:
             genome (bytearray): Una lista con el genoma en su forma bruta.
-            var_bits (tuple): Arreglo que indica cuantos bits usa cada variable
-                en el genoma.
-            sign_bits (tuple): Arreglo que indica que variables poseen bit de
-                signo.
-            precalc (tuple): Un arreglo que almacena factores que ajustan el
-                valor entero codificado en cada variable a su valor flotante
-                correcto.
+            layout (BinaryLayout): La estructura de codificación del genoma.
+            *args: *data* y *fitness* por posición, o, en la forma anterior,
+                *sign_bits*, *precalc*, *struct*, *data* y *fitness*.
             data (object): Un objeto arbitrario.
             fitness (list): Un arreglo con el fitness.
 
         """
 
-        self._var_bits = var_bits
-        self._sign_bits = sign_bits
-        self._precalc = precalc
-        self._struct = struct
+        if not isinstance(layout, BinaryLayout):
+            if len(args) < 3:
+                raise TypeError('BinaryInd requires a BinaryLayout, or ' +
+                                'var_bits, sign_bits, precalc and struct')
+            layout = _shared_layout(tuple(tuple(v) for v in args[2]))
+            args = args[3:]
+
+        if len(args) > 2:
+            raise TypeError('too many arguments for BinaryInd')
+        if args:
+            data = args[0]
+        if len(args) > 1:
+            fitness = args[1]
+
+        self._layout = layout
+        self._decoded = None
 
         super().__init__(genome, data, fitness)
 
+    def copy(self):
+        """ Regresa una copia ligera del objeto. La estructura de codificación
+        y el genoma decodificado se comparten.
+
+        Returns:
+            BinaryInd: Una copia del objeto.
+
+        """
+
+        c = super().copy()
+        c._layout = self._layout
+        c._decoded = self._decoded
+
+        return c
+
+    def get_layout(self):
+        """ Regresa la estructura de codificación del genoma.
+
+        Returns:
+            BinaryLayout: La estructura de codificación.
+
+        """
+
+        return self._layout
+
     def get_genome(self):
-        """ Regresa el genoma del individuo en forma amigable.
+        """ Regresa el genoma del individuo en forma amigable. El genoma se
+        decodifica una sola vez mientras no cambie; se regresa una copia, que
+        puede modificarse sin alterar al individuo.
 
         Returns:
             list: Una secuencia con el genoma.
 
         """
 
-        nice_genome = []
-        genome = self._genome
-        left = 0
-        for v, s, p in zip(self._var_bits, self._sign_bits, self._precalc):
-            if s:  # Si tiene bit de signo
-                if genome[left] == 48:  # positivo
-                    nice_genome.append(int(genome[left + 1:left + v], 2) * p)
-                else:  # negativo
-                    nice_genome.append(-int(genome[left + 1:left + v], 2) * p)
-            else:
-                nice_genome.append(int(genome[left:left + v], 2) * p)
-
-            left += v
+        if self._decoded is None:
+            self._decoded = self._layout.decode(int(self._genome, 2))
 
-        return nice_genome
+        return list(self._decoded)
 
     def set_genome(self, genome):
         """ Recibe un genoma en su forma amigable y la transforma en la forma
         cruda para ser almacenada en el individuo.
 
-        El genoma debe ser compatible con las especificaciones establecidas en
-        los atributos del indivuduo, como *_var_bits* y *_sign_bits*
+        El genoma debe ser compatible con la estructura de codificación del
+        individuo.
 
         Args:
             genome (iterable): El genome en su forma amigable.
 
         """
 
-        new_raw = bytearray()
-        for num, params in zip(genome, self._struct):
-            new_raw.extend(dec_to_bin(num, params[0], params[1], params[2]))
+        layout = self._layout
+        self._genome = layout.to_ascii(layout.encode(genome))
+        self._decoded = None
+
+    def set_genome_from_raw(self, genome):
+        """ Establece el genoma desde una versión en bruto del mismo.
+
+        Args:
+            genome (bytearray): Un arreglo con el genoma en bruto, tal cual es
+                almacenado en el individuo.
+
+        """
+
+        self._genome = genome
+        self._decoded = None
+
+    def set_fitness(self, fit):
+        """ Establece el fitness del individuo. Al descartarlo (*None*)
+        también se descarta el genoma decodificado, pues los operadores que
+        editan el genoma en bruto in situ sólo avisan así del cambio.
+
+        Args:
+            fit (list|None): Un arreglo con el fitness del individuo.
+
+        """
+
+        super().set_fitness(fit)
+        if fit is None:
+            self._decoded = None
+
+    def get_key(self):
+        """ Regresa una forma inmutable del genoma en bruto, útil como llave de
+        diccionarios o conjuntos.
+
+        Returns:
+            bytes: El genoma en bruto como bytes.
+
+        """
+
+        return bytes(self._genome)
+
+
+class PackedBinaryInd(BinaryInd):
+    """ Clase para individuos con genoma binario empaquetado en un entero de
+    Python, un bit por gen (en lugar de un byte ASCII por gen). El primer bit
+    del genoma es el más significativo del entero.
+
+    Los operadores *mutate_flip*, *crossover_one_point* y
+    *crossover_two_points* reconocen este genoma, y operan con máscaras y
+    desplazamientos de bits.
+
+    """
+
+    __slots__ = ()
+
+    def copy(self):
+        """ Regresa una copia ligera del objeto. El genoma es un entero
+        inmutable, por lo que se comparte.
+
+        Returns:
+            PackedBinaryInd: Una copia del objeto.
+
+        """
+
+        cls = self.__class__
+        c = cls.__new__(cls)
+        c._genome = self._genome
+        c._fitness = self._fitness
+        c._data = self._data
+        c._delta = self._delta
+        c._order_key = self._order_key
+        c._layout = self._layout
+        c._decoded = self._decoded
+
+        # Subclases de usuario sin __slots__
+        if hasattr(self, '__dict__'):
+            c.__dict__.update(self.__dict__)
+
+        return c
+
+    def get_genome(self):
+        """ Regresa el genoma del individuo en forma amigable. El genoma se
+        decodifica una sola vez mientras no cambie; se regresa una copia, que
+        puede modificarse sin alterar al individuo.
+
+        Returns:
+            list: Una secuencia con el genoma.
+
+        """
+
+        if self._decoded is None:
+            self._decoded = self._layout.decode(self._genome)
+
+        return list(self._decoded)
+
+    def set_genome(self, genome):
+        """ Recibe un genoma en su forma amigable y la transforma en la forma
+        cruda (un entero) para ser almacenada en el individuo.
+
+        Args:
+            genome (iterable): El genome en su forma amigable.
+
+        """
+
+        self._genome = self._layout.encode(genome)
+        self._decoded = None
+
+    def get_size(self):
+        """ Regresa la longitud del genoma en bits.
+
+        Returns:
+            int: La longitud del genoma.
+
+        """
+
+        return self._layout._total_bits
+
+    def get_key(self):
+        """ Regresa una forma inmutable del genoma en bruto, útil como llave de
+        diccionarios o conjuntos.
+
+        Returns:
+            int: El genoma en bruto.
+
+        """
 
-        self._genome = new_raw
+        return self._genome
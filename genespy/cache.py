@@ -0,0 +1,121 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+
+
+class FitnessCache:
+    """ Memoria acotada de valores fitness, con política LRU (se descarta el
+    elemento usado hace más tiempo). Las llaves son la forma inmutable del
+    genoma en bruto de un individuo (ver *Individual.get_key*).
+
+    Attributes:
+        _size (int): Cantidad máxima de elementos almacenados.
+        _table (OrderedDict): Los valores fitness almacenados.
+        _hits (int): Número de consultas exitosas.
+        _misses (int): Número de consultas fallidas.
+
+    """
+
+    def __init__(self, size=100000):
+        """ Constructor de la clase *FitnessCache*.
+
+        Args:
+            size (int): Cantidad máxima de elementos almacenados.
+
+        """
+
+        self._size = size
+        self._table = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        """ Regresa la cantidad de elementos almacenados.
+
+        Returns:
+            int: La cantidad de elementos almacenados.
+
+        """
+
+        return len(self._table)
+
+    def get(self, key):
+        """ Regresa el fitness asociado a la llave, si existe.
+
+        Args:
+            key (object): La llave del genoma.
+
+        Returns:
+            list|None: Una copia del fitness almacenado, o *None* si no existe.
+
+        """
+
+        fit = self._table.get(key)
+
+        if fit is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._table.move_to_end(key)
+
+        return fit[:]
+
+    def put(self, key, fit):
+        """ Almacena el fitness asociado a la llave. Si se excede el tamaño
+        máximo, se descarta el elemento usado hace más tiempo.
+
+        Args:
+            key (object): La llave del genoma.
+            fit (list): El fitness del genoma.
+
+        """
+
+        table = self._table
+        table[key] = fit[:]
+        table.move_to_end(key)
+
+        if len(table) > self._size:
+            table.popitem(last=False)
+
+    def clear(self):
+        """ Elimina todos los elementos y reinicia los contadores.
+
+        """
+
+        self._table.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def get_hits(self):
+        """ Regresa el número de consultas exitosas.
+
+        Returns:
+            int: El número de consultas exitosas.
+
+        """
+
+        return self._hits
+
+    def get_misses(self):
+        """ Regresa el número de consultas fallidas.
+
+        Returns:
+            int: El número de consultas fallidas.
+
+        """
+
+        return self._misses
@@ -0,0 +1,228 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+from pickle import dump, load, HIGHEST_PROTOCOL
+from os import replace, fsync, getpid
+from os.path import exists
+import random
+from time import time
+
+# Versión del formato de los puntos de control
+_VERSION = 1
+
+
+def save_checkpoint(task, path, generation):
+    """ Guarda el estado de una corrida en un archivo binario (*pickle*): la
+    población (genomas en bruto, fitness y datos de cada individuo), la
+    generación, los argumentos de los operadores y el estado de los
+    generadores de números aleatorios (el del módulo *random* y, si lo tiene,
+    el propio de la tarea).
+
+    La escritura es atómica: se escribe un archivo temporal que después
+    sustituye al destino, de modo que una interrupción nunca deja un punto de
+    control incompleto.
+
+    Args:
+        task (Task): La tarea.
+        path (str): La ruta del archivo.
+        generation (int): La última generación completada.
+
+    """
+
+    pop = task.get_population()
+    rng = task.get_random()
+    state = {
+        'version': _VERSION,
+        'generation': generation,
+        'desired_size': task.get_desired_size(),
+        'prototype': pop[0].copy(),
+        'store': None if isinstance(pop, list) else pop.__class__,
+        'genomes': [ind.get_raw_genome() for ind in pop],
+        'fitness': [ind.get_fitness() for ind in pop],
+        'data': [ind.get_data() for ind in pop],
+        'mutator_args': task.get_mutator_args(),
+        'crossover_args': task.get_crossover_args(),
+        'selector_args': task.get_selector_args(),
+        'random_state': random.getstate(),
+        'task_random_state': None if rng is random else rng.getstate()
+    }
+
+    tmp_path = '{0}.{1}.tmp'.format(path, getpid())
+
+    with open(tmp_path, 'wb') as f:
+        dump(state, f, HIGHEST_PROTOCOL)
+        f.flush()
+        fsync(f.fileno())
+
+    replace(tmp_path, path)
+
+
+def load_checkpoint(task, path):
+    """ Restaura en una tarea el estado guardado con *save_checkpoint*. La
+    tarea debe tener establecidas sus funciones de evaluación y operadores;
+    se restauran la población (con su fitness, por lo que no se evalúa de
+    nuevo), su tamaño deseado, los argumentos de los operadores y el estado
+    de los generadores de números aleatorios. Si la corrida guardada usaba
+    un generador propio de la tarea y la tarea no lo tiene, se le crea uno.
+
+    Args:
+        task (Task): La tarea.
+        path (str): La ruta del archivo.
+
+    Returns:
+        int: La última generación completada.
+
+    """
+
+    with open(path, 'rb') as f:
+        state = load(f)
+
+    if state.get('version') != _VERSION:
+        raise ValueError('unsupported checkpoint version')
+
+    prototype = state['prototype']
+    pop = []
+    for raw, fit, data in zip(state['genomes'],
+                              state['fitness'],
+                              state['data']):
+        ind = prototype.copy()
+        ind.set_genome_from_raw(raw)
+        ind.set_fitness(fit)
+        ind.set_data(data)
+        pop.append(ind)
+
+    if state['store'] is not None:
+        pop = state['store'].from_individuals(pop)
+
+    task.set_population(pop)
+    if len(pop) != state['desired_size']:
+        task.adjust_population_size(state['desired_size'])
+
+    for key, value in state['mutator_args'].items():
+        task.set_mutator_arg(key, value)
+    for key, value in state['crossover_args'].items():
+        task.set_crossover_arg(key, value)
+    for key, value in state['selector_args'].items():
+        task.set_selector_arg(key, value)
+
+    random.setstate(state['random_state'])
+    task_state = state.get('task_random_state')
+    if task_state is not None:
+        if task.get_random() is random:
+            task.set_random(random.Random())
+        task.get_random().setstate(task_state)
+
+    return state['generation']
+
+
+class Checkpointer:
+    """ Guarda puntos de control periódicos de una corrida, cada cierta
+    cantidad de generaciones y/o de segundos, y permite reanudarla.
+
+    Se pasa a *general_ga* o *cos_mutation_ga* con el argumento *checkpoint*.
+    Si el archivo existe al iniciar el algoritmo (y *resume* es verdadero), la
+    corrida continúa desde la generación siguiente a la guardada, sin evaluar
+    de nuevo a la población restaurada.
+
+    Attributes:
+        _path (str): La ruta del archivo.
+        _generations (int|None): Generaciones entre puntos de control.
+        _seconds (float|None): Segundos entre puntos de control.
+        _resume (bool): Indica si se reanuda desde un archivo existente.
+        _last_gen (int|None): La generación del último punto de control.
+        _last_time (float): El momento del último punto de control.
+
+    """
+
+    def __init__(self, path, generations=None, seconds=None, resume=True):
+        """ Constructor de la clase *Checkpointer*.
+
+        Args:
+            path (str): La ruta del archivo.
+            generations (int|None): Generaciones entre puntos de control.
+            seconds (float|None): Segundos entre puntos de control.
+            resume (bool): Indica si se reanuda desde un archivo existente.
+
+        """
+
+        self._path = path
+        self._generations = generations
+        self._seconds = seconds
+        self._resume = resume
+        self._last_gen = None
+        self._last_time = time()
+
+    def get_path(self):
+        """ Regresa la ruta del archivo.
+
+        Returns:
+            str: La ruta del archivo.
+
+        """
+
+        return self._path
+
+    def restore(self, task):
+        """ Restaura la tarea desde el archivo, si existe y se debe reanudar.
+
+        Args:
+            task (Task): La tarea.
+
+        Returns:
+            int: La generación desde la que continúa la corrida (0 si no se
+                restauró nada).
+
+        """
+
+        self._last_time = time()
+
+        if not self._resume or not exists(self._path):
+            return 0
+
+        self._last_gen = load_checkpoint(task, self._path)
+
+        return self._last_gen + 1
+
+    def update(self, task, generation):
+        """ Guarda un punto de control si transcurrieron suficientes
+        generaciones o segundos desde el último.
+
+        Args:
+            task (Task): La tarea.
+            generation (int): La última generación completada.
+
+        """
+
+        if self._last_gen is None:
+            self._last_gen = generation - 1
+
+        if (self._generations is not None and
+                generation - self._last_gen >= self._generations) or \
+                (self._seconds is not None and
+                 time() - self._last_time >= self._seconds):
+            self.save(task, generation)
+
+    def save(self, task, generation):
+        """ Guarda un punto de control.
+
+        Args:
+            task (Task): La tarea.
+            generation (int): La última generación completada.
+
+        """
+
+        save_checkpoint(task, self._path, generation)
+        self._last_gen = generation
+        self._last_time = time()
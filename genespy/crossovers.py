@@ -13,10 +13,10 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
 
-from random import randrange, sample
 from copy import copy
 from itertools import cycle
 from .individual import Individual
+from .utils import task_random
 
 
 def crossover_scx(task, ind_a, ind_b, args):
@@ -398,7 +398,8 @@ def crossover_pseudoscx(task, ind_a, ind_b, args):
 
 def crossover_one_point(task, ind_a, ind_b, args):
     """ Realiza un cruzamiento de dos individuos, mezclando los genomas
-    aplicando un corte.
+    aplicando un corte. Los genomas empaquetados en enteros
+    (*PackedBinaryInd*) se combinan con máscaras de bits.
 
     Args:
         task (Task): El objeto Task asociado al problema.
@@ -414,14 +415,20 @@ def crossover_one_point(task, ind_a, ind_b, args):
     # Elegimos al azar el punto de corte
     gen_a = ind_a.get_raw_genome()
     gen_b = ind_b.get_raw_genome()
+    size = ind_a.get_size()
 
-    cut_point = randrange(1, len(gen_a))
+    cut_point = task_random(task).randrange(1, size)
 
-    son_l_gen = gen_a[:cut_point]
-    son_l_gen.extend(gen_b[cut_point:])
+    if isinstance(gen_a, int):  # Genoma empaquetado
+        tail = (1 << (size - cut_point)) - 1
+        son_l_gen = (gen_a & ~tail) | (gen_b & tail)
+        son_r_gen = (gen_b & ~tail) | (gen_a & tail)
+    else:
+        son_l_gen = gen_a[:cut_point]
+        son_l_gen.extend(gen_b[cut_point:])
 
-    son_r_gen = gen_b[:cut_point]
-    son_r_gen.extend(gen_a[cut_point:])
+        son_r_gen = gen_b[:cut_point]
+        son_r_gen.extend(gen_a[cut_point:])
 
     # Se instancian los hijos
     a = ind_a.copy()
@@ -436,7 +443,8 @@ def crossover_one_point(task, ind_a, ind_b, args):
 
 def crossover_two_points(task, ind_a, ind_b, args):
     """ Realiza un cruzamiento de dos individuos, mezclando los genomas
-    aplicando dos cortes.
+    aplicando dos cortes. Los genomas empaquetados en enteros
+    (*PackedBinaryInd*) se combinan con máscaras de bits.
 
     Args:
         task (Task): El objeto Task asociado al problema.
@@ -452,18 +460,271 @@ def crossover_two_points(task, ind_a, ind_b, args):
     gen_a = ind_a.get_raw_genome()
     gen_b = ind_b.get_raw_genome()
 
-    cut_a, cut_b = sample(range(len(gen_a)), 2)
+    size = ind_a.get_size()
+
+    cut_a, cut_b = task_random(task).sample(range(size), 2)
 
     if cut_a > cut_b:
         cut_a, cut_b = cut_b, cut_a
 
-    son_l_gen = gen_a[:cut_a]
-    son_l_gen.extend(gen_b[cut_a:cut_b])
-    son_l_gen.extend(gen_a[cut_b:])
+    if isinstance(gen_a, int):  # Genoma empaquetado
+        middle = ((1 << (cut_b - cut_a)) - 1) << (size - cut_b)
+        son_l_gen = (gen_a & ~middle) | (gen_b & middle)
+        son_r_gen = (gen_b & ~middle) | (gen_a & middle)
+    else:
+        son_l_gen = gen_a[:cut_a]
+        son_l_gen.extend(gen_b[cut_a:cut_b])
+        son_l_gen.extend(gen_a[cut_b:])
+
+        son_r_gen = gen_b[:cut_a]
+        son_r_gen.extend(gen_a[cut_a:cut_b])
+        son_r_gen.extend(gen_b[cut_b:])
+
+    # Se instancian los hijos
+    a = ind_a.copy()
+    a.set_genome_from_raw(son_l_gen)
+    a.set_fitness(None)
+    b = ind_b.copy()
+    b.set_genome_from_raw(son_r_gen)
+    b.set_fitness(None)
+
+    return a, b
+
+
+def _next_legal(gen, i, legal):
+    """ Busca hacia adelante, desde la posición *i*, el primer nodo legal de
+    un genoma de índices enteros. Si no existe, busca desde el inicio.
+
+    Args:
+        gen (list): El genoma.
+        i (int): La posición inicial de búsqueda.
+        legal (bytearray): Indica, para cada índice de nodo, si es legal.
+
+    Returns:
+        int: El nodo legal encontrado.
+
+    """
+
+    for j in range(i, len(gen)):
+        if legal[gen[j]]:
+            return gen[j]
+
+    for node in gen:
+        if legal[node]:
+            return node
+
+
+def _prev_legal(gen, i, legal):
+    """ Busca hacia atrás, desde la posición *i*, el primer nodo legal de un
+    genoma de índices enteros. Si no existe, busca desde el final.
+
+    Args:
+        gen (list): El genoma.
+        i (int): La posición inicial de búsqueda.
+        legal (bytearray): Indica, para cada índice de nodo, si es legal.
+
+    Returns:
+        int: El nodo legal encontrado.
+
+    """
+
+    for j in range(i, -1, -1):
+        if legal[gen[j]]:
+            return gen[j]
+
+    for j in range(len(gen) - 1, -1, -1):
+        if legal[gen[j]]:
+            return gen[j]
+
+
+def _positions(gen, n):
+    """ Crea un arreglo con la posición de cada nodo en un genoma de índices
+    enteros.
+
+    Args:
+        gen (list): El genoma.
+        n (int): La cantidad total de nodos.
+
+    Returns:
+        list: La posición de cada nodo (cero para los ausentes).
+
+    """
+
+    pos = [0] * n
+    for i, node in enumerate(gen):
+        pos[node] = i
+
+    return pos
+
+
+def crossover_scx_dense(task, ind_a, ind_b, args):
+    """ Versión de *crossover_scx* para genomas de índices enteros y una
+    matriz de costos densa (*CostMatrix*) en *data['cost']*. Los diccionarios
+    y conjuntos se sustituyen por arreglos indexados por nodo.
+
+    Se asume que el primer objetivo de la tarea asociada determina si el
+    problema se maximiza o minimiza.
+
+    *Asunciones:*
+
+    Se asume que el genoma no posee elementos repetidos, que el primer
+    elemento del recorrido (la salida, *data['start']*), no se encuentra en el
+    genoma y es fijo.
+
+    Args:
+        task (Task): El objeto Task asociado al problema.
+        ind_a (Individual): El primer individuo a cruzar.
+        ind_b (Individual): El segundo individuo a cruzar.
+        args (dict): Los parámetros propios del método.
+
+    Returns:
+        tuple: Un arreglo con dos individuos descendientes.
+
+    """
 
-    son_r_gen = gen_b[:cut_a]
-    son_r_gen.extend(gen_a[cut_a:cut_b])
-    son_r_gen.extend(gen_b[cut_b:])
+    # Tomamos las variables requeridas de la tarea
+    data = task.get_data()
+    matrix = data['cost']
+    cost = matrix.get_values()
+    n = matrix.get_size()
+    start = data['start']
+    circuit = data['circuit']
+    minim = task.get_obj_factors()[0] <= 0.0
+
+    # Iniciamos el proceso de cruza
+    gen_a = ind_a.get_raw_genome()
+    gen_b = ind_b.get_raw_genome()
+    size = len(gen_a)
+
+    # Posición de cada nodo en los padres, y nodos legítimos de cada hijo
+    pos_a = _positions(gen_a, n)
+    pos_b = _positions(gen_b, n)
+    legal_l = bytearray(n)
+    for node in gen_a:
+        legal_l[node] = 1
+    legal_r = bytearray(legal_l)
+
+    # Inicio de hijo izquierdo (son_l), desde la salida
+    cost_a = cost[start * n + gen_a[0]]
+    cost_b = cost[start * n + gen_b[0]]
+    if (cost_a < cost_b) != minim:  # XOR
+        last_added_l = gen_b[0]
+    else:
+        last_added_l = gen_a[0]
+    son_l_gen = [last_added_l]
+    legal_l[last_added_l] = 0
+
+    # Inicio de hijo derecho (son_r), desde el final
+    son_r_gen = [None] * size
+    current_index = size - 1
+    cost_a = cost[gen_a[-1] * n + start]
+    cost_b = cost[gen_b[-1] * n + start]
+    if circuit:  # Elegimos último nodo más cercano a la salida de los padres
+        if (cost_a < cost_b) != minim:  # XOR
+            last_added_r = gen_b[-1]
+        else:
+            last_added_r = gen_a[-1]
+    else:  # Elegimos último nodo más lejano a la salida de los padres
+        if (cost_a > cost_b) != minim:  # XOR
+            last_added_r = gen_b[-1]
+        else:
+            last_added_r = gen_a[-1]
+    son_r_gen[current_index] = last_added_r
+    legal_r[last_added_r] = 0
+    current_index -= 1
+
+    # Ciclo principal. Se agrega hasta que no haya que agregar
+    while current_index >= 0:
+        # Sección de hijo izquierdo --------
+        candidate_a = _next_legal(gen_a, pos_a[last_added_l] + 1, legal_l)
+        candidate_b = _next_legal(gen_b, pos_b[last_added_l] + 1, legal_l)
+        cost_a = cost[last_added_l * n + candidate_a]
+        cost_b = cost[last_added_l * n + candidate_b]
+        if (cost_a < cost_b) != minim:  # XOR
+            last_added_l = candidate_b
+        else:
+            last_added_l = candidate_a
+        son_l_gen.append(last_added_l)
+        legal_l[last_added_l] = 0
+
+        # Sección de hijo derecho --------
+        candidate_a = _prev_legal(gen_a, pos_a[last_added_r] - 1, legal_r)
+        candidate_b = _prev_legal(gen_b, pos_b[last_added_r] - 1, legal_r)
+        cost_a = cost[candidate_a * n + last_added_r]
+        cost_b = cost[candidate_b * n + last_added_r]
+        if (cost_a < cost_b) != minim:  # XOR
+            last_added_r = candidate_b
+        else:
+            last_added_r = candidate_a
+        son_r_gen[current_index] = last_added_r
+        legal_r[last_added_r] = 0
+        current_index -= 1
+
+    # Se instancian los hijos
+    a = ind_a.copy()
+    a.set_genome_from_raw(son_l_gen)
+    a.set_fitness(None)
+    b = ind_b.copy()
+    b.set_genome_from_raw(son_r_gen)
+    b.set_fitness(None)
+
+    return a, b
+
+
+def crossover_pseudoscx_dense(task, ind_a, ind_b, args):
+    """ Versión de *crossover_pseudoscx* para genomas de índices enteros. Los
+    diccionarios y conjuntos se sustituyen por arreglos indexados por nodo.
+
+    Args:
+        task (Task): El objeto Task asociado al problema.
+        ind_a (Individual): El primer individuo a cruzar.
+        ind_b (Individual): El segundo individuo a cruzar.
+        args (dict): Los parámetros propios del método.
+
+    Returns:
+        tuple: Un arreglo con dos individuos descendientes.
+
+    """
+
+    # Iniciamos el proceso de cruza
+    gen_a = ind_a.get_raw_genome()
+    gen_b = ind_b.get_raw_genome()
+    size = len(gen_a)
+    n = max(gen_a) + 1
+
+    # Posición de cada nodo en los padres, y nodos legítimos de cada hijo
+    pos_a = _positions(gen_a, n)
+    pos_b = _positions(gen_b, n)
+    legal_l = bytearray(n)
+    for node in gen_a:
+        legal_l[node] = 1
+    legal_r = bytearray(legal_l)
+
+    # Inicio de hijo izquierdo (son_l), inicia con gen_a
+    last_added_l = gen_a[0]
+    son_l_gen = [last_added_l]
+    legal_l[last_added_l] = 0
+
+    # Inicio de hijo derecho (son_r), termina con gen_a
+    last_added_r = gen_a[-1]
+    son_r_gen = [None] * size
+    son_r_gen[-1] = last_added_r
+    legal_r[last_added_r] = 0
+    current_index = size - 2
+
+    # Ciclo principal. Se toma alternadamente de 'b' y de 'a'
+    source = cycle(((gen_b, pos_b), (gen_a, pos_a)))
+    while current_index >= 0:
+        gen, pos = next(source)
+
+        last_added_l = _next_legal(gen, pos[last_added_l] + 1, legal_l)
+        son_l_gen.append(last_added_l)
+        legal_l[last_added_l] = 0
+
+        last_added_r = _prev_legal(gen, pos[last_added_r] - 1, legal_r)
+        son_r_gen[current_index] = last_added_r
+        legal_r[last_added_r] = 0
+        current_index -= 1
 
     # Se instancian los hijos
     a = ind_a.copy()
@@ -0,0 +1,698 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+from asyncio import gather, wait_for, Semaphore, TimeoutError
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from inspect import iscoroutinefunction
+from os import cpu_count
+
+
+def evaluate_genomes(genomes,
+                     constraints,
+                     penalties,
+                     objectives,
+                     data,
+                     batch=None):
+    """ Evalúa una secuencia de genomas (en su forma amigable). Primero se
+    calculan las restricciones, y sólo si todas se cumplen, se calculan los
+    objetivos. En caso contrario se aplican las penalizaciones.
+
+    Los objetivos marcados en *batch* se llaman una sola vez con la lista de
+    genomas que cumplen las restricciones, y deben regresar una lista con un
+    valor por genoma (si no, se lanza *ValueError*). El resto se llama una
+    vez por genoma.
+
+    Args:
+        genomes (list): Un arreglo de genomas en forma amigable.
+        constraints (tuple): Las funciones de restricción.
+        penalties (tuple): Las penalizaciones por restricción fallida, una
+            por cada objetivo.
+        objectives (tuple): Las funciones objetivo.
+        data (object): Los datos arbitrarios asociados a la tarea.
+        batch (tuple|None): Indica, para cada objetivo, si evalúa lotes de
+            genomas. *None* si ninguno lo hace.
+
+    Returns:
+        list: Un arreglo con el fitness de cada genoma, en el mismo orden.
+
+    """
+
+    fits = [[] for _ in genomes]
+
+    # Calculamos las restricciones
+    feasible = []
+    for i, genome in enumerate(genomes):
+        failed = 0
+        for constrain in constraints:
+            failed += constrain(genome, data)
+
+        if not failed:
+            feasible.append(i)
+        else:  # Aplicamos penalización si no cumple restricciones
+            fits[i] = [penalty * failed for penalty in penalties]
+
+    if not feasible:
+        return fits
+
+    if batch is None:
+        batch = (False,) * len(objectives)
+
+    # Calculamos objetivos para los que cumplen restricciones
+    feasible_genomes = [genomes[i] for i in feasible]
+    for objective, is_batch in zip(objectives, batch):
+        if is_batch:
+            values = objective(feasible_genomes, data)
+            if len(values) != len(feasible_genomes):
+                raise ValueError(
+                    'batch objective returned {0} values for {1} genomes'
+                    .format(len(values), len(feasible_genomes)))
+        else:
+            values = [objective(genome, data) for genome in feasible_genomes]
+
+        for i, value in zip(feasible, values):
+            fits[i].append(value)
+
+    return fits
+
+
+async def _call_async(function, genome, data, semaphore, timeout):
+    """ Llama a una función de evaluación. Si es una corrutina (*async def*),
+    se espera respetando el límite de llamadas simultáneas y de tiempo; en
+    otro caso se llama directamente.
+
+    Args:
+        function (function): La función objetivo o de restricción.
+        genome (list): El genoma en forma amigable.
+        data (object): Los datos arbitrarios asociados a la tarea.
+        semaphore (Semaphore|None): El límite de llamadas simultáneas.
+        timeout (float|None): Segundos máximos por llamada.
+
+    Returns:
+        object: El valor regresado por la función.
+
+    """
+
+    if not iscoroutinefunction(function):
+        return function(genome, data)
+    elif semaphore is None:
+        return await wait_for(function(genome, data), timeout)
+    else:
+        async with semaphore:
+            return await wait_for(function(genome, data), timeout)
+
+
+async def _gather_values(function_list, genome, data, semaphore, timeout):
+    """ Llama concurrentemente a varias funciones de evaluación sobre un
+    genoma. Se esperan todas las llamadas aunque alguna falle, y después se
+    propaga el primer error.
+
+    Args:
+        function_list (tuple): Las funciones a llamar.
+        genome (list): El genoma en forma amigable.
+        data (object): Los datos arbitrarios asociados a la tarea.
+        semaphore (Semaphore|None): El límite de llamadas simultáneas.
+        timeout (float|None): Segundos máximos por llamada.
+
+    Returns:
+        list: Los valores regresados, en el mismo orden.
+
+    """
+
+    values = await gather(*[_call_async(function,
+                                        genome,
+                                        data,
+                                        semaphore,
+                                        timeout)
+                            for function in function_list],
+                          return_exceptions=True)
+
+    for value in values:
+        if isinstance(value, BaseException):
+            raise value
+
+    return values
+
+
+async def _evaluate_genome_async(genome,
+                                 constraints,
+                                 penalties,
+                                 objectives,
+                                 data,
+                                 semaphore,
+                                 timeout):
+    """ Evalúa un genoma de forma asíncrona: primero las restricciones, y
+    sólo si todas se cumplen, los objetivos.
+
+    Args:
+        genome (list): El genoma en forma amigable.
+        constraints (tuple): Las funciones de restricción.
+        penalties (tuple): Las penalizaciones por restricción fallida.
+        objectives (tuple): Las funciones objetivo.
+        data (object): Los datos arbitrarios asociados a la tarea.
+        semaphore (Semaphore|None): El límite de llamadas simultáneas.
+        timeout (float|None): Segundos máximos por llamada.
+
+    Returns:
+        tuple: El fitness del genoma (o *None* si alguna llamada excedió el
+            tiempo máximo), y si el genoma cumple las restricciones.
+
+    """
+
+    try:
+        failed = sum(await _gather_values(constraints,
+                                          genome,
+                                          data,
+                                          semaphore,
+                                          timeout))
+        if failed:
+            return [penalty * failed for penalty in penalties], False
+
+        return await _gather_values(objectives,
+                                    genome,
+                                    data,
+                                    semaphore,
+                                    timeout), True
+    except TimeoutError:
+        return None, False
+
+
+async def evaluate_genomes_async(genomes,
+                                 constraints,
+                                 penalties,
+                                 objectives,
+                                 data,
+                                 concurrency=None,
+                                 timeout=None,
+                                 batch=None):
+    """ Evalúa una secuencia de genomas de forma asíncrona. Las funciones
+    objetivo y de restricción definidas con *async def* se ejecutan de forma
+    concurrente para todos los genomas, con a lo más *concurrency* llamadas
+    simultáneas, y cada una con un tiempo máximo de *timeout* segundos. Las
+    funciones normales se llaman directamente.
+
+    Los objetivos marcados en *batch* se llaman una sola vez, al final, con
+    la lista de genomas que cumplen las restricciones (ver
+    *evaluate_genomes*). Si una de esas llamadas excede el tiempo, todos los
+    genomas del lote quedan sin fitness.
+
+    Args:
+        genomes (list): Un arreglo de genomas en forma amigable.
+        constraints (tuple): Las funciones de restricción.
+        penalties (tuple): Las penalizaciones por restricción fallida.
+        objectives (tuple): Las funciones objetivo.
+        data (object): Los datos arbitrarios asociados a la tarea.
+        concurrency (int|None): Cantidad máxima de llamadas simultáneas.
+            *None* si no hay límite.
+        timeout (float|None): Segundos máximos por llamada. *None* si no hay
+            límite.
+        batch (tuple|None): Indica, para cada objetivo, si evalúa lotes de
+            genomas. *None* si ninguno lo hace.
+
+    Returns:
+        list: Un arreglo con el fitness de cada genoma, en el mismo orden.
+            Los genomas cuya evaluación excedió el tiempo tienen *None*.
+
+    """
+
+    if concurrency:
+        semaphore = Semaphore(concurrency)
+    else:
+        semaphore = None
+
+    if batch is None:
+        batch = (False,) * len(objectives)
+
+    single = tuple(objective for objective, is_batch
+                   in zip(objectives, batch) if not is_batch)
+
+    results = await gather(*[_evaluate_genome_async(genome,
+                                                    constraints,
+                                                    penalties,
+                                                    single,
+                                                    data,
+                                                    semaphore,
+                                                    timeout)
+                             for genome in genomes])
+    fits = [fit for fit, _ in results]
+
+    if len(single) == len(objectives):
+        return fits
+
+    feasible = [i for i, (_, ok) in enumerate(results) if ok]
+    if not feasible:
+        return fits
+
+    # Los objetivos por lotes reciben juntos los genomas factibles
+    feasible_genomes = [genomes[i] for i in feasible]
+    try:
+        columns = await _gather_values(
+            tuple(objective for objective, is_batch
+                  in zip(objectives, batch) if is_batch),
+            feasible_genomes,
+            data,
+            semaphore,
+            timeout)
+    except TimeoutError:
+        for i in feasible:
+            fits[i] = None
+        return fits
+
+    for values in columns:
+        if len(values) != len(feasible_genomes):
+            raise ValueError(
+                'batch objective returned {0} values for {1} genomes'
+                .format(len(values), len(feasible_genomes)))
+
+    for k, i in enumerate(feasible):
+        row = iter(fits[i])
+        column = iter([values[k] for values in columns])
+        fits[i] = [next(column) if is_batch else next(row)
+                   for is_batch in batch]
+
+    return fits
+
+
+# Contexto de evaluación de cada proceso trabajador. Se establece una sola vez
+# al crear el proceso, para no enviar los datos de la tarea en cada llamada.
+_worker_context = None
+
+
+def _init_worker(context):
+    """ Inicializa el contexto de evaluación de un proceso trabajador.
+
+    Args:
+        context (tuple): Restricciones, penalizaciones, objetivos, datos e
+            indicadores de evaluación por lotes.
+
+    """
+
+    global _worker_context
+    _worker_context = context
+
+
+def _evaluate_chunk(genomes):
+    """ Evalúa un bloque de genomas con el contexto del proceso trabajador.
+
+    Args:
+        genomes (list): Un arreglo de genomas en forma amigable.
+
+    Returns:
+        list: Un arreglo con el fitness de cada genoma.
+
+    """
+
+    return evaluate_genomes(genomes, *_worker_context)
+
+
+def _evaluate_one(genome, *context):
+    """ Evalúa un solo genoma.
+
+    Args:
+        genome (list): El genoma en forma amigable.
+        context (tuple): Restricciones, penalizaciones, objetivos, datos e
+            indicadores de evaluación por lotes.
+
+    Returns:
+        list: El fitness del genoma.
+
+    """
+
+    return evaluate_genomes([genome], *context)[0]
+
+
+def _evaluate_one_in_worker(genome):
+    """ Evalúa un solo genoma con el contexto del proceso trabajador.
+
+    Args:
+        genome (list): El genoma en forma amigable.
+
+    Returns:
+        list: El fitness del genoma.
+
+    """
+
+    return evaluate_genomes([genome], *_worker_context)[0]
+
+
+def _split(genomes, chunksize):
+    """ Divide un arreglo en bloques de tamaño *chunksize*.
+
+    Args:
+        genomes (list): El arreglo a dividir.
+        chunksize (int): El tamaño máximo de cada bloque.
+
+    Returns:
+        list: Un arreglo con los bloques.
+
+    """
+
+    return [genomes[i:i + chunksize]
+            for i in range(0, len(genomes), chunksize)]
+
+
+class SerialEvaluator:
+    """ Evaluador que calcula el fitness de los genomas uno tras otro en el
+    proceso actual. Es el evaluador por omisión de *Task*.
+
+    """
+
+    def evaluate(self,
+                 genomes,
+                 constraints,
+                 penalties,
+                 objectives,
+                 data,
+                 batch=None):
+        """ Evalúa los genomas proporcionados.
+
+        Args:
+            genomes (list): Un arreglo de genomas en forma amigable.
+            constraints (tuple): Las funciones de restricción.
+            penalties (tuple): Las penalizaciones por restricción fallida.
+            objectives (tuple): Las funciones objetivo.
+            data (object): Los datos arbitrarios asociados a la tarea.
+            batch (tuple|None): Indica qué objetivos evalúan lotes.
+
+        Returns:
+            list: Un arreglo con el fitness de cada genoma, en el mismo orden.
+
+        """
+
+        return evaluate_genomes(genomes,
+                                constraints,
+                                penalties,
+                                objectives,
+                                data,
+                                batch)
+
+    def submit(self,
+               genome,
+               constraints,
+               penalties,
+               objectives,
+               data,
+               batch=None):
+        """ Solicita la evaluación de un solo genoma, sin esperar el resultado.
+        En éste evaluador, la evaluación se hace de inmediato.
+
+        Args:
+            genome (list): El genoma en forma amigable.
+            constraints (tuple): Las funciones de restricción.
+            penalties (tuple): Las penalizaciones por restricción fallida.
+            objectives (tuple): Las funciones objetivo.
+            data (object): Los datos arbitrarios asociados a la tarea.
+            batch (tuple|None): Indica qué objetivos evalúan lotes.
+
+        Returns:
+            Future: Un futuro con el fitness del genoma.
+
+        """
+
+        future = Future()
+        try:
+            future.set_result(self.evaluate([genome],
+                                            constraints,
+                                            penalties,
+                                            objectives,
+                                            data,
+                                            batch)[0])
+        except Exception as e:
+            future.set_exception(e)
+
+        return future
+
+    def get_workers(self):
+        """ Regresa la cantidad de evaluaciones que pueden hacerse a la vez.
+
+        Returns:
+            int: La cantidad de trabajadores.
+
+        """
+
+        return 1
+
+    def close(self):
+        """ Libera los recursos del evaluador (no hay ninguno).
+
+        """
+
+        pass
+
+
+class ThreadEvaluator(SerialEvaluator):
+    """ Evaluador que reparte bloques de genomas en un grupo de hilos. Útil
+    cuando las funciones objetivo liberan el GIL (E/S, extensiones en C).
+
+    Attributes:
+        _workers (int): Número de hilos.
+        _chunksize (int|None): Genomas por bloque. Si es *None* se reparten
+            los genomas en partes iguales entre los hilos.
+        _executor (ThreadPoolExecutor|None): El grupo de hilos.
+
+    """
+
+    def __init__(self, workers=None, chunksize=None):
+        """ Constructor de la clase *ThreadEvaluator*.
+
+        Args:
+            workers (int|None): Número de hilos. Por omisión, el número de
+                procesadores.
+            chunksize (int|None): Genomas por bloque.
+
+        """
+
+        self._workers = workers or cpu_count() or 1
+        self._chunksize = chunksize
+        self._executor = None
+
+    def _get_chunksize(self, n):
+        """ Calcula el tamaño de bloque para *n* genomas.
+
+        Args:
+            n (int): Número de genomas a evaluar.
+
+        Returns:
+            int: El tamaño de bloque.
+
+        """
+
+        if self._chunksize is not None:
+            return self._chunksize
+        else:
+            return max(1, -(-n // self._workers))
+
+    def evaluate(self,
+                 genomes,
+                 constraints,
+                 penalties,
+                 objectives,
+                 data,
+                 batch=None):
+        """ Evalúa los genomas proporcionados en el grupo de hilos.
+
+        Args:
+            genomes (list): Un arreglo de genomas en forma amigable.
+            constraints (tuple): Las funciones de restricción.
+            penalties (tuple): Las penalizaciones por restricción fallida.
+            objectives (tuple): Las funciones objetivo.
+            data (object): Los datos arbitrarios asociados a la tarea.
+            batch (tuple|None): Indica qué objetivos evalúan lotes.
+
+        Returns:
+            list: Un arreglo con el fitness de cada genoma, en el mismo orden.
+
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._workers)
+
+        chunks = _split(genomes, self._get_chunksize(len(genomes)))
+        fits = []
+        for chunk_fits in self._executor.map(
+                lambda chunk: evaluate_genomes(chunk,
+                                               constraints,
+                                               penalties,
+                                               objectives,
+                                               data,
+                                               batch),
+                chunks):
+            fits.extend(chunk_fits)
+
+        return fits
+
+    def submit(self,
+               genome,
+               constraints,
+               penalties,
+               objectives,
+               data,
+               batch=None):
+        """ Solicita la evaluación de un solo genoma en el grupo de hilos, sin
+        esperar el resultado.
+
+        Args:
+            genome (list): El genoma en forma amigable.
+            constraints (tuple): Las funciones de restricción.
+            penalties (tuple): Las penalizaciones por restricción fallida.
+            objectives (tuple): Las funciones objetivo.
+            data (object): Los datos arbitrarios asociados a la tarea.
+            batch (tuple|None): Indica qué objetivos evalúan lotes.
+
+        Returns:
+            Future: Un futuro con el fitness del genoma.
+
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._workers)
+
+        return self._executor.submit(_evaluate_one,
+                                     genome,
+                                     constraints,
+                                     penalties,
+                                     objectives,
+                                     data,
+                                     batch)
+
+    def get_workers(self):
+        """ Regresa la cantidad de evaluaciones que pueden hacerse a la vez.
+
+        Returns:
+            int: La cantidad de trabajadores.
+
+        """
+
+        return self._workers
+
+    def close(self):
+        """ Termina el grupo de hilos.
+
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class ProcessEvaluator(ThreadEvaluator):
+    """ Evaluador que reparte bloques de genomas en un grupo de procesos. Los
+    datos de la tarea y las funciones de evaluación se envían a cada proceso
+    una sola vez, al crearlo. Si cambian, el grupo se crea de nuevo.
+
+    Las funciones de evaluación y los datos deben poder serializarse con
+    *pickle* (funciones definidas a nivel de módulo).
+
+    Attributes:
+        _context (tuple|None): El contexto con el que se creó el grupo de
+            procesos.
+
+    """
+
+    def __init__(self, workers=None, chunksize=None):
+        """ Constructor de la clase *ProcessEvaluator*.
+
+        Args:
+            workers (int|None): Número de procesos. Por omisión, el número de
+                procesadores.
+            chunksize (int|None): Genomas por bloque.
+
+        """
+
+        super().__init__(workers, chunksize)
+        self._context = None
+
+    def evaluate(self,
+                 genomes,
+                 constraints,
+                 penalties,
+                 objectives,
+                 data,
+                 batch=None):
+        """ Evalúa los genomas proporcionados en el grupo de procesos.
+
+        Args:
+            genomes (list): Un arreglo de genomas en forma amigable.
+            constraints (tuple): Las funciones de restricción.
+            penalties (tuple): Las penalizaciones por restricción fallida.
+            objectives (tuple): Las funciones objetivo.
+            data (object): Los datos arbitrarios asociados a la tarea.
+            batch (tuple|None): Indica qué objetivos evalúan lotes.
+
+        Returns:
+            list: Un arreglo con el fitness de cada genoma, en el mismo orden.
+
+        """
+
+        self._prepare((constraints, penalties, objectives, data, batch))
+
+        chunks = _split(genomes, self._get_chunksize(len(genomes)))
+        fits = []
+        for chunk_fits in self._executor.map(_evaluate_chunk, chunks):
+            fits.extend(chunk_fits)
+
+        return fits
+
+    def submit(self,
+               genome,
+               constraints,
+               penalties,
+               objectives,
+               data,
+               batch=None):
+        """ Solicita la evaluación de un solo genoma en el grupo de procesos,
+        sin esperar el resultado.
+
+        Args:
+            genome (list): El genoma en forma amigable.
+            constraints (tuple): Las funciones de restricción.
+            penalties (tuple): Las penalizaciones por restricción fallida.
+            objectives (tuple): Las funciones objetivo.
+            data (object): Los datos arbitrarios asociados a la tarea.
+            batch (tuple|None): Indica qué objetivos evalúan lotes.
+
+        Returns:
+            Future: Un futuro con el fitness del genoma.
+
+        """
+
+        self._prepare((constraints, penalties, objectives, data, batch))
+
+        return self._executor.submit(_evaluate_one_in_worker, genome)
+
+    def _prepare(self, context):
+        """ Crea el grupo de procesos, o lo crea de nuevo si cambió el
+        contexto de evaluación.
+
+        Args:
+            context (tuple): Restricciones, penalizaciones, objetivos, datos e
+                indicadores de evaluación por lotes.
+
+        """
+
+        if self._context is None or \
+                any(a is not b for a, b in zip(self._context, context)):
+            self.close()
+            self._executor = ProcessPoolExecutor(self._workers,
+                                                 initializer=_init_worker,
+                                                 initargs=(context,))
+            self._context = context
+
+    def close(self):
+        """ Termina el grupo de procesos.
+
+        """
+
+        super().close()
+        self._context = None
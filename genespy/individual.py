@@ -13,8 +13,6 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
 
-from copy import copy
-
 
 class Individual:
     """ Clase base para los individuos.
@@ -24,9 +22,20 @@ class Individual:
         _fitness (list): Un arreglo de valores fitness.
         _data (object): Un objeto arbitraria que contiene datos adjuntos al
             individuo
+        _delta (tuple|None): El fitness previo a las mutaciones pendientes de
+            evaluar, los movimientos aplicados desde entonces, y cuántas
+            evaluaciones incrementales encadenadas produjeron ese fitness.
+            Permite la evaluación incremental (ver *record_moves*). Si el
+            individuo tiene un fitness incremental, sólo guarda esa cantidad,
+            como (None, (), cantidad).
+        _order_key (tuple|None): La última llave de orden calculada por una
+            tarea, junto con la especificación de orden con la que se calculó.
+            Se descarta al cambiar el fitness.
 
     """
 
+    __slots__ = ('_genome', '_fitness', '_data', '_delta', '_order_key')
+
     def __init__(self, genome, data=None, fitness=None):
         """ Constructor de la clase  *Individual*.
 
@@ -40,6 +49,8 @@ class Individual:
         self._genome = genome
         self._fitness = fitness
         self._data = data
+        self._delta = None
+        self._order_key = None
 
     def __str__(self):
         """ La representación en cadena del objeto.
@@ -115,8 +126,17 @@ class Individual:
 
         """
 
-        c = copy(self)
+        cls = self.__class__
+        c = cls.__new__(cls)
         c._genome = self._genome[:]
+        c._fitness = self._fitness
+        c._data = self._data
+        c._delta = self._delta
+        c._order_key = self._order_key
+
+        # Subclases de usuario sin __slots__
+        if hasattr(self, '__dict__'):
+            c.__dict__.update(self.__dict__)
 
         return c
 
@@ -179,12 +199,100 @@ class Individual:
     def set_fitness(self, fit):
         """ Establece el fitness del individuo.
 
+        Al hacerlo se descartan los movimientos pendientes de evaluación
+        incremental.
+
         Args:
             fit (list|None): Un arreglo con el fitness del individuo.
 
         """
 
         self._fitness = fit
+        self._delta = None
+        self._order_key = None
+
+    def record_moves(self, moves):
+        """ Registra los movimientos que un mutador aplicó al genoma, y deja
+        al individuo sin fitness. Se conserva el último fitness conocido, de
+        modo que los objetivos con evaluación incremental (*delta*) puedan
+        calcular el nuevo fitness a partir de él y de los movimientos.
+
+        Args:
+            moves (iterable): Los movimientos aplicados, en orden. Cada uno es
+                una tupla cuyo primer elemento indica el tipo, p.ej.
+                ('swap', j, k) o ('insert', a, b).
+
+        """
+
+        if self._fitness is not None:
+            depth = self._delta[2] if self._delta is not None else 0
+            self._delta = (self._fitness, tuple(moves), depth)
+        elif self._delta is not None:
+            self._delta = (self._delta[0],
+                           self._delta[1] + tuple(moves),
+                           self._delta[2])
+
+        self._fitness = None
+        self._order_key = None
+
+    def get_delta(self):
+        """ Regresa el fitness previo y los movimientos pendientes de
+        evaluación incremental.
+
+        Returns:
+            tuple|None: Una tupla (fitness previo, movimientos, evaluaciones
+                incrementales encadenadas en el fitness previo), o *None* si
+                no hay evaluación incremental posible.
+
+        """
+
+        if self._fitness is not None:
+            return None
+
+        return self._delta
+
+    def set_delta_fitness(self, fit, depth):
+        """ Establece un fitness calculado de forma incremental, y recuerda
+        cuántas evaluaciones incrementales encadenadas lo produjeron.
+
+        Args:
+            fit (list): Un arreglo con el fitness del individuo.
+            depth (int): Las evaluaciones incrementales encadenadas.
+
+        """
+
+        self.set_fitness(fit)
+        self._delta = (None, (), depth)
+
+    def get_order_key(self, spec):
+        """ Regresa la llave de orden memorizada, si fue calculada con la
+        especificación de orden indicada.
+
+        Args:
+            spec (tuple): La especificación de orden de la tarea.
+
+        Returns:
+            tuple|None: La llave de orden, o *None* si no hay una vigente.
+
+        """
+
+        key = self._order_key
+        if key is not None and key[0] is spec:
+            return key[1]
+        else:
+            return None
+
+    def set_order_key(self, spec, key):
+        """ Memoriza la llave de orden del individuo hasta que cambie su
+        fitness.
+
+        Args:
+            spec (tuple): La especificación de orden de la tarea.
+            key (tuple): La llave de orden.
+
+        """
+
+        self._order_key = (spec, key)
 
     def get_data(self):
         """ Regresa los datos arbitrarios asociados al individuo.
@@ -215,3 +323,14 @@ class Individual:
         """
 
         return len(self._genome)
+
+    def get_key(self):
+        """ Regresa una forma inmutable del genoma en bruto, útil como llave de
+        diccionarios o conjuntos.
+
+        Returns:
+            tuple: El genoma en bruto como tupla.
+
+        """
+
+        return tuple(self._genome)
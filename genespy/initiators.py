@@ -13,12 +13,15 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
 
-from random import shuffle, uniform, getrandbits, choices
+import random
 from .individual import Individual
-from .binaryind import BinaryInd
+from .binaryind import BinaryInd, BinaryLayout, PackedBinaryInd
 
+# Individuos por bloque de bits aleatorios en init_binary_pop
+_BULK_SIZE = 4096
 
-def init_permutation_pop(n, elements):
+
+def init_permutation_pop(n, elements, rng=None):
     """ Crea una población de tamaño *n* de individuos con un genoma que
     almacena permutaciones. Los elementos a permutar se establecen
     en *elements*.
@@ -26,6 +29,9 @@ def init_permutation_pop(n, elements):
     Args:
         n (int): Cantidad de individuos a crear.
         elements (list|tuple): Un arreglo con los elementos a permutar.
+        rng (random.Random|None): El generador de números aleatorios (p.ej.
+            el de la tarea, ver *Task.get_random*). *None* para el del módulo
+            *random*.
 
     Returns:
         list: La población.
@@ -36,6 +42,7 @@ def init_permutation_pop(n, elements):
     if n < 2:
         n = 2
 
+    shuffle = (random if rng is None else rng).shuffle
     new_pop = []
     for _ in range(n):
         genome = list(elements[:])
@@ -45,7 +52,7 @@ def init_permutation_pop(n, elements):
     return new_pop
 
 
-def init_float_pop(n, numbers, minimum, maximum):
+def init_float_pop(n, numbers, minimum, maximum, rng=None):
     """ Crea una población de tamaño *n* de individuos con un genoma que
     almacena numberos flotantes.
 
@@ -54,6 +61,8 @@ def init_float_pop(n, numbers, minimum, maximum):
         numbers (int): Cantidad de números almacenados en un genoma.
         minimum (float): Valor mínimo del rango del cual se tomarán los números.
         maximum (float): Valor máximo del rango del cual se tomarán los números.
+        rng (random.Random|None): El generador de números aleatorios. *None*
+            para el del módulo *random*.
 
     Returns:
         list: La población.
@@ -64,20 +73,27 @@ def init_float_pop(n, numbers, minimum, maximum):
     if n < 2:
         n = 2
 
+    # Equivalente a uniform(minimum, maximum), sin el costo de la llamada
+    span = maximum - minimum
+    rand = (random if rng is None else rng).random
     new_pop = []
     for _ in range(n):
-        genome = []
-        for __ in range(numbers):
-            genome.append(uniform(minimum, maximum))
+        genome = [minimum + span * rand() for __ in range(numbers)]
         new_pop.append(Individual(genome))
 
     return new_pop
 
 
-def init_binary_pop(n, structure):
+def init_binary_pop(n, structure, packed=False, rng=None):
     """ Crea una población de tamaño *n* de individuos con un genoma que
     almacena variables codificadas en binario.
 
+    Si *packed* es verdadero, los genomas se empaquetan en enteros, un bit por
+    gen (ver *PackedBinaryInd*).
+
+    Los bits aleatorios se generan por bloques de *_BULK_SIZE* individuos: se
+    toma un solo número aleatorio para todo el bloque, y se divide en genomas.
+
     Args:
         n (int): Cantidad de individuos a crear.
         structure (tuple): Un arreglo que especifica cómo se codificarán las
@@ -93,6 +109,10 @@ def init_binary_pop(n, structure):
 
         ((True, 10, 5), (False, 13, 0))
 
+        packed (bool): Indica si los genomas se empaquetan en enteros.
+        rng (random.Random|None): El generador de números aleatorios. *None*
+            para el del módulo *random*.
+
     Returns:
         list: La población.
 
@@ -102,28 +122,51 @@ def init_binary_pop(n, structure):
     if n < 2:
         n = 2
 
-    # Se calculan atributos de aceleración de cálculo con base en estructura
-    total_bits = 0
-    var_bits = []
-    sign_bits = []
-    precalc = []
-    for i in structure:
-        current_bits = sum(i)
-        total_bits += current_bits
-        var_bits.append(current_bits)
-        sign_bits.append(i[0])
-        precalc.append(1.0 / (2**i[2]))
+    # Se calcula una sola vez la estructura compartida por los individuos
+    layout = BinaryLayout(structure)
+    total_bits = layout.get_total_bits()
+    getrandbits = (random if rng is None else rng).getrandbits
 
     # Se crean los individuos
     new_pop = []
-    for _ in range(n):
-        genome = bytearray(
-            '{0:b}'.format(getrandbits(total_bits)).zfill(total_bits),
-            'ascii')
-        new_pop.append(BinaryInd(genome,
-                                 tuple(var_bits),
-                                 tuple(sign_bits),
-                                 tuple(precalc),
-                                 structure))
+    if packed:
+        # Extraer de un entero enorme es cuadrático; getrandbits ya es directo
+        for _ in range(n):
+            new_pop.append(PackedBinaryInd(getrandbits(total_bits), layout))
+        return new_pop
+
+    for first in range(0, n, _BULK_SIZE):
+        block = min(_BULK_SIZE, n - first) * total_bits
+        bits = bytearray('{0:b}'.format(getrandbits(block)).zfill(block),
+                         'ascii')
+        for i in range(0, block, total_bits):
+            new_pop.append(BinaryInd(bits[i:i + total_bits], layout))
 
     return new_pop
+
+
+def encode_binary_pop(genomes, structure, packed=False):
+    """ Crea una población de individuos binarios a partir de genomas
+    conocidos en forma amigable (por ejemplo, soluciones previas). Todos los
+    individuos comparten una sola estructura de codificación, y cada genoma se
+    codifica con aritmética entera (ver *BinaryLayout.encode*).
+
+    Args:
+        genomes (iterable): Los genomas en forma amigable.
+        structure (tuple): La estructura de las variables (ver
+            *init_binary_pop*).
+        packed (bool): Indica si los genomas se empaquetan en enteros.
+
+    Returns:
+        list: La población.
+
+    """
+
+    layout = BinaryLayout(structure)
+    encode = layout.encode
+
+    if packed:
+        return [PackedBinaryInd(encode(genome), layout) for genome in genomes]
+
+    to_ascii = layout.to_ascii
+    return [BinaryInd(to_ascii(encode(genome)), layout) for genome in genomes]
@@ -0,0 +1,543 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+from math import radians, sin, cos, asin, sqrt
+from multiprocessing import Pool
+from mmap import mmap, ACCESS_READ
+from json import dumps, loads
+from struct import pack, unpack, calcsize
+from hashlib import sha256
+from os import path as os_path, replace, remove, getpid
+from .utils import haversine_distance
+
+# NumPy es opcional: sólo acelera la construcción de matrices
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Encabezado de los archivos de matriz: firma, nodos y bytes de identificadores
+_MAGIC = b'GPYCOST1'
+_HEADER = '<8sQQ'
+
+
+class CostMatrix:
+    """ Matriz de costos densa. Los costos se guardan en un arreglo plano de
+    flotantes, indexado por enteros: el costo de ir del nodo *i* al nodo *j*
+    está en la posición *i * size + j*. Cada nodo conserva su identificador
+    original, que se traduce a índice con *index_of* o *indices*.
+
+    Los genomas de permutación que usan esta matriz almacenan índices enteros
+    en lugar de identificadores (ver *travel_cost_dense* y
+    *crossover_scx_dense*).
+
+    Attributes:
+        _ids (list): Los identificadores de los nodos, en orden de índice.
+        _index (dict): El índice de cada identificador.
+        _size (int): La cantidad de nodos.
+        _values (array|memoryview): Los costos, fila tras fila.
+        _path (str|None): El archivo del que se proyectan los costos, si es
+            el caso. Al serializar la matriz (p.ej., hacia un proceso
+            trabajador) sólo se envía la ruta, y el proceso proyecta el mismo
+            archivo, de modo que todos comparten una sola copia física.
+
+    """
+
+    def __init__(self, ids, values=None, path=None):
+        """ Constructor de la clase *CostMatrix*.
+
+        Args:
+            ids (iterable): Los identificadores de los nodos.
+            values (array|memoryview|None): Los costos, fila tras fila. Si es
+                *None*, se crea una matriz de ceros.
+            path (str|None): El archivo del que se proyectan los costos.
+
+        """
+
+        self._ids = list(ids)
+        self._index = {key: i for i, key in enumerate(self._ids)}
+        self._size = len(self._ids)
+
+        if values is None:
+            values = array('d', bytes(8 * self._size * self._size))
+        elif len(values) != self._size * self._size:
+            raise ValueError('values must have size * size elements')
+
+        self._values = values
+        self._path = path
+
+    def __reduce__(self):
+        """ Serializa la matriz. Si está proyectada desde un archivo, sólo se
+        serializa la ruta.
+
+        Returns:
+            tuple: La función y argumentos que reconstruyen la matriz.
+
+        """
+
+        if self._path is not None:
+            return load_cost_matrix, (self._path,)
+        else:
+            return self.__class__, (self._ids, self._values)
+
+    def save(self, path):
+        """ Guarda la matriz en un archivo binario (ver *load_cost_matrix*).
+        La escritura es atómica: se escribe un archivo temporal que después
+        sustituye al destino.
+
+        Args:
+            path (str): La ruta del archivo.
+
+        """
+
+        encoded_ids = dumps(self._ids).encode('utf-8')
+        offset = _data_offset(len(encoded_ids))
+        tmp_path = '{0}.{1}.tmp'.format(path, getpid())
+
+        with open(tmp_path, 'wb') as f:
+            f.write(pack(_HEADER, _MAGIC, self._size, len(encoded_ids)))
+            f.write(encoded_ids)
+            f.write(bytes(offset - f.tell()))
+            f.write(memoryview(self._values).cast('B'))
+
+        replace(tmp_path, path)
+
+    @classmethod
+    def from_nested(cls, matrix):
+        """ Crea una matriz densa a partir de una matriz de diccionarios, como
+        la que regresa *create_distance_matrix*.
+
+        Args:
+            matrix (dict): Un diccionario de diccionarios de costos.
+
+        Returns:
+            CostMatrix: La matriz densa.
+
+        """
+
+        ids = list(matrix)
+        dense = cls(ids)
+        values = dense._values
+        size = dense._size
+
+        for i, key_from in enumerate(ids):
+            row = matrix[key_from]
+            for j, key_to in enumerate(ids):
+                values[i * size + j] = row[key_to]
+
+        return dense
+
+    def get(self, i, j):
+        """ Regresa el costo de ir del nodo *i* al nodo *j* (índices).
+
+        Args:
+            i (int): El índice del nodo de origen.
+            j (int): El índice del nodo de destino.
+
+        Returns:
+            float: El costo.
+
+        """
+
+        return self._values[i * self._size + j]
+
+    def set(self, i, j, value):
+        """ Establece el costo de ir del nodo *i* al nodo *j* (índices).
+
+        Args:
+            i (int): El índice del nodo de origen.
+            j (int): El índice del nodo de destino.
+            value (float): El costo.
+
+        """
+
+        self._values[i * self._size + j] = value
+
+    def get_values(self):
+        """ Regresa el arreglo plano de costos (sin copiar).
+
+        Returns:
+            array: Los costos, fila tras fila.
+
+        """
+
+        return self._values
+
+    def get_size(self):
+        """ Regresa la cantidad de nodos.
+
+        Returns:
+            int: La cantidad de nodos.
+
+        """
+
+        return self._size
+
+    def get_ids(self):
+        """ Regresa los identificadores de los nodos, en orden de índice.
+
+        Returns:
+            list: Los identificadores.
+
+        """
+
+        return self._ids
+
+    def index_of(self, key):
+        """ Regresa el índice del nodo con el identificador dado.
+
+        Args:
+            key (object): El identificador del nodo.
+
+        Returns:
+            int: El índice del nodo.
+
+        """
+
+        return self._index[key]
+
+    def indices(self, keys):
+        """ Traduce una secuencia de identificadores a índices.
+
+        Args:
+            keys (iterable): Los identificadores.
+
+        Returns:
+            list: Los índices.
+
+        """
+
+        index = self._index
+        return [index[key] for key in keys]
+
+    def ids(self, indices):
+        """ Traduce una secuencia de índices a identificadores (p.ej., para
+        mostrar el genoma de la solución).
+
+        Args:
+            indices (iterable): Los índices.
+
+        Returns:
+            list: Los identificadores.
+
+        """
+
+        ids = self._ids
+        return [ids[i] for i in indices]
+
+
+def create_cost_matrix(points):
+    """ Crea la matriz densa de distancias entre un conjunto de puntos, dados
+    de la forma:
+
+    {'id': id, latitude': lat, 'longitude': long}
+
+    Args:
+        points (list): Un arreglo con los puntos a calcular sus distancias.
+
+    Returns:
+        CostMatrix: Una matriz densa con las distancias entre los puntos.
+
+    """
+
+    matrix = CostMatrix(point['id'] for point in points)
+    values = matrix.get_values()
+    size = matrix.get_size()
+
+    # Se calcula el triángulo inferior y se refleja
+    for i in range(size):
+        lat_from = points[i]['latitude']
+        long_from = points[i]['longitude']
+        for j in range(i):
+            distance = haversine_distance(lat_from,
+                                          long_from,
+                                          points[j]['latitude'],
+                                          points[j]['longitude'])
+            values[i * size + j] = distance
+            values[j * size + i] = distance
+
+    return matrix
+
+
+def _data_offset(ids_size):
+    """ Calcula la posición de los costos en un archivo de matriz, alineada
+    a 8 bytes.
+
+    Args:
+        ids_size (int): El tamaño en bytes de los identificadores.
+
+    Returns:
+        int: La posición de los costos.
+
+    """
+
+    return (calcsize(_HEADER) + ids_size + 7) // 8 * 8
+
+
+def _create_file(path, ids):
+    """ Crea un archivo de matriz con el encabezado y espacio para los costos,
+    y lo proyecta en memoria.
+
+    El formato es: la firma *GPYCOST1*, la cantidad de nodos y el tamaño de
+    los identificadores (enteros de 64 bits), los identificadores como JSON,
+    y los costos como flotantes de 64 bits, fila tras fila, alineados a 8
+    bytes. El encabezado es *little-endian*; los costos usan el orden de bytes
+    nativo de la máquina.
+
+    Args:
+        path (str): La ruta del archivo.
+        ids (list): Los identificadores de los nodos.
+
+    Returns:
+        memoryview: Los costos, proyectados en memoria.
+
+    """
+
+    size = len(ids)
+    encoded_ids = dumps(ids).encode('utf-8')
+    offset = _data_offset(len(encoded_ids))
+
+    with open(path, 'w+b') as f:
+        f.write(pack(_HEADER, _MAGIC, size, len(encoded_ids)))
+        f.write(encoded_ids)
+        f.truncate(offset + 8 * size * size)
+        mapped = mmap(f.fileno(), 0)
+
+    return memoryview(mapped)[offset:].cast('d')
+
+
+# Coordenadas (en radianes) de cada proceso trabajador. Se establecen una sola
+# vez al crear el proceso.
+_coords = None
+
+
+def _init_coords(coords):
+    """ Inicializa las coordenadas de un proceso trabajador.
+
+    Args:
+        coords (tuple): Latitudes, longitudes, radio y uso de NumPy.
+
+    """
+
+    global _coords
+    _coords = coords
+
+
+def _distance_rows(rows):
+    """ Calcula las distancias de Haversine de un bloque de filas contra
+    todos los puntos.
+
+    Args:
+        rows (tuple): La primera y la última (exclusiva) fila del bloque.
+
+    Returns:
+        tuple: La primera fila y los costos del bloque en bytes.
+
+    """
+
+    first, last = rows
+    lats, longs, radius, use_numpy = _coords
+
+    if use_numpy:
+        lat_to = np.asarray(lats)
+        long_to = np.asarray(longs)
+        lat_from = lat_to[first:last, None]
+        long_from = long_to[first:last, None]
+        angle = np.sin((lat_to - lat_from) / 2.0)**2 + \
+            np.cos(lat_from) * np.cos(lat_to) * \
+            np.sin((long_to - long_from) / 2.0)**2
+        block = 2.0 * np.arcsin(np.sqrt(angle)) * radius
+        return first, block.tobytes()
+
+    cos_lats = [cos(lat) for lat in lats]
+    points = list(zip(lats, longs, cos_lats))
+    block = array('d')
+    for i in range(first, last):
+        lat_from, long_from, cos_from = points[i]
+        for lat_to, long_to, cos_to in points:
+            block.append(
+                2.0 * asin(sqrt(sin((lat_to - lat_from) / 2.0)**2 +
+                                cos_from * cos_to *
+                                sin((long_to - long_from) / 2.0)**2)) *
+                radius)
+
+    return first, block.tobytes()
+
+
+def build_cost_matrix(points,
+                      block=256,
+                      processes=None,
+                      path=None,
+                      use_numpy=None,
+                      sphere_radius=6371000.0):
+    """ Construye la matriz densa de distancias de Haversine entre un conjunto
+    de puntos grande, por bloques de filas. Los bloques pueden calcularse en
+    varios procesos y con NumPy (si está disponible), y la matriz puede
+    escribirse directamente en un archivo proyectado en memoria.
+
+    Los puntos se dan de la forma:
+
+    {'id': id, latitude': lat, 'longitude': long}
+
+    Args:
+        points (list): Un arreglo con los puntos a calcular sus distancias.
+        block (int): Filas de la matriz por bloque.
+        processes (int|None): Procesos a usar. Si es *None*, se calcula en el
+            proceso actual.
+        path (str|None): Archivo donde se escribe la matriz. Si es *None*, la
+            matriz se guarda en memoria.
+        use_numpy (bool|None): Indica si se usa NumPy. Por omisión, se usa si
+            está disponible.
+        sphere_radius (float): Radio de la esfera.
+
+    Returns:
+        CostMatrix: Una matriz densa con las distancias entre los puntos.
+
+    """
+
+    ids = [point['id'] for point in points]
+    size = len(ids)
+
+    if use_numpy is None:
+        use_numpy = np is not None
+
+    if path is None:
+        values = array('d', bytes(8 * size * size))
+    else:
+        values = _create_file(path, ids)
+
+    coords = ([radians(point['latitude']) for point in points],
+              [radians(point['longitude']) for point in points],
+              sphere_radius,
+              use_numpy)
+    blocks = [(first, min(first + block, size))
+              for first in range(0, size, block)]
+
+    raw = memoryview(values).cast('B')
+    row_bytes = 8 * size
+
+    if processes is None:
+        _init_coords(coords)
+        results = map(_distance_rows, blocks)
+        for first, costs in results:
+            raw[first * row_bytes:first * row_bytes + len(costs)] = costs
+    else:
+        with Pool(processes, _init_coords, (coords,)) as pool:
+            for first, costs in pool.imap_unordered(_distance_rows, blocks):
+                raw[first * row_bytes:first * row_bytes + len(costs)] = costs
+
+    raw.release()
+
+    return CostMatrix(ids, values, path)
+
+
+def load_cost_matrix(path, mapped=True):
+    """ Carga una matriz guardada con *CostMatrix.save* o
+    *build_cost_matrix*.
+
+    Si *mapped* es verdadero, los costos se proyectan en memoria (sólo
+    lectura) en lugar de leerse: la carga es inmediata, y varios procesos que
+    carguen el mismo archivo comparten una sola copia física.
+
+    Args:
+        path (str): La ruta del archivo.
+        mapped (bool): Indica si el archivo se proyecta en memoria.
+
+    Returns:
+        CostMatrix: La matriz.
+
+    """
+
+    with open(path, 'rb') as f:
+        magic, size, ids_size = unpack(_HEADER, f.read(calcsize(_HEADER)))
+        if magic != _MAGIC:
+            raise ValueError('{0} is not a cost matrix file'.format(path))
+
+        ids = loads(f.read(ids_size).decode('utf-8'))
+        offset = _data_offset(ids_size)
+
+        if mapped:
+            mapped_file = mmap(f.fileno(), 0, access=ACCESS_READ)
+            values = memoryview(mapped_file)[offset:].cast('d')
+            return CostMatrix(ids, values, path)
+
+        f.seek(offset)
+        values = array('d')
+        values.fromfile(f, size * size)
+
+    return CostMatrix(ids, values)
+
+
+def points_hash(points):
+    """ Calcula una huella del conjunto de puntos (identificadores y
+    coordenadas, en orden), útil para saber si una matriz guardada sigue
+    siendo válida.
+
+    Args:
+        points (list): Un arreglo de puntos con la forma
+            {'id': id, latitude': lat, 'longitude': long}.
+
+    Returns:
+        str: La huella en hexadecimal.
+
+    """
+
+    content = dumps([[point['id'], point['latitude'], point['longitude']]
+                     for point in points])
+
+    return sha256(content.encode('utf-8')).hexdigest()
+
+
+def cached_cost_matrix(points, directory, sphere_radius=6371000.0,
+                       **build_args):
+    """ Regresa la matriz de distancias de un conjunto de puntos, reutilizando
+    la guardada en *directory* si los puntos no han cambiado. Si no existe,
+    se construye con *build_cost_matrix* y se guarda para las siguientes
+    ejecuciones.
+
+    El archivo se nombra con la huella de los puntos (*points_hash*) y del
+    radio de la esfera, el único argumento de construcción que altera los
+    valores; la matriz regresada está proyectada en memoria desde él.
+
+    Args:
+        points (list): Un arreglo con los puntos a calcular sus distancias.
+        directory (str): El directorio donde se guardan las matrices.
+        sphere_radius (float): Radio de la esfera.
+        **build_args: Argumentos adicionales para *build_cost_matrix*
+            (*block*, *processes*, *use_numpy*).
+
+    Returns:
+        CostMatrix: La matriz de distancias.
+
+    """
+
+    key = sha256('{0}:{1!r}'.format(points_hash(points),
+                                    float(sphere_radius)).encode('utf-8'))
+    path = os_path.join(directory, '{0}.gpycost'.format(key.hexdigest()))
+
+    if not os_path.exists(path):
+        tmp_path = '{0}.{1}.tmp'.format(path, getpid())
+        try:
+            matrix = build_cost_matrix(points, path=tmp_path,
+                                       sphere_radius=sphere_radius,
+                                       **build_args)
+            del matrix
+            replace(tmp_path, path)
+        finally:
+            if os_path.exists(tmp_path):
+                remove(tmp_path)
+
+    return load_cost_matrix(path)
@@ -13,8 +13,7 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
 
-from random import randrange
-from .utils import geometric_dist, gauss_dist
+from .utils import geometric_dist, gauss_dist, task_random
 
 
 def mutate_swap(task, individual, args):
@@ -22,10 +21,13 @@ def mutate_swap(task, individual, args):
     elementos de sus genomas cada vez. La cantidad de parejas intercambiadas
     estará en función de la probabilidad *mp*.
 
-    Establece en *None* el fitness del individuo mutado.
+    Establece en *None* el fitness del individuo mutado, y registra los
+    intercambios como movimientos ('swap', j, k) para la evaluación
+    incremental.
 
     Args:
-        task (Task): Una referencia a la tarea asociada al elemento (no usada).
+        task (Task): Una referencia a la tarea asociada al elemento (de ella
+            se toma el generador de números aleatorios).
         individual (Individual): Un individuo.
         args (dict): Un arreglo con los parámetros propios de este método. *mp*
         como un número entre 0.0 y 1.0, que representa la probabilidad de que un
@@ -33,26 +35,29 @@ def mutate_swap(task, individual, args):
 
     """
 
-    changed = False
+    moves = []
 
+    rng = task_random(task)
+    rand = rng.random
+    randrange = rng.randrange
     mp = args['mp']
     gen = individual.get_raw_genome()
     max_i = len(gen)
 
-    j = geometric_dist(mp) - 1  # Primer j (y nodo a intercambiar)
+    j = geometric_dist(mp, rand) - 1  # Primer j (y nodo a intercambiar)
     while j < max_i:
         # Elegimos al azar el nodo k
         k = randrange(max_i)
 
         # Intercambiamos j y k
         gen[j], gen[k] = gen[k], gen[j]
+        moves.append(('swap', j, k))
 
-        j += geometric_dist(mp)
-
-        changed = True
+        j += geometric_dist(mp, rand)
 
-    if changed:
-        individual.set_fitness(None)
+    if moves:
+        individual.set_genome_from_raw(gen)
+        individual.record_moves(moves)
 
 
 def mutate_flip(task, individual, args):
@@ -60,10 +65,14 @@ def mutate_flip(task, individual, args):
     una posición del genoma de 0 a 1, o visceversa (sólo para genomas binarios).
     La elección del bit a cambiar se hace con probabilidad *mp*.
 
+    Con genomas empaquetados en enteros (*PackedBinaryInd*), los bits elegidos
+    se invierten de una sola vez con una máscara XOR.
+
     Establece en *None* el fitness del individuo mutado.
 
     Args:
-        task (Task): Una referencia a la tarea asociada al elemento (no usada).
+        task (Task): Una referencia a la tarea asociada al elemento (de ella
+            se toma el generador de números aleatorios).
         individual (Individual): Un individuo.
         args (dict): Un arreglo con los parámetros propios de este método. *mp*
         como un número entre 0.0 y 1.0, que representa la probabilidad de que un
@@ -73,22 +82,37 @@ def mutate_flip(task, individual, args):
 
     changed = False
 
+    rand = task_random(task).random
     mp = args['mp']
     gen = individual.get_raw_genome()
-    max_i = len(gen)
-
-    j = geometric_dist(mp) - 1  # Primer j (y nodo a alterar)
+    max_i = individual.get_size()
+
+    if isinstance(gen, int):  # Genoma empaquetado
+        mask = 0
+        top = max_i - 1
+        j = geometric_dist(mp, rand) - 1
+        while j < max_i:
+            mask |= 1 << (top - j)
+            j += geometric_dist(mp, rand)
+
+        if mask:
+            individual.set_genome_from_raw(gen ^ mask)
+            individual.set_fitness(None)
+        return
+
+    j = geometric_dist(mp, rand) - 1  # Primer j (y nodo a alterar)
     while j < max_i:
         if gen[j] == 48:
             gen[j] = 49
         else:
             gen[j] = 48
 
-        j += geometric_dist(mp)
+        j += geometric_dist(mp, rand)
 
         changed = True
 
     if changed:
+        individual.set_genome_from_raw(gen)
         individual.set_fitness(None)
 
 
@@ -96,10 +120,13 @@ def mutate_insert(task, individual, args):
     """ Muta el individuo proporcionado in situ. Divide el genoma en tres
     subarreglos A, B, C. El operador hace al genoma A, C, B.
 
-    Establece en *None* el fitness del individuo mutado.
+    Establece en *None* el fitness del individuo mutado, y registra el cambio
+    como el movimiento ('insert', a, b) para la evaluación incremental, donde
+    *a* y *b* son los inicios de B y C en el genoma original.
 
     Args:
-        task (Task): Una referencia a la tarea asociada al elemento (no usada).
+        task (Task): Una referencia a la tarea asociada al elemento (de ella
+            se toma el generador de números aleatorios).
         individual (Individual): Un individuo.
         args (dict): Un arreglo con los parámetros propios de este método
             (no usados).
@@ -110,6 +137,7 @@ def mutate_insert(task, individual, args):
 
     gen = individual.get_raw_genome()
 
+    randrange = task_random(task).randrange
     max_i = len(gen)
     a = randrange(max_i)
     b = randrange(max_i)
@@ -128,7 +156,7 @@ def mutate_insert(task, individual, args):
 
     if changed:
         individual.set_genome_from_raw(slice_a)
-        individual.set_fitness(None)
+        individual.record_moves((('insert', a, b),))
 
 
 def mutate_multiple(task, individual, args):
@@ -149,7 +177,7 @@ def mutate_multiple(task, individual, args):
 
     """
 
-    operator_index = randrange(len(args['operators']))
+    operator_index = task_random(task).randrange(len(args['operators']))
     args['operators'][operator_index](task, individual, args)
 
 
@@ -160,7 +188,8 @@ def mutate_normal(task, individual, args):
     Establece en *None* el fitness del individuo mutado.
 
     Args:
-        task (Task): Una referencia a la tarea asociada al elemento (no usada).
+        task (Task): Una referencia a la tarea asociada al elemento (de ella
+            se toma el generador de números aleatorios).
         individual (Individual): Un individuo.
         args (dict): Un arreglo con los parámetros propios de este método.
             *mp* como la probabilidad de que un gen sea mutado, *sd* como la
@@ -171,20 +200,22 @@ def mutate_normal(task, individual, args):
 
     changed = False
 
+    rand = task_random(task).random
     mp = args['mp']
     sd = args['sd']
     integer = args['integer']
     gen = individual.get_raw_genome()
     max_i = len(gen)
 
-    j = geometric_dist(mp) - 1  # Primer j (y nodo a intercambiar)
+    j = geometric_dist(mp, rand) - 1  # Primer j (y nodo a intercambiar)
     while j < max_i:
         mean = gen[j]
-        gen[j] = gauss_dist(mean, sd, integer)
+        gen[j] = gauss_dist(mean, sd, integer, rand)
 
-        j += geometric_dist(mp)
+        j += geometric_dist(mp, rand)
 
         changed = True
 
     if changed:
+        individual.set_genome_from_raw(gen)
         individual.set_fitness(None)
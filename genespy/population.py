@@ -0,0 +1,803 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+from .binaryind import BinaryInd, PackedBinaryInd
+
+
+def _take_buffer(buf, order, width):
+    """ Crea un nuevo búfer con los bloques de *buf* en el orden indicado.
+
+    Args:
+        buf (array|bytearray): El búfer original.
+        order (iterable): Los índices de los bloques, en el orden deseado.
+        width (int): El número de elementos de cada bloque.
+
+    Returns:
+        array|bytearray: Un búfer nuevo del mismo tipo.
+
+    """
+
+    raw = memoryview(buf).cast('B')
+    step = width * buf.itemsize if isinstance(buf, array) else width
+    joined = b''.join([raw[i * step:(i + 1) * step] for i in order])
+
+    if isinstance(buf, array):
+        new = array(buf.typecode)
+        new.frombytes(joined)
+        return new
+    else:
+        return bytearray(joined)
+
+
+class IndividualView:
+    """ Vista ligera de un individuo almacenado en un *PopulationStore*. Ofrece
+    la misma interfaz que *Individual*, pero lee y escribe directamente en los
+    búferes del almacén.
+
+    El genoma en bruto que regresa la vista es una copia. Para que un cambio
+    en él se refleje en el almacén, debe asignarse con *set_genome_from_raw*.
+
+    Las vistas son válidas mientras el almacén no se reordene o recorte.
+
+    Attributes:
+        _store (PopulationStore): El almacén que contiene al individuo.
+        _index (int): La posición del individuo en el almacén.
+
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        """ Constructor de la clase *IndividualView*.
+
+        Args:
+            store (PopulationStore): El almacén que contiene al individuo.
+            index (int): La posición del individuo en el almacén.
+
+        """
+
+        self._store = store
+        self._index = index
+
+    def __str__(self):
+        """ La representación en cadena del objeto.
+
+        Return:
+            str: La representación en cadena del individuo.
+
+        """
+
+        return str(self.copy())
+
+    def __repr__(self):
+        """ La representación en cadena del objeto.
+
+        Return:
+            str: La representación en cadena del individuo.
+
+        """
+
+        return repr(self.copy())
+
+    def copy(self):
+        """ Regresa una copia independiente del individuo, fuera del almacén.
+
+        Returns:
+            Individual: Una copia del individuo.
+
+        """
+
+        return self._store.detach(self._index)
+
+    def get_genome(self):
+        """ Regresa el genoma del individuo en forma amigable.
+
+        Returns:
+            list: Una secuencia con el genoma.
+
+        """
+
+        return self._store.decode(self._index)
+
+    def get_raw_genome(self):
+        """ Regresa una copia del genoma del individuo en forma bruta. Los
+        cambios a la copia no alteran al individuo: los mutadores deben
+        guardarla con *set_genome_from_raw*.
+
+        Returns:
+            list|bytearray: Una secuencia con el genoma.
+
+        """
+
+        return self._store.get_raw_genome(self._index)
+
+    def set_genome(self, genome):
+        """ Establece el genoma desde una versión amigable del mismo.
+
+        Args:
+            genome (list): Un arreglo con el genoma en forma amigable.
+
+        """
+
+        self._store.encode(self._index, genome)
+
+    def set_genome_from_raw(self, genome):
+        """ Establece el genoma desde una versión en bruto del mismo.
+
+        Args:
+            genome (list|bytearray): Un arreglo con el genoma en bruto.
+
+        """
+
+        self._store.set_raw_genome(self._index, genome)
+
+    def get_fitness(self, i=None):
+        """ Regresa el fitness del individuo.
+
+        Args:
+            i (int|None): El índice del objetivo deseado.
+
+        Returns:
+            list|float|None: El arreglo de fitness, o el valor elegido.
+
+        """
+
+        return self._store.get_fitness(self._index, i)
+
+    def set_fitness(self, fit):
+        """ Establece el fitness del individuo.
+
+        Args:
+            fit (list|None): Un arreglo con el fitness del individuo.
+
+        """
+
+        self._store.set_fitness(self._index, fit)
+
+    def record_moves(self, moves):
+        """ Deja al individuo sin fitness. Los individuos de un almacén no
+        conservan movimientos, por lo que se evalúan de forma completa.
+
+        Args:
+            moves (iterable): Los movimientos aplicados al genoma.
+
+        """
+
+        self._store.set_fitness(self._index, None)
+
+    def get_delta(self):
+        """ Los individuos de un almacén no admiten evaluación incremental.
+
+        Returns:
+            None: Siempre *None*.
+
+        """
+
+        return None
+
+    def get_order_key(self, spec):
+        """ Las vistas son transitorias y no memorizan su llave de orden.
+
+        Args:
+            spec (tuple): La especificación de orden de la tarea.
+
+        Returns:
+            None: Siempre *None*.
+
+        """
+
+        return None
+
+    def set_order_key(self, spec, key):
+        """ Las vistas son transitorias y no memorizan su llave de orden.
+
+        Args:
+            spec (tuple): La especificación de orden de la tarea.
+            key (tuple): La llave de orden.
+
+        """
+
+        pass
+
+    def get_data(self):
+        """ Regresa los datos arbitrarios asociados al individuo.
+
+        Returns:
+            object: Devuelve los datos arbitrarios asociados al individuo.
+
+        """
+
+        return self._store.get_data(self._index)
+
+    def set_data(self, data):
+        """ Establece los datos arbitrarios asociados al individuo.
+
+        Args:
+            data (object): Una objeto arbitrario que se asignará al individuo.
+
+        """
+
+        self._store.set_data(self._index, data)
+
+    def get_size(self):
+        """ Regresa la longitud del genoma.
+
+        Returns:
+            int: La longitud del genoma.
+
+        """
+
+        return self._store.get_genome_size()
+
+    def get_key(self):
+        """ Regresa una forma inmutable del genoma en bruto, útil como llave de
+        diccionarios o conjuntos.
+
+        Returns:
+            tuple|bytes: El genoma en bruto en forma inmutable.
+
+        """
+
+        return self._store.get_key(self._index)
+
+
+class PopulationStore:
+    """ Población compacta. Los genomas (de longitud fija) y el fitness de
+    todos los individuos se guardan en búferes contiguos, en lugar de un
+    objeto *Individual* por elemento.
+
+    Se comporta como la lista de individuos que usa *Task* (índices, cortes,
+    *append*, *extend*, *sort*, concatenación), por lo que puede asignarse
+    con *Task.set_population*. Los elementos se acceden como objetos
+    *IndividualView*.
+
+    Los genomas de números flotantes usan el tipo 'd', los de enteros
+    (permutaciones de índices) el tipo 'q', y los binarios de *BinaryInd* un
+    *bytearray*.
+
+    Attributes:
+        _prototype (Individual): Un individuo que sirve como plantilla para
+            las copias independientes (conserva, p.ej., la estructura binaria).
+        _typecode (str): El tipo de los elementos del genoma ('d', 'q' o 'B').
+        _width (int): La longitud de cada genoma.
+        _n_obj (int|None): La cantidad de valores fitness por individuo. Se
+            conoce al asignar el primer fitness.
+        _size (int): La cantidad de individuos.
+        _genomes (array|bytearray): Los genomas, uno tras otro.
+        _fitness (array): Los valores fitness, uno tras otro.
+        _evaluated (bytearray): Indica si cada individuo posee fitness.
+        _data (list): Los datos arbitrarios de cada individuo.
+
+    """
+
+    def __init__(self, prototype, typecode, width, n_obj=None):
+        """ Constructor de la clase *PopulationStore*. Crea un almacén vacío.
+
+        Args:
+            prototype (Individual): Un individuo plantilla.
+            typecode (str): El tipo de los elementos del genoma ('d', 'q' o
+                'B').
+            width (int): La longitud de cada genoma.
+            n_obj (int|None): La cantidad de valores fitness por individuo.
+
+        """
+
+        self._prototype = prototype
+        self._typecode = typecode
+        self._width = width
+        self._n_obj = n_obj
+        self._size = 0
+        self._genomes = self._new_genome_buffer()
+        self._fitness = array('d')
+        self._evaluated = bytearray()
+        self._data = []
+
+    @classmethod
+    def from_individuals(cls, pop, typecode=None):
+        """ Crea un almacén a partir de una lista de individuos. Si no se da
+        el tipo del genoma, se deduce revisando todos los genomas: 'q' si
+        todos sus genes son enteros, o 'd' si alguno es de punto flotante.
+
+        Args:
+            pop (list): Un arreglo de individuos con genomas de igual tamaño.
+            typecode (str|None): El tipo del genoma, como en *array* ('q' o
+                'd'). Se ignora con genomas binarios, que usan 'B'.
+
+        Returns:
+            PopulationStore: El almacén con los individuos.
+
+        """
+
+        first = pop[0]
+        raw = first.get_raw_genome()
+
+        if isinstance(first, PackedBinaryInd):
+            raise TypeError('packed binary genomes can not be stored in a ' +
+                            'PopulationStore')
+        elif isinstance(first, BinaryInd):
+            typecode = 'B'
+        elif typecode is None:
+            if all(isinstance(gene, int)
+                   for ind in pop for gene in ind.get_raw_genome()):
+                typecode = 'q'
+            elif all(isinstance(gene, (int, float))
+                     for ind in pop for gene in ind.get_raw_genome()):
+                typecode = 'd'
+            else:
+                raise TypeError('only float, integer or binary genomes can ' +
+                                'be stored in a PopulationStore')
+
+        store = cls(first.copy(), typecode, len(raw))
+        store.extend(pop)
+
+        return store
+
+    def _new_genome_buffer(self):
+        """ Crea un búfer de genomas vacío.
+
+        Returns:
+            array|bytearray: El búfer.
+
+        """
+
+        if self._typecode == 'B':
+            return bytearray()
+        else:
+            return array(self._typecode)
+
+    def _append_genome(self, genome):
+        """ Agrega un genoma en bruto al final del búfer de genomas.
+
+        Args:
+            genome (iterable): El genoma en bruto.
+
+        """
+
+        self._genomes.extend(self._as_buffer(genome))
+
+    def _extend_genomes(self, store):
+        """ Agrega al final del búfer de genomas los de otro almacén
+        compatible.
+
+        Args:
+            store (PopulationStore): El otro almacén.
+
+        """
+
+        self._genomes.extend(store._genomes)
+
+    def _take_genomes(self, indices):
+        """ Crea un búfer de genomas con los genomas indicados, en ese orden.
+
+        Args:
+            indices (list): Los índices de los genomas.
+
+        Returns:
+            array|bytearray: El nuevo búfer.
+
+        """
+
+        return _take_buffer(self._genomes, indices, self._width)
+
+    def _empty_like(self):
+        """ Crea un almacén vacío con los mismos parámetros.
+
+        Returns:
+            PopulationStore: El almacén vacío.
+
+        """
+
+        return self.__class__(self._prototype,
+                              self._typecode,
+                              self._width,
+                              self._n_obj)
+
+    def _fitness_width(self):
+        """ Regresa la cantidad de valores fitness por individuo (cero si aún
+        no se conoce).
+
+        Returns:
+            int: La cantidad de valores fitness.
+
+        """
+
+        return self._n_obj or 0
+
+    def __len__(self):
+        """ Regresa la cantidad de individuos.
+
+        Returns:
+            int: La cantidad de individuos.
+
+        """
+
+        return self._size
+
+    def __iter__(self):
+        """ Itera sobre las vistas de los individuos.
+
+        Returns:
+            iterator: Un iterador de objetos *IndividualView*.
+
+        """
+
+        return (IndividualView(self, i) for i in range(self._size))
+
+    def __getitem__(self, item):
+        """ Regresa la vista de un individuo, o un almacén nuevo (copia) si se
+        proporciona un corte.
+
+        Args:
+            item (int|slice): El índice o corte deseado.
+
+        Returns:
+            IndividualView|PopulationStore: La vista o el nuevo almacén.
+
+        """
+
+        if isinstance(item, slice):
+            return self.take(range(*item.indices(self._size)))
+
+        if item < 0:
+            item += self._size
+        if not 0 <= item < self._size:
+            raise IndexError('population index out of range')
+
+        return IndividualView(self, item)
+
+    def __setitem__(self, index, individual):
+        """ Copia los datos de un individuo en la posición indicada.
+
+        Args:
+            index (int): La posición del individuo.
+            individual (Individual): El individuo a copiar.
+
+        """
+
+        if index < 0:
+            index += self._size
+
+        self.set_raw_genome(index, individual.get_raw_genome())
+        self.set_fitness(index, individual.get_fitness())
+        self._data[index] = individual.get_data()
+
+    def __add__(self, other):
+        """ Concatena dos poblaciones en un almacén nuevo.
+
+        Args:
+            other (list|PopulationStore): La población a concatenar.
+
+        Returns:
+            PopulationStore: Un almacén nuevo con ambas poblaciones.
+
+        """
+
+        new = self[:]
+        new.extend(other)
+
+        return new
+
+    def __radd__(self, other):
+        """ Concatena una población (al inicio) con este almacén.
+
+        Args:
+            other (list): La población a concatenar.
+
+        Returns:
+            PopulationStore: Un almacén nuevo con ambas poblaciones.
+
+        """
+
+        new = self._empty_like()
+        new.extend(other)
+        new.extend(self)
+
+        return new
+
+    def append(self, individual):
+        """ Agrega una copia de un individuo al final del almacén.
+
+        Args:
+            individual (Individual): El individuo a agregar.
+
+        """
+
+        self._append_genome(individual.get_raw_genome())
+        self._fitness.extend(0.0 for _ in range(self._fitness_width()))
+        self._evaluated.append(0)
+        self._data.append(individual.get_data())
+        self._size += 1
+
+        self.set_fitness(self._size - 1, individual.get_fitness())
+
+    def extend(self, pop):
+        """ Agrega copias de los individuos de *pop* al final del almacén.
+
+        Args:
+            pop (iterable): Una lista de individuos o un almacén.
+
+        """
+
+        if type(pop) is type(self) and \
+                pop._typecode == self._typecode and \
+                pop._width == self._width and \
+                (pop._n_obj == self._n_obj or
+                 not pop._size or
+                 (self._n_obj is None and not self._size)):
+            if self._n_obj is None:
+                self._n_obj = pop._n_obj
+            self._extend_genomes(pop)
+            self._fitness.extend(pop._fitness)
+            self._evaluated.extend(pop._evaluated)
+            self._data.extend(pop._data)
+            self._size += pop._size
+        else:
+            for individual in pop:
+                self.append(individual)
+
+    def take(self, indices):
+        """ Crea un almacén nuevo con los individuos indicados, en ese orden.
+
+        Args:
+            indices (iterable): Los índices de los individuos.
+
+        Returns:
+            PopulationStore: El nuevo almacén.
+
+        """
+
+        indices = list(indices)
+        new = self._empty_like()
+        new._genomes = self._take_genomes(indices)
+        new._fitness = _take_buffer(self._fitness,
+                                    indices,
+                                    self._fitness_width())
+        new._evaluated = bytearray(self._evaluated[i] for i in indices)
+        new._data = [self._data[i] for i in indices]
+        new._size = len(indices)
+
+        return new
+
+    def sort(self, key=None, reverse=False):
+        """ Ordena el almacén in-situ. La función *key* recibe las vistas de
+        los individuos, como en *list.sort*.
+
+        Args:
+            key (function|None): La función que genera la llave de orden.
+            reverse (bool): Indica si el orden es descendente.
+
+        """
+
+        if key is None:
+            raise TypeError('a key function is required to sort individuals')
+
+        keys = [key(view) for view in self]
+        order = sorted(range(self._size),
+                       key=keys.__getitem__,
+                       reverse=reverse)
+        sorted_store = self.take(order)
+
+        self._genomes = sorted_store._genomes
+        self._fitness = sorted_store._fitness
+        self._evaluated = sorted_store._evaluated
+        self._data = sorted_store._data
+
+    def to_individuals(self):
+        """ Regresa la población como una lista de individuos independientes.
+
+        Returns:
+            list: Un arreglo de individuos.
+
+        """
+
+        return [self.detach(i) for i in range(self._size)]
+
+    def _as_buffer(self, genome):
+        """ Convierte un genoma en bruto al tipo del búfer de genomas.
+
+        Args:
+            genome (iterable): El genoma en bruto.
+
+        Returns:
+            array|bytearray: El genoma en el tipo del búfer.
+
+        """
+
+        if len(genome) != self._width:
+            raise ValueError('all genomes in a PopulationStore must have ' +
+                             'the same size')
+
+        if self._typecode == 'B':
+            return genome
+        else:
+            return array(self._typecode, genome)
+
+    def get_genome_size(self):
+        """ Regresa la longitud de cada genoma.
+
+        Returns:
+            int: La longitud de cada genoma.
+
+        """
+
+        return self._width
+
+    def get_raw_genome(self, index):
+        """ Regresa una copia del genoma en bruto del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            list|bytearray: El genoma en bruto.
+
+        """
+
+        width = self._width
+        raw = self._genomes[index * width:(index + 1) * width]
+
+        if self._typecode == 'B':
+            return raw
+        else:
+            return raw.tolist()
+
+    def set_raw_genome(self, index, genome):
+        """ Establece el genoma en bruto del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+            genome (iterable): El genoma en bruto.
+
+        """
+
+        width = self._width
+        self._genomes[index * width:(index + 1) * width] = \
+            self._as_buffer(genome)
+
+    def detach(self, index):
+        """ Crea un individuo independiente con los datos del indicado.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            Individual: El individuo independiente.
+
+        """
+
+        ind = self._prototype.copy()
+        ind.set_genome_from_raw(self.get_raw_genome(index))
+        ind.set_fitness(self.get_fitness(index))
+        ind.set_data(self._data[index])
+
+        return ind
+
+    def decode(self, index):
+        """ Regresa el genoma en forma amigable del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            list: El genoma en forma amigable.
+
+        """
+
+        if self._typecode == 'B':
+            scratch = self._prototype
+            scratch.set_genome_from_raw(self.get_raw_genome(index))
+            return scratch.get_genome()
+        else:
+            return self.get_raw_genome(index)
+
+    def encode(self, index, genome):
+        """ Establece el genoma en forma amigable del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+            genome (list): El genoma en forma amigable.
+
+        """
+
+        scratch = self._prototype
+        scratch.set_genome(genome)
+        self.set_raw_genome(index, scratch.get_raw_genome())
+
+    def get_fitness(self, index, i=None):
+        """ Regresa el fitness del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+            i (int|None): El índice del objetivo deseado.
+
+        Returns:
+            list|float|None: El arreglo de fitness, o el valor elegido.
+
+        """
+
+        if not self._evaluated[index]:
+            return None
+
+        n_obj = self._n_obj
+        if i is None:
+            return self._fitness[index * n_obj:(index + 1) * n_obj].tolist()
+        else:
+            return self._fitness[index * n_obj + i]
+
+    def set_fitness(self, index, fit):
+        """ Establece el fitness del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+            fit (list|None): El arreglo de fitness.
+
+        """
+
+        if fit is None:
+            self._evaluated[index] = 0
+            return
+
+        if self._n_obj is None:  # Se reserva el espacio del fitness
+            self._n_obj = len(fit)
+            self._fitness = array('d', [0.0]) * (self._size * self._n_obj)
+
+        n_obj = self._n_obj
+        self._fitness[index * n_obj:(index + 1) * n_obj] = array('d', fit)
+        self._evaluated[index] = 1
+
+    def get_data(self, index):
+        """ Regresa los datos arbitrarios del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            object: Los datos arbitrarios.
+
+        """
+
+        return self._data[index]
+
+    def set_data(self, index, data):
+        """ Establece los datos arbitrarios del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+            data (object): Los datos arbitrarios.
+
+        """
+
+        self._data[index] = data
+
+    def get_key(self, index):
+        """ Regresa una forma inmutable del genoma en bruto del individuo
+        indicado.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            tuple|bytes: El genoma en forma inmutable.
+
+        """
+
+        width = self._width
+        raw = self._genomes[index * width:(index + 1) * width]
+
+        if self._typecode == 'B':
+            return bytes(raw)
+        else:
+            return tuple(raw)
@@ -13,8 +13,10 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
 
+from bisect import bisect_right
+from itertools import accumulate
 from math import floor
-from random import random, sample
+from .utils import task_random
 
 
 def select_vasconcelos(task, args):
@@ -36,11 +38,12 @@ def select_vasconcelos(task, args):
     mayor = task.get_size() - 1
     max_minor = floor(mayor / 2.0) + 1
     population = task.get_population()
+    rand = task_random(task).random
 
     # Hacemos la selección (mejor contra peor)
     for minor in range(max_minor):
         # Si el dado favorece, se hace la cruza
-        p = random()
+        p = rand()
         if p < cp:
             childs = task.apply_crossover(population[minor],
                                           population[mayor])
@@ -73,6 +76,7 @@ def select_tournament(task, args):
     population = task.get_population()
     p_type = task.get_obj_factors(obj_index)
     matchs = args['matchs']
+    sample = task_random(task).sample
     childs = {}
 
     for pair in range(matchs):
@@ -106,3 +110,381 @@ def select_tournament(task, args):
     # Se integra toda la descendencia en la población (sustituyen a padres)
     for index, new_born in childs.items():
         population[index] = new_born
+
+
+def _rank_order(task, population, objectives):
+    """ Regresa los índices de la población, del mejor al peor, según los
+    objetivos dados (en ese orden de prioridad, con el signo de cada factor,
+    como en *Task.order_population*). Los individuos sin fitness van al
+    final.
+
+    Args:
+        task (Task): La tarea.
+        population (list|PopulationStore): La población.
+        objectives (tuple): Los índices de los objetivos.
+
+    Returns:
+        list: Los índices ordenados.
+
+    """
+
+    inf = float('inf')
+    flip = [task.get_obj_factors(i) > 0.0 for i in objectives]
+    keys = []
+    for ind in population:
+        fit = ind.get_fitness()
+        if fit is None:
+            keys.append((inf,) * len(objectives))
+        else:
+            keys.append(tuple(-fit[i] if f else fit[i]
+                              for i, f in zip(objectives, flip)))
+
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def _check_mode(args):
+    """ Regresa el modo de integración de la descendencia ('append' o
+    'replace') de los argumentos de un selector.
+
+    Args:
+        args (dict): Los argumentos del selector.
+
+    Returns:
+        str: El modo.
+
+    """
+
+    mode = args.get('mode', 'append')
+    if mode not in ('append', 'replace'):
+        raise ValueError('unknown selection mode: ' + str(mode))
+
+    return mode
+
+
+def _breed_parents(task, population, parents, cp, mode, rand, order=None):
+    """ Cruza los padres elegidos por parejas consecutivas (o los copia, si
+    no se cruzan) e integra la descendencia en la población: al final (modo
+    'append'), o en lugar de los peores individuos, del último hacia atrás
+    (modo 'replace'), según *order* o, si no se da, según la posición.
+
+    Args:
+        task (Task): La tarea.
+        population (list|PopulationStore): La población.
+        parents (list): Los índices de los padres, en parejas consecutivas.
+        cp (float): La probabilidad de cruza.
+        mode (str): 'append' o 'replace'.
+        rand (function): La función que genera números uniformes en [0, 1).
+        order (list|None): Los índices de la población, del mejor al peor
+            (ver *_rank_order*), si no es el de la población.
+
+    """
+
+    childs = []
+    for j in range(0, len(parents) - 1, 2):
+        parent_a = population[parents[j]]
+        parent_b = population[parents[j + 1]]
+        if cp >= 1.0 or rand() < cp:
+            childs.extend(task.apply_crossover(parent_a, parent_b))
+        else:
+            childs.append(parent_a.copy())
+            childs.append(parent_b.copy())
+
+    if mode == 'append':
+        task.append_population(childs)
+    else:
+        if order is None:
+            order = range(len(population))
+        for j, child in enumerate(childs[:len(population)]):
+            population[order[-1 - j]] = child
+
+
+def select_tournament_rank(task, args):
+    """ Realiza cruzas con selección por torneo sobre los rangos de la
+    población ordenada: el ganador de un torneo de *k* individuos es el de
+    menor índice, por lo que no se consulta el fitness. El rango del ganador
+    se obtiene directamente con un solo número aleatorio, como el mínimo de
+    *k* rangos uniformes (torneo con reemplazo), y todos los torneos se
+    generan de una sola vez.
+
+    Los descendientes se anexan al final de la población (modo 'append'), o
+    sustituyen a los peores individuos, del último hacia atrás (modo
+    'replace'); en ningún caso se pierden descendientes por padres que ganan
+    más de un torneo.
+
+    Se asume que hay definida una función de cruza que regresa dos
+    descendientes, y que la población está ordenada (como en los algoritmos
+    de *genespy.algorithms*).
+
+    Args:
+        task (Task): Una referencia la tarea invoulcrada.
+        args (dict): Un arreglo con los argumentos propios de la función. *k*
+            (2 por omisión) indica el número de individuos en el torneo.
+            *matchs* (la mitad de la población por omisión) indica cuantas
+            cruzas se llevarán a cabo. *mode* es 'append' (por omisión) o
+            'replace'. *cp* (1.0 por omisión) es la probabilidad de cruza; si
+            no se cruzan, los padres se copian. *objectives* (opcional) es un
+            arreglo de índices de objetivos con los que se jerarquiza la
+            población, en lugar de su orden actual.
+
+    """
+
+    population = task.get_population()
+    n = len(population)
+    k = args.get('k', 2)
+    matchs = args.get('matchs', n // 2)
+    mode = _check_mode(args)
+    cp = args.get('cp', 1.0)
+
+    rand = task_random(task).random
+
+    # Rango del ganador de cada torneo: mínimo de k rangos uniformes, por
+    # transformada inversa de su distribución
+    inv_k = 1.0 / k
+    last = n - 1
+    winners = []
+    for _ in range(2 * matchs):
+        rank = int(n * (1.0 - (1.0 - rand()) ** inv_k))
+        winners.append(rank if rank < n else last)
+
+    order = None
+    if 'objectives' in args:
+        order = _rank_order(task, population, tuple(args['objectives']))
+        winners = [order[rank] for rank in winners]
+
+    _breed_parents(task, population, winners, cp, mode, rand, order)
+
+
+def _sample_cumulative(cumulative, m, rand):
+    """ Elige *m* índices al azar, con probabilidad proporcional a su peso,
+    mediante búsqueda binaria sobre los pesos acumulados.
+
+    Args:
+        cumulative (list): Los pesos acumulados (el último es el total).
+        m (int): La cantidad de índices.
+        rand (function): La función que genera números uniformes en [0, 1).
+
+    Returns:
+        list: Los índices elegidos.
+
+    """
+
+    total = cumulative[-1]
+    last = len(cumulative) - 1
+    chosen = []
+    for _ in range(m):
+        i = bisect_right(cumulative, rand() * total)
+        chosen.append(i if i < last else last)
+
+    return chosen
+
+
+def _sample_universal(cumulative, m, rand, shuffle):
+    """ Elige *m* índices por muestreo estocástico universal: *m* punteros
+    equiespaciados, con un solo desplazamiento aleatorio, recorren una vez
+    los pesos acumulados. Los índices se barajan para formar parejas al azar.
+
+    Args:
+        cumulative (list): Los pesos acumulados (el último es el total).
+        m (int): La cantidad de índices.
+        rand (function): La función que genera números uniformes en [0, 1).
+        shuffle (function): La función que baraja una lista in situ.
+
+    Returns:
+        list: Los índices elegidos.
+
+    """
+
+    if not m:
+        return []
+
+    step = cumulative[-1] / m
+    pointer = rand() * step
+    last = len(cumulative) - 1
+    chosen = []
+    i = 0
+    for _ in range(m):
+        while i < last and cumulative[i] <= pointer:
+            i += 1
+        chosen.append(i)
+        pointer += step
+
+    shuffle(chosen)
+
+    return chosen
+
+
+def _fitness_weights(task, population, obj_index):
+    """ Calcula los pesos de selección proporcional al fitness de un
+    objetivo. Los valores se orientan según el factor del objetivo (se
+    invierte el signo si se minimiza) y se desplazan para que el peor tenga
+    peso cero. Los individuos sin fitness reciben peso cero; si todos los
+    pesos son cero, se reparten por igual entre los individuos con fitness.
+
+    Args:
+        task (Task): La tarea.
+        population (list|PopulationStore): La población.
+        obj_index (int): El índice del objetivo.
+
+    Returns:
+        list: Los pesos acumulados.
+
+    """
+
+    sign = 1.0 if task.get_obj_factors(obj_index) > 0.0 else -1.0
+    values = []
+    for ind in population:
+        fit = ind.get_fitness()
+        values.append(None if fit is None else sign * fit[obj_index])
+
+    known = [v for v in values if v is not None]
+    if not known:
+        return list(range(1, len(values) + 1))
+
+    worst = min(known)
+    weights = [0.0 if v is None else v - worst for v in values]
+    if not any(weights):
+        weights = [0.0 if v is None else 1.0 for v in values]
+
+    return list(accumulate(weights))
+
+
+def select_roulette(task, args):
+    """ Realiza cruzas con selección proporcional al fitness (ruleta). La
+    tabla de pesos acumulados se construye una vez por llamada, y cada padre
+    se elige con búsqueda binaria, en tiempo O(log n).
+
+    Los pesos se calculan con el signo del factor del objetivo (ver
+    *Task.get_obj_factors*), restando el peor valor, de modo que sirven igual
+    para minimizar que para maximizar; el peor individuo no es elegido.
+
+    Args:
+        task (Task): Una referencia la tarea invoulcrada.
+        args (dict): Un arreglo con los argumentos propios de la función.
+            *matchs* (la mitad de la población por omisión) indica cuantas
+            cruzas se llevarán a cabo. *mode* es 'append' (por omisión) o
+            'replace' (ver *select_tournament_rank*). *cp* (1.0 por omisión)
+            es la probabilidad de cruza. *obj_index* (0 por omisión) es el
+            objetivo que determina los pesos.
+
+    """
+
+    population = task.get_population()
+    mode = _check_mode(args)
+    rand = task_random(task).random
+
+    cumulative = _fitness_weights(task, population, args.get('obj_index', 0))
+    parents = _sample_cumulative(cumulative,
+                                 2 * args.get('matchs', len(population) // 2),
+                                 rand)
+
+    _breed_parents(task, population, parents, args.get('cp', 1.0), mode, rand)
+
+
+def select_sus(task, args):
+    """ Realiza cruzas con muestreo estocástico universal: como la ruleta,
+    pero todos los padres se eligen con un solo número aleatorio y punteros
+    equiespaciados, en una sola pasada por la tabla de pesos acumulados. La
+    cantidad de copias de cada individuo queda muy cerca de la esperada, por
+    lo que la presión de selección es más estable que con la ruleta.
+
+    Args:
+        task (Task): Una referencia la tarea invoulcrada.
+        args (dict): Un arreglo con los argumentos propios de la función. Los
+            mismos que *select_roulette*.
+
+    """
+
+    population = task.get_population()
+    mode = _check_mode(args)
+    rng = task_random(task)
+
+    cumulative = _fitness_weights(task, population, args.get('obj_index', 0))
+    parents = _sample_universal(cumulative,
+                                2 * args.get('matchs', len(population) // 2),
+                                rng.random,
+                                rng.shuffle)
+
+    _breed_parents(task, population, parents, args.get('cp', 1.0), mode,
+                   rng.random)
+
+
+def _select_by_rank(task, args, weights):
+    """ Elige padres con probabilidad proporcional a un peso que depende sólo
+    del rango (0 para el mejor), los cruza e integra la descendencia.
+
+    Args:
+        task (Task): La tarea, con su población ordenada.
+        args (dict): Los argumentos del selector.
+        weights (list): El peso de cada rango.
+
+    """
+
+    population = task.get_population()
+    mode = _check_mode(args)
+    rand = task_random(task).random
+
+    parents = _sample_cumulative(list(accumulate(weights)),
+                                 2 * args.get('matchs', len(population) // 2),
+                                 rand)
+
+    order = None
+    if 'objectives' in args:
+        order = _rank_order(task, population, tuple(args['objectives']))
+        parents = [order[rank] for rank in parents]
+
+    _breed_parents(task, population, parents, args.get('cp', 1.0), mode, rand,
+                   order)
+
+
+def select_rank_linear(task, args):
+    """ Realiza cruzas con selección por rango lineal sobre la población
+    ordenada: el mejor individuo tiene peso *pressure*, el peor 2 -
+    *pressure*, y el resto se interpola linealmente. No depende de la escala
+    del fitness, sólo del orden, por lo que sirve para minimizar y maximizar.
+
+    Args:
+        task (Task): Una referencia la tarea invoulcrada.
+        args (dict): Un arreglo con los argumentos propios de la función.
+            *pressure* (1.5 por omisión), entre 1.0 (sin presión) y 2.0, es
+            la presión de selección. *matchs*, *mode* y *cp* como en
+            *select_roulette*. *objectives* como en *select_tournament_rank*.
+
+    """
+
+    n = task.get_size()
+    pressure = args.get('pressure', 1.5)
+
+    if not 1.0 <= pressure <= 2.0:
+        raise ValueError('pressure must be between 1.0 and 2.0')
+
+    slope = 2.0 * (pressure - 1.0) / (n - 1) if n > 1 else 0.0
+    _select_by_rank(task, args, [pressure - slope * i for i in range(n)])
+
+
+def select_rank_exponential(task, args):
+    """ Realiza cruzas con selección por rango exponencial sobre la
+    población ordenada: el individuo de rango *i* (0 para el mejor) tiene
+    peso *c* ** *i*. Un *c* cercano a 1.0 reduce la presión de selección.
+
+    Args:
+        task (Task): Una referencia la tarea invoulcrada.
+        args (dict): Un arreglo con los argumentos propios de la función.
+            *c* (0.99 por omisión), entre 0.0 y 1.0, es la base. *matchs*,
+            *mode* y *cp* como en *select_roulette*. *objectives* como en
+            *select_tournament_rank*.
+
+    """
+
+    n = task.get_size()
+    c = args.get('c', 0.99)
+
+    if not 0.0 < c <= 1.0:
+        raise ValueError('c must be in (0.0, 1.0]')
+
+    weights = []
+    w = 1.0
+    for _ in range(n):
+        weights.append(w)
+        w *= c
+
+    _select_by_rank(task, args, weights)
@@ -0,0 +1,306 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+from json import dumps
+from math import sqrt
+from time import perf_counter, process_time
+
+
+def fitness_stats(population):
+    """ Calcula, en una sola pasada sobre la población, el mínimo, máximo,
+    media y desviación estándar de cada objetivo. Los individuos sin fitness
+    se omiten. La media y la varianza se actualizan con el método de Welford,
+    que no pierde precisión con valores grandes y cercanos entre sí.
+
+    Args:
+        population (list|PopulationStore): La población.
+
+    Returns:
+        list: Un diccionario por objetivo, con las llaves 'min', 'max',
+            'mean' y 'std'.
+
+    """
+
+    n = 0
+    minimum = maximum = mean = squares = None
+
+    for ind in population:
+        fit = ind.get_fitness()
+        if fit is None:
+            continue
+
+        n += 1
+        if n == 1:
+            minimum = list(fit)
+            maximum = list(fit)
+            mean = list(fit)
+            squares = [0.0] * len(fit)
+            continue
+
+        for i, value in enumerate(fit):
+            if value < minimum[i]:
+                minimum[i] = value
+            elif value > maximum[i]:
+                maximum[i] = value
+            diff = value - mean[i]
+            mean[i] += diff / n
+            squares[i] += diff * (value - mean[i])
+
+    summary = []
+    for i in range(len(mean) if n else 0):
+        variance = squares[i] / n
+        summary.append({'min': minimum[i],
+                        'max': maximum[i],
+                        'mean': mean[i],
+                        'std': sqrt(variance) if variance > 0.0 else 0.0})
+
+    return summary
+
+
+class RunStats:
+    """ Instrumentación de una corrida: tiempo de reloj y de CPU de cada fase
+    del ciclo generacional, contadores (evaluaciones, llamadas a funciones
+    objetivo y de restricción, aciertos de la memoria de valores fitness,
+    etc.), tamaño de la población antes y después de eliminar repetidos, y
+    estadísticas del fitness.
+
+    Se pasa a los algoritmos con el argumento *stats*. Al final de cada
+    generación se arma un registro (un diccionario) que se entrega a cada
+    receptor (*sink*): cualquier función que reciba el registro, como
+    *print* o un *JsonLinesSink*. Los totales de la corrida se consultan
+    con *get_totals*.
+
+    Sin *stats*, los algoritmos no hacen ninguna medición.
+
+    Attributes:
+        _sinks (list): Los receptores de los registros por generación.
+        _phases (dict): Tiempo de reloj y de CPU por fase, de la generación
+            actual.
+        _counters (dict): Los contadores de la generación actual.
+        _values (dict): Otros valores de la generación actual.
+        _total_phases (dict): Tiempo de reloj y de CPU por fase, de toda la
+            corrida.
+        _total_counters (dict): Los contadores de toda la corrida.
+        _generations (int): Cantidad de generaciones registradas.
+        _fitness (bool): Indica si se calculan estadísticas del fitness.
+        _phase (str|None): La fase en curso.
+        _wall (float): Inicio de la fase en curso (tiempo de reloj).
+        _cpu (float): Inicio de la fase en curso (tiempo de CPU).
+
+    """
+
+    def __init__(self, sinks=None, fitness=True):
+        """ Constructor de la clase *RunStats*.
+
+        Args:
+            sinks (list|None): Los receptores de los registros por
+                generación.
+            fitness (bool): Indica si se calculan estadísticas del fitness en
+                cada generación.
+
+        """
+
+        self._sinks = list(sinks) if sinks is not None else []
+        self._phases = {}
+        self._counters = {}
+        self._values = {}
+        self._total_phases = {}
+        self._total_counters = {}
+        self._generations = 0
+        self._fitness = fitness
+        self._phase = None
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    def add_sink(self, sink):
+        """ Agrega un receptor de los registros por generación.
+
+        Args:
+            sink (function): Una función que recibe un registro.
+
+        """
+
+        self._sinks.append(sink)
+
+    def phase(self, name):
+        """ Mide una fase con una sentencia *with*:
+
+        with stats.phase('evaluate'):
+            task.evaluate()
+
+        Las fases no se anidan.
+
+        Args:
+            name (str): El nombre de la fase.
+
+        Returns:
+            RunStats: El mismo objeto, como administrador de contexto.
+
+        """
+
+        self._phase = name
+
+        return self
+
+    def __enter__(self):
+        """ Inicia la medición de la fase en curso.
+
+        Returns:
+            RunStats: El mismo objeto.
+
+        """
+
+        self._wall = perf_counter()
+        self._cpu = process_time()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Termina la medición de la fase en curso, y la acumula.
+
+        """
+
+        wall = perf_counter() - self._wall
+        cpu = process_time() - self._cpu
+
+        times = self._phases.get(self._phase)
+        if times is None:
+            self._phases[self._phase] = [wall, cpu]
+        else:
+            times[0] += wall
+            times[1] += cpu
+
+        self._phase = None
+
+    def count(self, name, n=1):
+        """ Incrementa un contador.
+
+        Args:
+            name (str): El nombre del contador.
+            n (int): El incremento.
+
+        """
+
+        self._counters[name] = self._counters.get(name, 0) + n
+
+    def set_value(self, name, value):
+        """ Registra un valor de la generación actual.
+
+        Args:
+            name (str): El nombre del valor.
+            value (object): El valor.
+
+        """
+
+        self._values[name] = value
+
+    def end_generation(self, task, generation):
+        """ Cierra el registro de la generación: calcula las estadísticas del
+        fitness, lo entrega a los receptores y acumula los totales.
+
+        Args:
+            task (Task): La tarea.
+            generation (int): La generación.
+
+        Returns:
+            dict: El registro de la generación.
+
+        """
+
+        record = {
+            'generation': generation,
+            'size': task.get_size(),
+            'phases': {name: {'wall': times[0], 'cpu': times[1]}
+                       for name, times in self._phases.items()},
+            'counters': dict(self._counters)
+        }
+        record.update(self._values)
+
+        if self._fitness:
+            record['fitness'] = fitness_stats(task.get_population())
+
+        for sink in self._sinks:
+            sink(record)
+
+        for name, times in self._phases.items():
+            total = self._total_phases.get(name)
+            if total is None:
+                self._total_phases[name] = list(times)
+            else:
+                total[0] += times[0]
+                total[1] += times[1]
+
+        for name, n in self._counters.items():
+            self._total_counters[name] = self._total_counters.get(name, 0) + n
+
+        self._phases = {}
+        self._counters = {}
+        self._values = {}
+        self._generations += 1
+
+        return record
+
+    def get_totals(self):
+        """ Regresa los totales de la corrida.
+
+        Returns:
+            dict: Las generaciones registradas, y el tiempo por fase y los
+                contadores acumulados.
+
+        """
+
+        return {
+            'generations': self._generations,
+            'phases': {name: {'wall': times[0], 'cpu': times[1]}
+                       for name, times in self._total_phases.items()},
+            'counters': dict(self._total_counters)
+        }
+
+
+class JsonLinesSink:
+    """ Receptor de registros que escribe cada uno como una línea JSON.
+
+    Attributes:
+        _file (file): El archivo de salida.
+
+    """
+
+    def __init__(self, path):
+        """ Constructor de la clase *JsonLinesSink*.
+
+        Args:
+            path (str): La ruta del archivo. Si existe, se agregan líneas.
+
+        """
+
+        self._file = open(path, 'a')
+
+    def __call__(self, record):
+        """ Escribe un registro.
+
+        Args:
+            record (dict): El registro.
+
+        """
+
+        self._file.write(dumps(record) + '\n')
+        self._file.flush()
+
+    def close(self):
+        """ Cierra el archivo.
+
+        """
+
+        self._file.close()
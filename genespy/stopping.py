@@ -0,0 +1,567 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+from time import time
+from .stats import fitness_stats
+
+
+def _best_value(task, objective):
+    """ Regresa el mejor valor de un objetivo en la población, que debe estar
+    ordenada. Para el primer objetivo es el del primer individuo; para el
+    resto se recorre la población.
+
+    Args:
+        task (Task): La tarea.
+        objective (int): El índice del objetivo.
+
+    Returns:
+        float: El mejor valor.
+
+    """
+
+    if objective == 0:
+        return task.get_individual(0).get_fitness(0)
+
+    values = [ind.get_fitness(objective) for ind in task.get_population()]
+    if task.get_obj_factors(objective) > 0.0:
+        return max(values)
+
+    return min(values)
+
+
+def _improves(task, objective, new, old, tolerance=0.0):
+    """ Indica si un valor de un objetivo mejora a otro por más de
+    *tolerance*, según el objetivo se maximice o minimice.
+
+    Args:
+        task (Task): La tarea.
+        objective (int): El índice del objetivo.
+        new (float): El valor nuevo.
+        old (float): El valor anterior.
+        tolerance (float): La mejora mínima.
+
+    Returns:
+        bool: Verdadero si *new* es mejor.
+
+    """
+
+    if task.get_obj_factors(objective) > 0.0:
+        return new > old + tolerance
+
+    return new < old - tolerance
+
+
+class StopCriterion:
+    """ Clase base de los criterios de paro. Los algoritmos llaman a *start*
+    al iniciar la corrida, a *check* al terminar cada generación, y a
+    *interrupt* durante la evaluación, entre bloques de genomas (ver
+    *Task.evaluate*), sólo si algún criterio lo redefine (ver
+    *can_interrupt*). Un criterio se cumple cuando *check* o *interrupt*
+    regresan verdadero.
+
+    """
+
+    def start(self, task):
+        """ Prepara el criterio al iniciar la corrida.
+
+        Args:
+            task (Task): La tarea.
+
+        """
+
+        pass
+
+    def check(self, task):
+        """ Indica, al terminar una generación, si la corrida debe detenerse.
+
+        Args:
+            task (Task): La tarea, con su población ordenada.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        return False
+
+    def interrupt(self, task):
+        """ Indica, durante la evaluación, si la generación en curso debe
+        detenerse.
+
+        Args:
+            task (Task): La tarea.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        return False
+
+    def can_interrupt(self):
+        """ Indica si el criterio se verifica durante la evaluación, es
+        decir, si redefine *interrupt*. Si ninguno lo hace, los algoritmos
+        evalúan cada generación completa, en una sola llamada al evaluador.
+
+        Returns:
+            bool: Verdadero si el criterio redefine *interrupt*.
+
+        """
+
+        return type(self).interrupt is not StopCriterion.interrupt
+
+    def describe(self):
+        """ Regresa una descripción del criterio, para reportar cuál se
+        cumplió.
+
+        Returns:
+            str: La descripción.
+
+        """
+
+        return self.__class__.__name__
+
+
+class StopCriteria(StopCriterion):
+    """ Combina varios criterios de paro: se cumple en cuanto se cumple
+    cualquiera, y recuerda cuál fue.
+
+    Attributes:
+        _criteria (tuple): Los criterios.
+        _fired (StopCriterion|None): El criterio que se cumplió.
+
+    """
+
+    def __init__(self, criteria):
+        """ Constructor de la clase *StopCriteria*.
+
+        Args:
+            criteria (list): Los criterios de paro.
+
+        """
+
+        self._criteria = tuple(criteria)
+        self._fired = None
+
+    def start(self, task):
+        """ Prepara todos los criterios al iniciar la corrida.
+
+        Args:
+            task (Task): La tarea.
+
+        """
+
+        self._fired = None
+        for criterion in self._criteria:
+            criterion.start(task)
+
+    def check(self, task):
+        """ Indica si se cumplió algún criterio, al terminar una generación,
+        o durante ella.
+
+        Args:
+            task (Task): La tarea, con su población ordenada.
+
+        Returns:
+            bool: Verdadero si se cumplió algún criterio.
+
+        """
+
+        if self._fired is not None:
+            return True
+
+        for criterion in self._criteria:
+            if criterion.check(task):
+                self._fired = criterion
+                return True
+
+        return False
+
+    def interrupt(self, task):
+        """ Indica, durante la evaluación, si se cumplió algún criterio.
+
+        Args:
+            task (Task): La tarea.
+
+        Returns:
+            bool: Verdadero si se cumplió algún criterio.
+
+        """
+
+        for criterion in self._criteria:
+            if criterion.interrupt(task):
+                self._fired = criterion
+                return True
+
+        return False
+
+    def can_interrupt(self):
+        """ Indica si alguno de los criterios se verifica durante la
+        evaluación.
+
+        Returns:
+            bool: Verdadero si algún criterio redefine *interrupt*.
+
+        """
+
+        return any(c.can_interrupt() for c in self._criteria)
+
+    def get_fired(self):
+        """ Regresa el criterio que se cumplió.
+
+        Returns:
+            StopCriterion|None: El criterio, o *None* si no se cumplió
+                ninguno.
+
+        """
+
+        return self._fired
+
+    def describe(self):
+        """ Regresa la descripción del criterio que se cumplió, o la de todos
+        si no se cumplió ninguno.
+
+        Returns:
+            str: La descripción.
+
+        """
+
+        if self._fired is not None:
+            return self._fired.describe()
+
+        return ' | '.join(c.describe() for c in self._criteria)
+
+
+class MaxEvaluations(StopCriterion):
+    """ Se cumple al alcanzar una cantidad de genomas evaluados en la
+    corrida (ver *Task.get_evaluations*). Se verifica también durante la
+    evaluación, por lo que el presupuesto se respeta dentro de una
+    generación, salvo por el último bloque enviado.
+
+    Attributes:
+        _max_evaluations (int): El presupuesto de evaluaciones.
+        _first (int): Las evaluaciones de la tarea al iniciar la corrida.
+
+    """
+
+    def __init__(self, max_evaluations):
+        """ Constructor de la clase *MaxEvaluations*.
+
+        Args:
+            max_evaluations (int): El presupuesto de evaluaciones.
+
+        """
+
+        self._max_evaluations = max_evaluations
+        self._first = 0
+
+    def start(self, task):
+        """ Prepara el criterio al iniciar la corrida.
+
+        Args:
+            task (Task): La tarea.
+
+        """
+
+        self._first = task.get_evaluations()
+
+    def check(self, task):
+        """ Indica, al terminar una generación, si se cumple el criterio.
+
+        Args:
+            task (Task): La tarea, con su población ordenada.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        return task.get_evaluations() - self._first >= self._max_evaluations
+
+    def interrupt(self, task):
+        """ Indica, durante la evaluación, si se cumple el criterio.
+
+        Args:
+            task (Task): La tarea.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        return self.check(task)
+
+    def describe(self):
+        """ Regresa una descripción del criterio.
+
+        Returns:
+            str: La descripción.
+
+        """
+
+        return 'max evaluations ({0})'.format(self._max_evaluations)
+
+
+class TargetFitness(StopCriterion):
+    """ Se cumple cuando el mejor individuo alcanza un valor objetivo: mayor
+    o igual si el objetivo se maximiza, menor o igual si se minimiza.
+
+    Attributes:
+        _target (float): El valor a alcanzar.
+        _objective (int): El índice del objetivo.
+
+    """
+
+    def __init__(self, target, objective=0):
+        """ Constructor de la clase *TargetFitness*.
+
+        Args:
+            target (float): El valor a alcanzar.
+            objective (int): El índice del objetivo.
+
+        """
+
+        self._target = target
+        self._objective = objective
+
+    def check(self, task):
+        """ Indica, al terminar una generación, si se cumple el criterio.
+
+        Args:
+            task (Task): La tarea, con su población ordenada.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        best = _best_value(task, self._objective)
+
+        if task.get_obj_factors(self._objective) > 0.0:
+            return best >= self._target
+
+        return best <= self._target
+
+    def describe(self):
+        """ Regresa una descripción del criterio.
+
+        Returns:
+            str: La descripción.
+
+        """
+
+        return 'target fitness ({0})'.format(self._target)
+
+
+class Stagnation(StopCriterion):
+    """ Se cumple cuando el mejor valor de un objetivo no mejora, por más de
+    *tolerance*, durante *generations* generaciones seguidas.
+
+    Attributes:
+        _generations (int): Generaciones sin mejora permitidas.
+        _tolerance (float): La mejora mínima.
+        _objective (int): El índice del objetivo.
+        _best (float|None): El mejor valor visto.
+        _stalled (int): Generaciones seguidas sin mejora.
+
+    """
+
+    def __init__(self, generations, tolerance=0.0, objective=0):
+        """ Constructor de la clase *Stagnation*.
+
+        Args:
+            generations (int): Generaciones sin mejora permitidas.
+            tolerance (float): La mejora mínima.
+            objective (int): El índice del objetivo.
+
+        """
+
+        self._generations = generations
+        self._tolerance = tolerance
+        self._objective = objective
+        self._best = None
+        self._stalled = 0
+
+    def start(self, task):
+        """ Prepara el criterio al iniciar la corrida.
+
+        Args:
+            task (Task): La tarea.
+
+        """
+
+        self._best = None
+        self._stalled = 0
+
+    def check(self, task):
+        """ Indica, al terminar una generación, si se cumple el criterio.
+
+        Args:
+            task (Task): La tarea, con su población ordenada.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        best = _best_value(task, self._objective)
+
+        if self._best is None or _improves(task, self._objective, best,
+                                           self._best, self._tolerance):
+            self._best = best
+            self._stalled = 0
+            return False
+
+        self._stalled += 1
+
+        return self._stalled >= self._generations
+
+    def describe(self):
+        """ Regresa una descripción del criterio.
+
+        Returns:
+            str: La descripción.
+
+        """
+
+        return 'stagnation ({0} generations)'.format(self._generations)
+
+
+class Diversity(StopCriterion):
+    """ Se cumple cuando la diversidad de la población cae por debajo de un
+    umbral. La medida 'genome' es la fracción de genomas distintos (por su
+    llave, ver *get_key*); la medida 'fitness' es la desviación estándar del
+    primer objetivo.
+
+    Attributes:
+        _threshold (float): El umbral.
+        _measure (str): La medida de diversidad.
+
+    """
+
+    def __init__(self, threshold, measure='genome'):
+        """ Constructor de la clase *Diversity*.
+
+        Args:
+            threshold (float): El umbral.
+            measure (str): 'genome' o 'fitness'.
+
+        """
+
+        if measure not in ('genome', 'fitness'):
+            raise ValueError('unknown diversity measure: ' + str(measure))
+
+        self._threshold = threshold
+        self._measure = measure
+
+    def check(self, task):
+        """ Indica, al terminar una generación, si se cumple el criterio.
+
+        Args:
+            task (Task): La tarea, con su población ordenada.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        pop = task.get_population()
+
+        if self._measure == 'genome':
+            value = len({ind.get_key() for ind in pop}) / len(pop)
+        else:
+            value = fitness_stats(pop)[0]['std']
+
+        return value < self._threshold
+
+    def describe(self):
+        """ Regresa una descripción del criterio.
+
+        Returns:
+            str: La descripción.
+
+        """
+
+        return 'diversity ({0} < {1})'.format(self._measure, self._threshold)
+
+
+class Deadline(StopCriterion):
+    """ Se cumple al transcurrir cierta cantidad de segundos desde el inicio
+    de la corrida. A diferencia del argumento *sec* de los algoritmos, se
+    verifica también durante la evaluación, por lo que detiene generaciones
+    largas.
+
+    Attributes:
+        _seconds (float): Los segundos permitidos.
+        _end (float): El momento límite.
+
+    """
+
+    def __init__(self, seconds):
+        """ Constructor de la clase *Deadline*.
+
+        Args:
+            seconds (float): Los segundos permitidos.
+
+        """
+
+        self._seconds = seconds
+        self._end = float('inf')
+
+    def start(self, task):
+        """ Prepara el criterio al iniciar la corrida.
+
+        Args:
+            task (Task): La tarea.
+
+        """
+
+        self._end = time() + self._seconds
+
+    def check(self, task):
+        """ Indica, al terminar una generación, si se cumple el criterio.
+
+        Args:
+            task (Task): La tarea, con su población ordenada.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        return time() >= self._end
+
+    def interrupt(self, task):
+        """ Indica, durante la evaluación, si se cumple el criterio.
+
+        Args:
+            task (Task): La tarea.
+
+        Returns:
+            bool: Verdadero si se cumple el criterio.
+
+        """
+
+        return time() >= self._end
+
+    def describe(self):
+        """ Regresa una descripción del criterio.
+
+        Returns:
+            str: La descripción.
+
+        """
+
+        return 'deadline ({0} s)'.format(self._seconds)
@@ -13,16 +13,29 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
 
+from concurrent.futures import Future
 from copy import copy
-from random import randrange, sample
+from time import perf_counter
+import random
 from .individual import Individual
+from .evaluators import SerialEvaluator, evaluate_genomes_async
+from .utils import spawn_random
+
+# Duración aproximada, en segundos, de cada bloque de una evaluación
+# interrumpible (ver Task.evaluate)
+_INTERRUPT_PERIOD = 0.1
+
+# Evaluaciones incrementales que se encadenan, a lo más, en un linaje; la
+# siguiente es completa, de modo que el error de redondeo no se acumule
+_MAX_DELTA_DEPTH = 16
 
 
 class Task:
     """ Clase base para las tareas.
 
     Attributes:
-        _population (list): La coleción de individuos de la población.
+        _population (list|PopulationStore): La coleción de individuos de la
+            población.
         _current_gen (int):  Indica la generacion actual cuando se está
             aplicando un algoritmo genético sobre la tarea.
         _desired_size (int): La cantidad de individuos deseada para la población
@@ -31,6 +44,10 @@ class Task:
         _target_obj (list): Es un arreglo de índices de objetivos, que se
             usará para las comparaciones y ordenamiento de los individuos de la
             población.
+        _order_spec (tuple): Los objetivos de *_target_obj*, y para cada
+            objetivo si se invierte su signo (maximización). Los individuos
+            memorizan su llave de orden junto con ésta especificación; al
+            cambiar, las llaves memorizadas dejan de ser vigentes.
         _constraints (list): Un arreglo con las funciones que harán las veces de
             restricciones. Para cada función una restricción. Las
             restricciones se evalúan siempre antes que los objetivos. Sólo si se
@@ -43,6 +60,8 @@ class Task:
             la tarea.
         _mutator (func): La función que hará las veces de mutador.
         _mutator_args (dict): Parámetros para la función de mutación.
+        _mutator_batch (bool): Indica si la función de mutación recibe la
+            población completa en lugar de un individuo.
         _crossover (func): La función de cruzamiento.
         _crossover_args (dict): Parámetros para la función de cruzamiento.
         _selector (func): La función selector. Ésta función aplicará la función
@@ -53,9 +72,29 @@ class Task:
             cada objetivo.
         _obj_factors (list): Arreglo con la ponderación de cada función
             objetivo. Un elemento para cada una.
+        _obj_batch (tuple|None): Indica, para cada función objetivo, si evalúa
+            lotes de genomas en una sola llamada. *None* si ninguna lo hace.
         _data (object): Un objeto arbitrario asociado a la Tarea, con datos
             proclives a ser usados por algún algoritmo de cruzamiento,
             selección o mutación.
+        _evaluator (SerialEvaluator): El objeto que calcula el fitness de los
+            individuos sin evaluar (en serie, con hilos o con procesos).
+        _cache (FitnessCache|None): Memoria opcional de valores fitness,
+            consultada antes de evaluar un individuo.
+        _dedupe (str|None): El criterio con el que *remove_duplicates*
+            elimina individuos repetidos: 'fitness', 'genome' o *None*.
+        _dedupe_before (bool): Indica si los individuos sin evaluar con un
+            genoma repetido se eliminan antes de la evaluación.
+        _stats (RunStats|None): Instrumentación opcional, que recibe los
+            contadores de la evaluación.
+        _random (random.Random|None): El generador de números aleatorios de
+            los operadores. *None* para el del módulo *random*.
+        _seed (int|str|None): La semilla del generador, si se estableció con
+            *set_seed*.
+        _evaluations (int): Cantidad de genomas enviados a evaluar desde la
+            creación de la tarea.
+        _chunk_size (int|None): El tamaño de bloque aprendido por la
+            evaluación interrumpible, que se conserva entre llamadas.
 
     """
 
@@ -68,17 +107,29 @@ class Task:
         self._current_gen = None
         self._desired_size = None
         self._target_obj = []
+        self._order_spec = ((), ())
         self._constraints = []
         self._penalties = []
         self._mutator = None
         self._mutator_args = {}
+        self._mutator_batch = False
         self._crossover = None
         self._crossover_args = {}
         self._selector = None
         self._selector_args = {}
         self._objectives = []
         self._obj_factors = []
+        self._obj_batch = None
         self._data = None
+        self._evaluator = SerialEvaluator()
+        self._cache = None
+        self._dedupe = 'fitness'
+        self._dedupe_before = False
+        self._stats = None
+        self._random = None
+        self._seed = None
+        self._evaluations = 0
+        self._chunk_size = None
 
     def get_population(self):
         """ Regresa la población actual de la tarea.
@@ -104,8 +155,10 @@ class Task:
 
         sub = self._population[the_slice]
 
-        for i in range(len(sub)):
-            sub[i] = sub[i].copy()
+        # El corte de un PopulationStore ya es una copia independiente
+        if isinstance(sub, list):
+            for i in range(len(sub)):
+                sub[i] = sub[i].copy()
 
         return sub
 
@@ -198,21 +251,124 @@ class Task:
         else:  # Se deben añadir elementos
             re_evaluate = True
             mutator_args = self._mutator_args
-            while diff:
-                # Se elige un elemento al azar de la población, y se clona
-                index = randrange(current_size)
-                born = pop[index].copy()
+            randrange = self.get_random().randrange
+            if self._mutator_batch:
+                # Se clonan elementos al azar y se mutan de una sola vez
+                borns = [pop[randrange(current_size)].copy()
+                         for _ in range(diff)]
+                self._mutator(self, borns, mutator_args)
+                pop.extend(borns)
+            else:
+                while diff:
+                    # Se elige un elemento al azar de la población, y se clona
+                    index = randrange(current_size)
+                    born = pop[index].copy()
 
-                # Se crea nuevo genoma de mutación
-                self._mutator(self, born, mutator_args)
+                    # Se crea nuevo genoma de mutación
+                    self._mutator(self, born, mutator_args)
 
-                # Se añade a la población
-                pop.append(born)
+                    # Se añade a la población
+                    pop.append(born)
 
-                diff -= 1
+                    diff -= 1
 
         return re_evaluate
 
+    def set_dedupe(self, mode='fitness', before_eval=False):
+        """ Establece cómo se eliminan los individuos repetidos en cada
+        generación (ver *remove_duplicates*).
+
+        Con el modo 'fitness' se eliminan los individuos con fitness idéntico
+        al de su vecino, una vez ordenada la población. Con el modo 'genome'
+        se eliminan los individuos con genoma repetido, en tiempo lineal. Con
+        *None* no se elimina ninguno.
+
+        Si *before_eval* es verdadero, además, los individuos sin evaluar cuyo
+        genoma ya existe en la población se eliminan antes de evaluarse, de
+        modo que no cuestan ninguna llamada a las funciones objetivo.
+
+        Args:
+            mode (str|None): El criterio: 'fitness', 'genome' o *None*.
+            before_eval (bool): Indica si se eliminan repetidos antes de la
+                evaluación.
+
+        """
+
+        if mode not in ('fitness', 'genome', None):
+            raise ValueError('unknown dedupe mode: ' + repr(mode))
+
+        self._dedupe = mode
+        self._dedupe_before = before_eval
+
+    def get_dedupe(self):
+        """ Regresa cómo se eliminan los individuos repetidos.
+
+        Returns:
+            tuple: El criterio, y si se eliminan repetidos antes de evaluar.
+
+        """
+
+        return self._dedupe, self._dedupe_before
+
+    def remove_duplicates(self):
+        """ Ordena la población y elimina los individuos repetidos según el
+        criterio establecido con *set_dedupe*. De cada grupo de repetidos se
+        conserva el mejor. Está función no ajusta la cantidad de individuos
+        deseados en la población.
+
+        """
+
+        if self._dedupe == 'fitness':
+            self.remove_duplicate_fitness()
+        else:
+            self.order_population()
+            if self._dedupe == 'genome':
+                self.remove_duplicate_genomes()
+
+    def remove_duplicate_genomes(self):
+        """ Elimina los individuos con genoma repetido, conservando la primera
+        aparición de cada genoma. Usa un conjunto de llaves (ver *get_key*), por
+        lo que el tiempo es lineal y no requiere ordenar la población. Está
+        función no ajusta la cantidad de individuos deseados en la población.
+
+        """
+
+        pop = self._population
+        seen = set()
+        keep = []
+        for i, ind in enumerate(pop):
+            key = ind.get_key()
+            if key not in seen:
+                seen.add(key)
+                keep.append(i)
+
+        if len(keep) < len(pop):
+            self._population = self._take(keep)
+
+    def _remove_unevaluated_twins(self):
+        """ Elimina los individuos sin evaluar cuyo genoma ya existe en la
+        población. Los individuos evaluados se conservan siempre.
+
+        """
+
+        pop = self._population
+        seen = set()
+        for ind in pop:
+            if ind.get_fitness() is not None:
+                seen.add(ind.get_key())
+
+        keep = []
+        for i, ind in enumerate(pop):
+            if ind.get_fitness() is None:
+                key = ind.get_key()
+                if key in seen:
+                    continue
+                seen.add(key)
+            keep.append(i)
+
+        if len(keep) < len(pop):
+            self._population = self._take(keep)
+
     def remove_duplicate_fitness(self):
         """
         Returns:Elimina los elementos con fitness duplicado. Está función no
@@ -221,17 +377,38 @@ class Task:
         """
 
         self.order_population()
-        real_size = len(self._population)
+        pop = self._population
+        real_size = len(pop)
 
-        new_population = [self._population[0]]
-        current_fit = new_population[0].get_fitness()
+        keep = [0]
+        current_fit = pop[0].get_fitness()
         for i in range(1, real_size):
-            new_fit = self._population[i].get_fitness()
+            new_fit = pop[i].get_fitness()
             if current_fit != new_fit:
-                new_population.append(self._population[i])
+                keep.append(i)
                 current_fit = new_fit
 
-        self._population = new_population
+        self._population = self._take(keep)
+
+    def _take(self, indices):
+        """ Regresa una población nueva con los individuos indicados de la
+        población actual, en ese orden. Conserva el tipo de la población
+        (lista o *PopulationStore*).
+
+        Args:
+            indices (list): Los índices de los individuos.
+
+        Returns:
+            list|PopulationStore: La nueva población.
+
+        """
+
+        pop = self._population
+
+        if isinstance(pop, list):
+            return [pop[i] for i in indices]
+        else:
+            return pop.take(indices)
 
     def get_size(self):
         """ Regresa el número de individuos que realmente hay la población.
@@ -289,32 +466,51 @@ class Task:
         Si el individuo no posee fittnes, se forzará una tupla
         con float('inf').
 
+        La llave se calcula una sola vez, y el individuo la memoriza hasta que
+        cambie su fitness o la especificación de orden de la tarea.
+
         Args:
             a (Individual): Un individuo.
 
         Returns:
-            list: Un arreglo que servirá de llave para ordenar individuos.
+            tuple: Una tupla que servirá de llave para ordenar individuos.
 
         """
+        spec = self._order_spec
+        disc = a.get_order_key(spec)
+        if disc is not None:
+            return disc
+
         a_fit = a.get_fitness()
 
         if a_fit is None:
             a_fit = [float('inf') for _ in range(len(self._obj_factors))]
-        else:
-            a_fit = a_fit[:]
 
-        # Cambiamos signos según se minimiza o maximiza
-        for i in range(len(a_fit)):
-            if self._obj_factors[i] > 0.0:
-                a_fit[i] = -a_fit[i]
+        # Ordenamos según _target_obj, y cambiamos signos según se minimiza o
+        # maximiza
+        target_obj, flip = spec
+        disc = tuple([-a_fit[i] if flip[i] else a_fit[i] for i in target_obj])
 
-        # Ordenamos según _target_obj
-        disc = []
-        for i in self._target_obj:
-            disc.append(a_fit[i])
+        a.set_order_key(spec, disc)
 
         return disc
 
+    def _update_order_spec(self, objectives):
+        """ Actualiza la especificación de orden, sólo si cambiaron los
+        objetivos o sus factores, de modo que las llaves memorizadas por los
+        individuos sigan vigentes en lo posible.
+
+        Args:
+            objectives (tuple): Los índices de los objetivos, en orden.
+
+        """
+
+        flip = tuple(factor > 0.0 for factor in self._obj_factors)
+        if self._order_spec != (objectives, flip):
+            self._order_spec = (objectives, flip)
+
+        self._target_obj = objectives
+
     def order_population(self, objectives=None):
         """ Ordena una población con base del fitness del objetivo seleccionado.
         La función siempre colocará los elementos más favorables según el orden
@@ -335,9 +531,29 @@ class Task:
         """
         if objectives is None:
             objectives = tuple(range(len(self._obj_factors)))
-        self._target_obj = tuple(objectives)
+        self._update_order_spec(tuple(objectives))
+
+        # Timsort detecta los tramos ya ordenados (como la élite al inicio de
+        # la población) y los mezcla en tiempo lineal
         self._population.sort(key=self._individual_order_key)
 
+    def get_best(self, individuals):
+        """ Regresa el mejor de los individuos dados, según el orden de la
+        tarea (ver *order_population*).
+
+        Args:
+            individuals (iterable): Los individuos a comparar.
+
+        Returns:
+            Individual: El mejor individuo.
+
+        """
+
+        if not self._target_obj:
+            self._update_order_spec(tuple(range(len(self._obj_factors))))
+
+        return min(individuals, key=self._individual_order_key)
+
     def get_individual(self, i):
         """ Regresa el individuo de la población especificado.
 
@@ -351,7 +567,7 @@ class Task:
 
         return self._population[i]
 
-    def set_evals(self, evals, factors):
+    def set_evals(self, evals, factors, batch=None):
         """ Función que permite asociar las funciones de evaluación de problema,
         que se provee con *evals*.
 
@@ -361,6 +577,11 @@ class Task:
         Si el valor en *factors* es positivo, se considera un problema de
         maximización, si es negativo se considera de minimización.
 
+        Cada objetivo puede marcarse en *batch* como función por lotes. Una
+        función por lotes recibe una lista de genomas y los datos de la tarea,
+        y regresa una lista con el fitness de cada genoma, en el mismo orden.
+        Así se amortiza el costo de cada llamada (conexiones, modelos, etc.).
+
         Args:
             evals (iterable): Arreglo con los nombres completamente cualificados
                 de las funciones que se utilizarán para evaluar un individuo.
@@ -369,16 +590,24 @@ class Task:
                 considera un problema de maximización, si es negativo se
                 considera de minimización. Debe ser del mismo tamaño que
                 *evals*.
+            batch (iterable|None): Arreglo de valores booleanos que indican
+                qué funciones de evaluación son por lotes. Debe ser del mismo
+                tamaño que *evals*. *None* si ninguna lo es.
 
         """
         try:
-            if len(evals) == len(factors):
+            if len(evals) == len(factors) and \
+                    (batch is None or len(batch) == len(evals)):
                 self._objectives = tuple(evals)
                 self._obj_factors = tuple(factors)
+                if batch is None or not any(batch):
+                    self._obj_batch = None
+                else:
+                    self._obj_batch = tuple(bool(b) for b in batch)
             else:
                 raise ValueError()
         except ValueError:
-            print("Both arguments must be the same size")
+            print("All arguments must be the same size")
 
     def get_obj_factors(self, i=None):
         """ Regresa el arreglo con las ponderaciones de las funciones de
@@ -427,7 +656,7 @@ class Task:
         except ValueError as error:
             print(error.args[0])
 
-    def set_mutator(self, mutator, args=None):
+    def set_mutator(self, mutator, args=None, batch=False):
         """ Establece la función de mutación que se aplicará a los individuos.
 
         La función debe ser capaz de recibir tres parámetros: una referencia al
@@ -435,16 +664,22 @@ class Task:
         diccionario de argumentos. Debe modificar el genoma del individuo
         proporcionado in-situ.
 
+        Si *batch* es verdadero, la función recibe en lugar de un individuo
+        una población completa (la de la tarea, o una lista de individuos), y
+        debe mutarla in-situ de una sola vez.
+
         Args:
             mutator (func): La función de mutación.
             args (dict): Un diccionario con los argumentos de la función de
                 mutación.
+            batch (bool): Indica si la función muta poblaciones completas.
         """
 
         if args is None:
             args = {}
         self._mutator = mutator
         self._mutator_args = args
+        self._mutator_batch = batch
 
     def set_mutator_arg(self, key, value):
         """ Establece el argumento indicado para la función de mutación.
@@ -457,6 +692,16 @@ class Task:
 
         self._mutator_args[key] = value
 
+    def get_mutator_args(self):
+        """ Regresa los argumentos de la función de mutación.
+
+        Returns:
+            dict: Los argumentos de la función de mutación.
+
+        """
+
+        return self._mutator_args
+
     def set_crossover(self, crossover, args=None):
         """ Establece la función de cruza que se aplicará a los individuos.
 
@@ -488,6 +733,16 @@ class Task:
 
         self._crossover_args[key] = value
 
+    def get_crossover_args(self):
+        """ Regresa los argumentos de la función de cruza.
+
+        Returns:
+            dict: Los argumentos de la función de cruza.
+
+        """
+
+        return self._crossover_args
+
     def set_selector(self, selector, args=None):
         """ Establece la función de selección que se aplicará a la población.
 
@@ -520,6 +775,16 @@ class Task:
 
         self._selector_args[key] = value
 
+    def get_selector_args(self):
+        """ Regresa los argumentos de la función de selección.
+
+        Returns:
+            dict: Los argumentos de la función de selección.
+
+        """
+
+        return self._selector_args
+
     def set_data(self, data):
         """ Establece los datos arbitrarios asociados a la tarea.
         Args:
@@ -539,43 +804,604 @@ class Task:
 
         return self._data
 
-    def evaluate(self):
+    def set_evaluator(self, evaluator):
+        """ Establece el evaluador que calculará el fitness de los individuos.
+
+        El evaluador debe poseer un método *evaluate* que reciba un arreglo de
+        genomas (en forma amigable), las restricciones, las penalizaciones, los
+        objetivos y los datos de la tarea, y regrese un arreglo con el fitness
+        de cada genoma en el mismo orden. Ver el módulo *evaluators*.
+
+        Args:
+            evaluator (SerialEvaluator): El evaluador.
+
+        """
+
+        self._evaluator = evaluator
+        self._chunk_size = None
+
+    def get_evaluator(self):
+        """ Regresa el evaluador asociado a la tarea.
+
+        Returns:
+            SerialEvaluator: El evaluador.
+
+        """
+
+        return self._evaluator
+
+    def set_cache(self, cache):
+        """ Establece la memoria de valores fitness de la tarea. Si es *None*,
+        no se memoriza el fitness.
+
+        Args:
+            cache (FitnessCache|None): La memoria de valores fitness.
+
+        """
+
+        self._cache = cache
+
+    def get_cache(self):
+        """ Regresa la memoria de valores fitness de la tarea.
+
+        Returns:
+            FitnessCache|None: La memoria de valores fitness.
+
+        """
+
+        return self._cache
+
+    def set_seed(self, seed):
+        """ Establece un generador de números aleatorios propio de la tarea,
+        con la semilla dada. Todos los operadores incluidos toman sus números
+        de él, por lo que una corrida con semilla es reproducible sin importar
+        el uso del módulo *random* en otras partes del programa, ni la
+        cantidad de trabajadores del evaluador.
+
+        Args:
+            seed (int|str): La semilla.
+
+        """
+
+        self._random = random.Random(seed)
+        self._seed = seed
+
+    def set_random(self, rng):
+        """ Establece el generador de números aleatorios de la tarea. Puede
+        ser cualquier objeto con la interfaz de *random.Random*. Si es *None*,
+        se usa el del módulo *random* (el comportamiento por omisión).
+
+        Args:
+            rng (random.Random|None): El generador.
+
+        """
+
+        self._random = rng
+        self._seed = None
+
+    def get_random(self):
+        """ Regresa el generador de números aleatorios de la tarea.
+
+        Returns:
+            random.Random: El generador (el módulo *random* si la tarea no
+                tiene uno propio).
+
+        """
+
+        if self._random is None:
+            return random
+
+        return self._random
+
+    def get_seed(self):
+        """ Regresa la semilla establecida con *set_seed*.
+
+        Returns:
+            int|str|None: La semilla.
+
+        """
+
+        return self._seed
+
+    def spawn_random(self, key):
+        """ Deriva un generador independiente para un trabajador, una isla u
+        otra tarea, identificado por *key*. Si la tarea tiene semilla, el
+        generador depende sólo de la semilla y de la llave (ver
+        *utils.spawn_random*); si no, su semilla se toma del generador de la
+        tarea.
+
+        Args:
+            key (int|str): La llave del flujo hijo.
+
+        Returns:
+            random.Random: El generador.
+
+        """
+
+        seed = self._seed
+        if seed is None:
+            seed = self.get_random().getrandbits(64)
+
+        return spawn_random(seed, key)
+
+    def set_stats(self, stats):
+        """ Establece la instrumentación de la tarea. Si es *None*, no se
+        cuenta nada.
+
+        Args:
+            stats (RunStats|None): La instrumentación.
+
+        """
+
+        self._stats = stats
+
+    def get_stats(self):
+        """ Regresa la instrumentación de la tarea.
+
+        Returns:
+            RunStats|None: La instrumentación.
+
+        """
+
+        return self._stats
+
+    def get_evaluations(self):
+        """ Regresa la cantidad de genomas enviados a evaluar desde la
+        creación de la tarea. No incluye los resueltos con la memoria de
+        valores fitness ni con evaluación incremental.
+
+        Returns:
+            int: La cantidad de evaluaciones.
+
+        """
+
+        return self._evaluations
+
+    def evaluate(self, interrupt=None):
         """ Evalua los individuos de la población que no posean un fitness. La
         evaluación se efectúa para todas las funciones de evaluación asociadas a
         la tarea.
-        
+
+        Los genomas se envían juntos al evaluador de la tarea, y el fitness
+        resultante se asigna a los individuos en el orden de la población.
+
+        Si la tarea posee una memoria de valores fitness, se consulta antes de
+        evaluar, y se actualiza con los nuevos resultados.
+
+        Si la tarea elimina repetidos antes de evaluar (ver *set_dedupe*), los
+        individuos sin evaluar con un genoma ya presente se eliminan primero.
+
+        Si un objetivo posee un atributo *delta* (una función con la forma
+        delta(genome, moves, old_fitness, data) que regresa el nuevo valor), y
+        el individuo registró los movimientos de sus mutaciones, el objetivo
+        se calcula de forma incremental. Sólo se usa cuando la tarea no tiene
+        restricciones, pues el fitness previo debe provenir de los objetivos.
+        Tras *_MAX_DELTA_DEPTH* evaluaciones incrementales encadenadas, el
+        individuo se evalúa completo.
+
+        Si se da *interrupt*, los genomas se envían por bloques de alrededor
+        de *_INTERRUPT_PERIOD* segundos (en múltiplos de los trabajadores del
+        evaluador), y después de cada bloque se llama a *interrupt* con la
+        tarea (también antes del primero, si la población ya tiene individuos
+        evaluados). Si regresa verdadero, la evaluación se detiene y los
+        individuos sin evaluar se eliminan de la población.
+
+        Args:
+            interrupt (function|None): Función que indica si se debe detener
+                la evaluación (ver *StopCriterion.interrupt*).
+
+        Returns:
+            bool: Verdadero si la evaluación se interrumpió.
+
         """
 
-        data = self._data
+        pending, twins = self._collect_pending(True)
+
+        if not pending:
+            return False
+
+        if interrupt is not None:
+            return self._evaluate_interruptible(pending, twins, interrupt)
+
+        self._evaluations += len(pending)
+        if self._stats is not None:
+            self._count_evaluations(len(pending))
+
+        fits = self._evaluator.evaluate([son.get_genome() for son in pending],
+                                        self._constraints,
+                                        self._penalties,
+                                        self._objectives,
+                                        self._data,
+                                        self._obj_batch)
+
+        self._store_fitness(pending, twins, fits)
+
+        return False
+
+    def _evaluate_interruptible(self, pending, twins, interrupt):
+        """ Evalúa los individuos pendientes por bloques, consultando
+        *interrupt* después de cada uno (ver *evaluate*). Si ningún individuo
+        de la población tiene fitness, el primer bloque se evalúa siempre, de
+        modo que la población nunca queda vacía; si no, *interrupt* se
+        consulta también antes del primer bloque. El tamaño
+        del bloque empieza en la cantidad de trabajadores del evaluador, y se
+        duplica o reduce a la mitad para acercarse a *_INTERRUPT_PERIOD*
+        segundos; el tamaño alcanzado se conserva para la siguiente llamada.
+
+        Args:
+            pending (list): Los individuos a evaluar.
+            twins (dict): Los gemelos de cada individuo, por llave.
+            interrupt (function): Función que indica si se debe detener la
+                evaluación.
+
+        Returns:
+            bool: Verdadero si la evaluación se interrumpió.
+
+        """
+
+        workers = self._evaluator.get_workers()
+        size = self._chunk_size or workers
+        first = 0
+
+        # Individuos que ya tienen fitness (élite, clones, restaurados, etc.)
+        evaluated = len(self._population) - len(pending) - \
+            sum(len(twin_list) for twin_list in twins.values())
 
-        for son in self._population:  # Para cada individuo
+        while first < len(pending):
+            if (first or evaluated) and interrupt(self):
+                self._remove_unevaluated()
+                return True
+
+            chunk = pending[first:first + size]
+            first += size
+
+            self._evaluations += len(chunk)
+            if self._stats is not None:
+                self._count_evaluations(len(chunk))
+
+            start = perf_counter()
+            fits = self._evaluator.evaluate(
+                [son.get_genome() for son in chunk],
+                self._constraints,
+                self._penalties,
+                self._objectives,
+                self._data,
+                self._obj_batch)
+            elapsed = perf_counter() - start
+
+            self._store_fitness(chunk, twins, fits)
+
+            # Un último bloque incompleto y rápido no justifica crecer
+            if elapsed > _INTERRUPT_PERIOD * 2.0 and size > workers:
+                size = max(workers, size // 2)
+            elif elapsed < _INTERRUPT_PERIOD / 2.0 and len(chunk) == size:
+                size *= 2
+            self._chunk_size = size
+
+        return False
+
+    def _remove_unevaluated(self):
+        """ Elimina de la población los individuos sin fitness.
+
+        """
+
+        pop = self._population
+        keep = [i for i, ind in enumerate(pop) if ind.get_fitness() is not None]
+
+        if len(keep) < len(pop):
+            self._population = self._take(keep)
+
+    async def evaluate_async(self, concurrency=None, timeout=None):
+        """ Versión asíncrona de *evaluate*, para funciones objetivo y de
+        restricción que esperan E/S (p.ej. un servicio de simulación). Las
+        funciones definidas con *async def* se ejecutan de forma concurrente
+        (ver *evaluate_genomes_async*); las demás se llaman directamente. Los
+        objetivos por lotes se llaman una sola vez con todos los genomas.
+
+        Si una llamada excede *timeout* segundos, el individuo recibe el peor
+        fitness posible (infinito, con el signo según se minimiza o maximiza),
+        que no se guarda en la memoria de valores fitness.
+
+        No se usa la evaluación incremental (*delta*) ni el evaluador de la
+        tarea.
+
+        Args:
+            concurrency (int|None): Cantidad máxima de llamadas simultáneas.
+                *None* si no hay límite.
+            timeout (float|None): Segundos máximos por llamada. *None* si no
+                hay límite.
+
+        """
+
+        pending, twins = self._collect_pending(False)
+
+        if not pending:
+            return
+
+        self._evaluations += len(pending)
+        if self._stats is not None:
+            self._count_evaluations(len(pending))
+
+        fits = await evaluate_genomes_async(
+            [son.get_genome() for son in pending],
+            self._constraints,
+            self._penalties,
+            self._objectives,
+            self._data,
+            concurrency,
+            timeout,
+            self._obj_batch)
+
+        # Peor fitness posible para los genomas que excedieron el tiempo
+        worst = [float('-inf') if factor > 0.0 else float('inf')
+                 for factor in self._obj_factors]
+        timed_out = [i for i, fit in enumerate(fits) if fit is None]
+        if timed_out:
+            for i in reversed(timed_out):
+                son = pending.pop(i)
+                del fits[i]
+                son.set_fitness(worst[:])
+                for twin in twins.pop(son.get_key(), ()):
+                    twin.set_fitness(worst[:])
+
+        self._store_fitness(pending, twins, fits)
+
+    def _collect_pending(self, use_deltas):
+        """ Recorre la población y resuelve, sin llamar al evaluador, los
+        individuos sin fitness que es posible: con evaluación incremental o con
+        la memoria de valores fitness. Elimina antes los repetidos sin evaluar,
+        si la tarea lo indica.
+
+        Args:
+            use_deltas (bool): Indica si se usa la evaluación incremental.
+
+        Returns:
+            tuple: Los individuos a evaluar, y un diccionario con los
+                individuos de genoma repetido (gemelos) de cada uno, por llave
+                (vacío si no hay memoria de valores fitness).
+
+        """
+
+        if self._dedupe_before:
+            self._remove_unevaluated_twins()
+
+        cache = self._cache
+        pending = []
+        twins = {}  # Individuos con genoma repetido dentro de la evaluación
+
+        deltas = [getattr(objective, 'delta', None)
+                  for objective in self._objectives]
+        if not use_deltas or self._constraints or not any(deltas):
+            deltas = None
+
+        n_deltas = 0
+        n_hits = 0
+
+        for son in self._population:
             if son.get_fitness() is None:  # No tiene fitness calculado
-                fit = []
-                son_genome = son.get_genome()
+                delta = son.get_delta() if deltas is not None else None
+                if delta is not None and delta[2] < _MAX_DELTA_DEPTH:
+                    fit = self._evaluate_delta(son, deltas)
+                    if fit is not None:
+                        son.set_delta_fitness(fit, delta[2] + 1)
+                        if cache is not None:
+                            cache.put(son.get_key(), fit)
+                        n_deltas += 1
+                        continue
+
+                if cache is not None:
+                    key = son.get_key()
+                    fit = cache.get(key)
+                    if fit is not None:
+                        son.set_fitness(fit)
+                        n_hits += 1
+                    elif key in twins:
+                        twins[key].append(son)
+                        n_hits += 1
+                    else:
+                        twins[key] = []
+                        pending.append(son)
+                else:
+                    pending.append(son)
+
+        if self._stats is not None:
+            self._stats.count('delta_evaluations', n_deltas)
+            self._stats.count('cache_hits', n_hits)
+
+        return pending, twins
+
+    def _count_evaluations(self, n):
+        """ Suma a la instrumentación los genomas enviados a evaluar, y las
+        llamadas a funciones objetivo y de restricción que implican. Los
+        genomas que no cumplen las restricciones no llaman a los objetivos,
+        por lo que, con restricciones, *objective_calls* es una cota superior.
+
+        Args:
+            n (int): La cantidad de genomas a evaluar.
+
+        """
+
+        self._stats.count('evaluations', n)
+        self._stats.count('objective_calls', n * len(self._objectives))
+        self._stats.count('constraint_calls', n * len(self._constraints))
+
+    def _store_fitness(self, pending, twins, fits):
+        """ Asigna el fitness calculado a los individuos evaluados y a sus
+        gemelos, y lo guarda en la memoria de valores fitness.
+
+        Args:
+            pending (list): Los individuos evaluados.
+            twins (dict): Los gemelos de cada individuo, por llave.
+            fits (list): El fitness de cada individuo, en el mismo orden.
+
+        """
+
+        cache = self._cache
+
+        for son, fit in zip(pending, fits):
+            son.set_fitness(fit)
+
+        if cache is not None:
+            for son, fit in zip(pending, fits):
+                key = son.get_key()
+                cache.put(key, fit)
+                for twin in twins[key]:
+                    twin.set_fitness(fit[:])
+
+    def submit_evaluation(self, individual):
+        """ Solicita al evaluador de la tarea la evaluación de un individuo,
+        sin esperar el resultado. Si la tarea posee una memoria de valores
+        fitness y contiene el genoma, el resultado está disponible de
+        inmediato.
+
+        El fitness se asigna con *finish_evaluation*.
+
+        Args:
+            individual (Individual): El individuo a evaluar.
+
+        Returns:
+            Future: Un futuro con el fitness del individuo.
+
+        """
+
+        if self._cache is not None:
+            fit = self._cache.get(individual.get_key())
+            if fit is not None:
+                future = Future()
+                future.set_result(fit)
+                return future
+
+        self._evaluations += 1
+
+        return self._evaluator.submit(individual.get_genome(),
+                                      self._constraints,
+                                      self._penalties,
+                                      self._objectives,
+                                      self._data,
+                                      self._obj_batch)
+
+    def finish_evaluation(self, individual, fit):
+        """ Asigna a un individuo el fitness obtenido con *submit_evaluation*,
+        y lo guarda en la memoria de valores fitness.
+
+        Args:
+            individual (Individual): El individuo evaluado.
+            fit (list): El fitness del individuo.
+
+        """
+
+        individual.set_fitness(fit)
+
+        if self._cache is not None:
+            self._cache.put(individual.get_key(), fit)
+
+    def insert_individual(self, individual):
+        """ Inserta un individuo evaluado en la población ordenada, en la
+        posición que le corresponde (búsqueda binaria), después de los
+        individuos igual de aptos. Si la población excede el tamaño deseado,
+        se elimina el peor.
+
+        El individuo no se inserta si resulta peor que todos los de una
+        población completa, o si está repetido según el criterio de
+        *set_dedupe*.
+
+        Args:
+            individual (Individual): El individuo a insertar.
+
+        Returns:
+            bool: Verdadero si el individuo se insertó.
 
-                # Calculamos las restricciones
-                failed = 0
-                for constrain in self._constraints:
-                    failed += constrain(son_genome, data)
+        """
 
-                if not failed:  # Calculamos objetivos si cumple restric.
-                    for objective in self._objectives:
-                        fit.append(objective(son_genome, data))
-                else:  # Aplicamos penalización si no cumple restricciones
-                    for penalty in self._penalties:
-                        fit.append(penalty * failed)
+        pop = self._population
+        key = self._individual_order_key
+        ind_key = key(individual)
+
+        lo = 0
+        hi = len(pop)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ind_key < key(pop[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+
+        if lo >= self._desired_size:
+            return False
+
+        # Los repetidos tienen la misma llave, y quedan justo antes
+        if self._dedupe is not None:
+            fit = individual.get_fitness()
+            genome_key = individual.get_key()
+            i = lo - 1
+            while i >= 0 and key(pop[i]) == ind_key:
+                if self._dedupe == 'fitness':
+                    if pop[i].get_fitness() == fit:
+                        return False
+                elif pop[i].get_key() == genome_key:
+                    return False
+                i -= 1
+
+        pop.insert(lo, individual)
+        if len(pop) > self._desired_size:
+            pop.pop()
+
+        return True
+
+    def _evaluate_delta(self, son, deltas):
+        """ Calcula el fitness de un individuo de forma incremental, a partir
+        del fitness previo y los movimientos registrados por sus mutaciones.
+        Los objetivos sin evaluación incremental se calculan completos.
 
-                son.set_fitness(fit)
+        Args:
+            son (Individual): El individuo a evaluar.
+            deltas (list): La función *delta* de cada objetivo, o *None*.
 
-    def mutate(self):
+        Returns:
+            list|None: El fitness del individuo, o *None* si alguna función
+                *delta* no pudo calcularlo.
+
+        """
+
+        old_fit, moves, _ = son.get_delta()
+        genome = son.get_genome()
+        data = self._data
+        batch = self._obj_batch or (False,) * len(self._objectives)
+
+        fit = []
+        for i, objective in enumerate(self._objectives):
+            delta = deltas[i]
+            if delta is not None:
+                value = delta(genome, moves, old_fit[i], data)
+                if value is None:
+                    return None
+            elif batch[i]:
+                value = objective([genome], data)[0]
+            else:
+                value = objective(genome, data)
+            fit.append(value)
+
+        return fit
+
+    def mutate(self, individuals=None):
         """ Aplica la función de mutación a todos los individuos de la
-        población.
+        población, o sólo a los indicados.
+
+        Args:
+            individuals (list|None): Los individuos a mutar. Si es *None*, se
+                muta la población completa.
 
         """
 
+        if individuals is None:
+            individuals = self._population
+
         mutator_args = self._mutator_args
-        for ind in self._population:
-            self._mutator(self, ind, mutator_args)
+        if self._mutator_batch:
+            self._mutator(self, individuals, mutator_args)
+        else:
+            for ind in individuals:
+                self._mutator(self, ind, mutator_args)
 
     def apply_selection(self):
         """ Aplica la selección y cruza especificados.
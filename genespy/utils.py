@@ -15,16 +15,19 @@
 
 from sys import maxsize
 from math import ceil, floor, log, sqrt, cos, sin, asin, pi, radians
-from random import random
+import random as random_module
+from random import Random, random
 
 
-def geometric_dist(p):
+def geometric_dist(p, rand=random):
     """Genera una variable aleatoria con distribución geométrica con
     probabilidad *p*.
 
     Args:
         p (float): Probabilidad del ensayo binomial correspondiente al proceso
             geométrico.
+        rand (function): La función que genera números uniformes en [0, 1),
+            p.ej. el método *random* del generador de la tarea.
 
     Returns:
         int: Un valor que corresponde a la variable aleatoria.
@@ -36,10 +39,10 @@ def geometric_dist(p):
     elif p == 0.0:
         return maxsize
     else:
-        return ceil(log(1.0 - random(), 1.0 - p))
+        return ceil(log(1.0 - rand(), 1.0 - p))
 
 
-def gauss_dist(mean, sd, integer):
+def gauss_dist(mean, sd, integer, rand=random):
     """ Regresa una variable aleatoria distribuida normalmente. Si *integer*
     está establecido como verdadero, el valor se redondea al entero más próximo.
 
@@ -48,14 +51,15 @@ def gauss_dist(mean, sd, integer):
         sd (float): La desviación estándar de la distribución.
         integer (bool): Una bandera que indica si debe regresarse un valor
             entero.
+        rand (function): La función que genera números uniformes en [0, 1).
 
     Returns:
         float|int: Un valor distribuido normalmente.
 
     """
 
-    x = 1.0 - random()
-    y = random()
+    x = 1.0 - rand()
+    y = rand()
     v = sqrt(-2.0 * log(x)) * cos(2.0 * pi * y) * sd + mean
 
     if integer:
@@ -64,6 +68,43 @@ def gauss_dist(mean, sd, integer):
         return v
 
 
+def task_random(task):
+    """ Regresa el generador de números aleatorios de una tarea (ver
+    *Task.get_random*), o el del módulo *random* si no hay tarea.
+
+    Args:
+        task (Task|None): La tarea.
+
+    Returns:
+        random.Random: El generador.
+
+    """
+
+    if task is None:
+        return random_module
+
+    return task.get_random()
+
+
+def spawn_random(seed, key):
+    """ Deriva un generador de números aleatorios independiente a partir de
+    una semilla y una llave (p.ej. el número de isla o de tarea). La semilla
+    de texto se procesa con SHA-512, por lo que el resultado es el mismo en
+    cualquier proceso y plataforma, y las llaves distintas producen flujos
+    independientes.
+
+    Args:
+        seed (int|str): La semilla base.
+        key (int|str): La llave del flujo hijo.
+
+    Returns:
+        random.Random: El generador.
+
+    """
+
+    return Random('{0}/{1}'.format(seed, key))
+
+
 def dec_to_bin(num, sign, i_dig, d_dig):
     """ Convierte un número flotante a una expresión binaria de punto fijo.
     Se buscará encontrar la expresión binaria más cercana posible al número,
@@ -100,16 +141,16 @@ def dec_to_bin(num, sign, i_dig, d_dig):
         numint = floor(abs_num)
         numdec = abs_num - numint
 
-        # Se crea la parte entera
-        binint = bytearray('{0:b}'.format(numint).zfill(i_dig), 'ascii')
+        # Se crea la parte entera (una parte de cero dígitos se omite)
+        if i_dig:
+            binint = bytearray('{0:b}'.format(numint).zfill(i_dig), 'ascii')
+            binary.extend(binint)
 
         # Se crea la parte decimal
-        numdec = floor(numdec * 2**d_dig)
-        bindec = bytearray('{0:b}'.format(numdec).zfill(d_dig), 'ascii')
-
-        # Se arma la cadena final
-        binary.extend(binint)
-        binary.extend(bindec)
+        if d_dig:
+            numdec = floor(numdec * 2**d_dig)
+            bindec = bytearray('{0:b}'.format(numdec).zfill(d_dig), 'ascii')
+            binary.extend(bindec)
 
     return binary
 
@@ -218,3 +259,238 @@ def travel_cost(genome, data):
         cost += matrix[genome[-1]][data['start']]
 
     return cost
+
+
+def _move_edges(move, size):
+    """ Regresa las aristas de un recorrido que cambian con un movimiento.
+    La arista *e* es la que llega a la posición *e* del genoma; la arista 0
+    sale del punto de partida, y la arista *size* regresa a él.
+
+    Args:
+        move (tuple): El movimiento ('swap', j, k) o ('insert', a, b).
+        size (int): La longitud del genoma.
+
+    Returns:
+        tuple: Las aristas afectadas después y antes del movimiento.
+
+    """
+
+    if move[0] == 'swap':
+        j, k = move[1], move[2]
+        edges = {j, j + 1, k, k + 1}
+        return edges, edges
+    else:  # insert: A B C -> A C B
+        a, b = move[1], move[2]
+        return {a, a + size - b, size}, {a, b, size}
+
+
+def _undo_move(genome, move):
+    """ Deshace in-situ un movimiento sobre un genoma.
+
+    Args:
+        genome (list): El genoma posterior al movimiento.
+        move (tuple): El movimiento ('swap', j, k) o ('insert', a, b).
+
+    """
+
+    if move[0] == 'swap':
+        j, k = move[1], move[2]
+        genome[j], genome[k] = genome[k], genome[j]
+    else:  # A C B -> A B C
+        a, b = move[1], move[2]
+        split = a + len(genome) - b
+        genome[a:] = genome[split:] + genome[a:split]
+
+
+def _redo_move(genome, move):
+    """ Aplica in-situ un movimiento sobre un genoma.
+
+    Args:
+        genome (list): El genoma previo al movimiento.
+        move (tuple): El movimiento ('swap', j, k) o ('insert', a, b).
+
+    """
+
+    if move[0] == 'swap':
+        _undo_move(genome, move)
+    else:  # A B C -> A C B
+        a, b = move[1], move[2]
+        genome[a:] = genome[b:] + genome[a:b]
+
+
+def _delta_cost(genome, moves, edge):
+    """ Calcula el cambio de costo de un recorrido producido por una
+    secuencia de movimientos. Los movimientos se deshacen en orden inverso,
+    sumando las aristas que cambian en cada uno, y al final se rehacen.
+
+    Args:
+        genome (list): El genoma posterior a los movimientos.
+        moves (tuple): Los movimientos aplicados, en orden.
+        edge (function): Regresa el costo de la arista *e* del genoma actual.
+
+    Returns:
+        float: El costo posterior menos el costo previo a los movimientos.
+
+    """
+
+    size = len(genome)
+
+    delta = 0.0
+    for move in reversed(moves):
+        edges_after, edges_before = _move_edges(move, size)
+        for e in edges_after:
+            delta += edge(e)
+        _undo_move(genome, move)
+        for e in edges_before:
+            delta -= edge(e)
+
+    for move in moves:
+        _redo_move(genome, move)
+
+    return delta
+
+
+def travel_cost_delta(genome, moves, old_fitness, data):
+    """ Costo de un viaje del tipo *agente viajero*, calculado de forma
+    incremental a partir del costo previo a los movimientos aplicados por
+    *mutate_swap* y *mutate_insert*. Sólo se recalculan las aristas que
+    cambian con cada movimiento.
+
+    El genoma se modifica temporalmente (se deshacen y rehacen los
+    movimientos), y queda intacto al terminar.
+
+    Args:
+        genome (list): El genoma a evaluar (posterior a los movimientos).
+        moves (tuple): Los movimientos aplicados, en orden.
+        old_fitness (float): El costo del genoma previo a los movimientos.
+        data (object): Un objeto arbitrario.
+
+    Returns:
+        float: La evaluación del individuo.
+
+    """
+
+    matrix = data['cost']
+    start = data['start']
+    circuit = data['circuit']
+    size = len(genome)
+
+    def edge(e):
+        if e == 0:
+            return matrix[start][genome[0]]
+        elif e < size:
+            return matrix[genome[e - 1]][genome[e]]
+        elif circuit:
+            return matrix[genome[-1]][start]
+        else:
+            return 0.0
+
+    return old_fitness + _delta_cost(genome, moves, edge)
+
+
+def travel_cost_dense(genome, data):
+    """ Costo de un viaje del tipo *agente viajero*, con una matriz de costos
+    densa (*CostMatrix*). El genoma y el punto de partida (*data['start']*)
+    son índices enteros de la matriz.
+
+    Args:
+        genome (list): El genoma a evaluar.
+        data (object): Un objeto arbitrario.
+
+    Returns:
+        float: La evaluación del individuo.
+
+    """
+
+    matrix = data['cost']
+    values = matrix.get_values()
+    size = matrix.get_size()
+    start = data['start']
+
+    cost = values[start * size + genome[0]]
+
+    prev = genome[0]
+    for node in genome[1:]:
+        cost += values[prev * size + node]
+        prev = node
+
+    if data['circuit']:
+        cost += values[prev * size + start]
+
+    return cost
+
+
+def travel_cost_dense_delta(genome, moves, old_fitness, data):
+    """ Versión incremental de *travel_cost_dense* (ver *travel_cost_delta*).
+
+    Args:
+        genome (list): El genoma a evaluar (posterior a los movimientos).
+        moves (tuple): Los movimientos aplicados, en orden.
+        old_fitness (float): El costo del genoma previo a los movimientos.
+        data (object): Un objeto arbitrario.
+
+    Returns:
+        float: La evaluación del individuo.
+
+    """
+
+    matrix = data['cost']
+    values = matrix.get_values()
+    n = matrix.get_size()
+    start = data['start']
+    circuit = data['circuit']
+    size = len(genome)
+
+    def edge(e):
+        if e == 0:
+            return values[start * n + genome[0]]
+        elif e < size:
+            return values[genome[e - 1] * n + genome[e]]
+        elif circuit:
+            return values[genome[-1] * n + start]
+        else:
+            return 0.0
+
+    return old_fitness + _delta_cost(genome, moves, edge)
+
+
+def travel_cost_incremental(genome, data):
+    """ Igual que *travel_cost*, pero con evaluación incremental: los
+    individuos que sólo cambiaron por *mutate_swap* o *mutate_insert* se
+    evalúan con *travel_cost_delta* (ver *Task.evaluate*).
+
+    El costo así calculado puede diferir del exacto por el error de redondeo
+    acumulado, por lo que conviene eliminar repetidos por genoma (ver
+    *Task.set_dedupe*) en lugar de por fitness.
+
+    Args:
+        genome (list): El genoma a evaluar.
+        data (object): Un objeto arbitrario.
+
+    Returns:
+        float: La evaluación del individuo.
+
+    """
+
+    return travel_cost(genome, data)
+
+
+def travel_cost_dense_incremental(genome, data):
+    """ Igual que *travel_cost_dense*, pero con evaluación incremental (ver
+    *travel_cost_incremental*).
+
+    Args:
+        genome (list): El genoma a evaluar.
+        data (object): Un objeto arbitrario.
+
+    Returns:
+        float: La evaluación del individuo.
+
+    """
+
+    return travel_cost_dense(genome, data)
+
+
+# Evaluación incremental usada por Task.evaluate
+travel_cost_incremental.delta = travel_cost_delta
+travel_cost_dense_incremental.delta = travel_cost_dense_delta
@@ -0,0 +1,476 @@
+# This file is part of GenesPy.
+#
+# GenesPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# GenesPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with GenesPy. If not, see <http://www.gnu.org/licenses/>.
+
+import random
+from .individual import Individual
+from .utils import task_random
+from .population import PopulationStore
+from .evaluators import SerialEvaluator
+from .mutators import mutate_normal
+from .selectors import select_vasconcelos
+
+# Módulo opcional: sólo está activo si NumPy puede importarse
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def numpy_available():
+    """ Indica si NumPy está disponible, y por lo tanto este módulo.
+
+    Returns:
+        bool: Verdadero si NumPy puede usarse.
+
+    """
+
+    return np is not None
+
+
+def _require_numpy():
+    """ Lanza una excepción si NumPy no está disponible.
+
+    """
+
+    if np is None:
+        raise ImportError('NumPy is required by genespy.vectorized')
+
+
+def _generator(rng=None):
+    """ Crea un generador de NumPy sembrado desde el generador de la tarea (o
+    desde el módulo *random*), de modo que *Task.set_seed* y *random.seed*
+    hacen reproducibles también los operadores vectorizados.
+
+    Args:
+        rng (random.Random|None): El generador del que se toma la semilla.
+            *None* para el del módulo *random*.
+
+    Returns:
+        numpy.random.Generator: El generador.
+
+    """
+
+    if rng is None:
+        rng = random
+
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+class MatrixPopulation(PopulationStore):
+    """ Población de genomas flotantes almacenada como una matriz de NumPy de
+    *n* filas (individuos) por *width* columnas (genes).
+
+    La matriz reserva filas adicionales para que agregar individuos no copie
+    toda la población cada vez.
+
+    """
+
+    def __init__(self, prototype, width, n_obj=None):
+        """ Constructor de la clase *MatrixPopulation*. Crea una población
+        vacía.
+
+        Args:
+            prototype (Individual): Un individuo plantilla.
+            width (int): La longitud de cada genoma.
+            n_obj (int|None): La cantidad de valores fitness por individuo.
+
+        """
+
+        _require_numpy()
+        super().__init__(prototype, 'd', width, n_obj)
+
+    @classmethod
+    def from_individuals(cls, pop):
+        """ Crea una población matricial a partir de una lista de individuos
+        con genomas flotantes de igual tamaño.
+
+        Args:
+            pop (list): Un arreglo de individuos.
+
+        Returns:
+            MatrixPopulation: La población.
+
+        """
+
+        first = pop[0]
+        store = cls(first.copy(), len(first.get_raw_genome()))
+        store.extend(pop)
+
+        return store
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """ Crea una población sin evaluar a partir de una matriz de genomas.
+
+        Args:
+            matrix (numpy.ndarray): Una matriz de *n* genomas por *width*
+                genes.
+
+        Returns:
+            MatrixPopulation: La población.
+
+        """
+
+        matrix = np.array(matrix, dtype=np.float64, ndmin=2)
+        n, width = matrix.shape
+        store = cls(Individual(matrix[0].tolist()), width)
+        store._genomes = matrix
+        store._evaluated = bytearray(n)
+        store._data = [None] * n
+        store._size = n
+
+        return store
+
+    def _empty_like(self):
+        """ Crea una población vacía con los mismos parámetros.
+
+        Returns:
+            MatrixPopulation: La población vacía.
+
+        """
+
+        return self.__class__(self._prototype, self._width, self._n_obj)
+
+    def _new_genome_buffer(self):
+        """ Crea una matriz de genomas vacía.
+
+        Returns:
+            numpy.ndarray: La matriz.
+
+        """
+
+        return np.empty((0, self._width))
+
+    def _reserve(self, n):
+        """ Asegura que la matriz tenga espacio para al menos *n* filas.
+
+        Args:
+            n (int): La cantidad de filas requerida.
+
+        """
+
+        capacity = self._genomes.shape[0]
+        if n > capacity:
+            new = np.empty((max(n, 2 * capacity), self._width))
+            new[:self._size] = self._genomes[:self._size]
+            self._genomes = new
+
+    def _append_genome(self, genome):
+        """ Agrega un genoma en bruto al final de la matriz.
+
+        Args:
+            genome (iterable): El genoma en bruto.
+
+        """
+
+        if len(genome) != self._width:
+            raise ValueError('all genomes in a PopulationStore must have ' +
+                             'the same size')
+
+        self._reserve(self._size + 1)
+        self._genomes[self._size] = genome
+
+    def _extend_genomes(self, store):
+        """ Agrega al final de la matriz los genomas de otra población
+        matricial.
+
+        Args:
+            store (MatrixPopulation): La otra población.
+
+        """
+
+        self._reserve(self._size + store._size)
+        self._genomes[self._size:self._size + store._size] = \
+            store._genomes[:store._size]
+
+    def _take_genomes(self, indices):
+        """ Crea una matriz con los genomas indicados, en ese orden.
+
+        Args:
+            indices (list): Los índices de los genomas.
+
+        Returns:
+            numpy.ndarray: La nueva matriz.
+
+        """
+
+        return self._genomes[np.asarray(indices, dtype=np.intp)]
+
+    def get_genome_matrix(self):
+        """ Regresa la matriz de genomas (sin copiar). Los cambios hechos en
+        ella se reflejan en la población; los individuos alterados deben
+        marcarse con *invalidate*.
+
+        Returns:
+            numpy.ndarray: Una matriz de *n* genomas por *width* genes.
+
+        """
+
+        return self._genomes[:self._size]
+
+    def invalidate(self, rows):
+        """ Marca como no evaluados los individuos indicados.
+
+        Args:
+            rows (iterable): Los índices de los individuos.
+
+        """
+
+        evaluated = np.frombuffer(self._evaluated, dtype=np.uint8)
+        evaluated[np.asarray(rows, dtype=np.intp)] = 0
+        del evaluated
+
+    def get_raw_genome(self, index):
+        """ Regresa una copia del genoma en bruto del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            list: El genoma en bruto.
+
+        """
+
+        return self._genomes[index].tolist()
+
+    def set_raw_genome(self, index, genome):
+        """ Establece el genoma en bruto del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+            genome (iterable): El genoma en bruto.
+
+        """
+
+        if len(genome) != self._width:
+            raise ValueError('all genomes in a PopulationStore must have ' +
+                             'the same size')
+
+        self._genomes[index] = genome
+
+    def decode(self, index):
+        """ Regresa el genoma en forma amigable del individuo indicado, como
+        un vector de NumPy.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            numpy.ndarray: El genoma.
+
+        """
+
+        return self._genomes[index].copy()
+
+    def encode(self, index, genome):
+        """ Establece el genoma en forma amigable del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+            genome (iterable): El genoma.
+
+        """
+
+        self.set_raw_genome(index, genome)
+
+    def get_key(self, index):
+        """ Regresa una forma inmutable del genoma del individuo indicado.
+
+        Args:
+            index (int): La posición del individuo.
+
+        Returns:
+            bytes: Los bytes del genoma.
+
+        """
+
+        return self._genomes[index].tobytes()
+
+
+class MatrixEvaluator(SerialEvaluator):
+    """ Evaluador para funciones vectorizadas. Las restricciones y objetivos
+    de la tarea reciben la matriz con todos los genomas pendientes y los
+    datos de la tarea, y regresan un vector con un valor por genoma.
+
+    A diferencia de la evaluación escalar, los objetivos se calculan también
+    para los genomas que no cumplen las restricciones; su fitness se
+    sustituye después por la penalización correspondiente.
+
+    """
+
+    def evaluate(self,
+                 genomes,
+                 constraints,
+                 penalties,
+                 objectives,
+                 data,
+                 batch=None):
+        """ Evalúa los genomas proporcionados con funciones vectorizadas.
+
+        Args:
+            genomes (list): Un arreglo de genomas.
+            constraints (tuple): Las restricciones vectorizadas.
+            penalties (tuple): Las penalizaciones por restricción fallida.
+            objectives (tuple): Los objetivos vectorizados.
+            data (object): Los datos arbitrarios asociados a la tarea.
+            batch (tuple|None): Ignorado; todas las funciones son
+                vectorizadas.
+
+        Returns:
+            list: Un arreglo con el fitness de cada genoma, en el mismo orden.
+
+        """
+
+        matrix = np.asarray(genomes, dtype=np.float64)
+        n = matrix.shape[0]
+
+        fits = np.empty((n, len(objectives)))
+        for i, objective in enumerate(objectives):
+            fits[:, i] = objective(matrix, data)
+
+        if constraints:
+            failed = np.zeros(n)
+            for constrain in constraints:
+                failed += constrain(matrix, data)
+
+            bad = failed > 0
+            fits[bad] = np.outer(failed[bad], penalties)
+
+        return fits.tolist()
+
+
+def init_float_matrix_pop(n, numbers, minimum, maximum, rng=None):
+    """ Crea una población matricial de tamaño *n* de individuos con un
+    genoma que almacena números flotantes. Equivalente vectorizado de
+    *init_float_pop*.
+
+    Args:
+        n (int): Cantidad de individuos a crear.
+        numbers (int): Cantidad de números almacenados en un genoma.
+        minimum (float): Valor mínimo del rango del cual se tomarán los números.
+        maximum (float): Valor máximo del rango del cual se tomarán los números.
+        rng (random.Random|None): El generador del que se toma la semilla.
+            *None* para el del módulo *random*.
+
+    Returns:
+        MatrixPopulation: La población.
+
+    """
+
+    _require_numpy()
+
+    # Se forzan al menos dos individuos
+    if n < 2:
+        n = 2
+
+    return MatrixPopulation.from_matrix(
+        _generator(rng).uniform(minimum, maximum, (n, numbers)))
+
+
+def mutate_normal_matrix(task, population, args):
+    """ Muta una población completa in-situ, alterando de forma normal los
+    valores de los genes elegidos al azar. Equivalente vectorizado de
+    *mutate_normal*; debe registrarse con *batch=True* en *Task.set_mutator*.
+
+    Si la población no es una *MatrixPopulation* (p.ej., los individuos
+    nuevos de *Task.adjust_population_size*), se muta cada individuo con
+    *mutate_normal*.
+
+    Args:
+        task (Task): Una referencia a la tarea asociada.
+        population (MatrixPopulation|list): La población a mutar.
+        args (dict): Un diccionario con los parámetros propios de este
+            método. *mp* como la probabilidad de que un gen sea mutado, *sd*
+            como la desviación estándar aplicada a la mutación, *integer*, si
+            se desea que los valores que se establezcan en el genoma sean
+            enteros.
+
+    """
+
+    if not isinstance(population, MatrixPopulation):
+        for individual in population:
+            mutate_normal(task, individual, args)
+        return
+
+    mp = args['mp']
+    sd = args['sd']
+    integer = args.get('integer', False)
+
+    matrix = population.get_genome_matrix()
+    gen = _generator(task_random(task))
+
+    mask = gen.random(matrix.shape) < mp
+    np.add(matrix, gen.normal(0.0, sd, matrix.shape), out=matrix, where=mask)
+    if integer:
+        np.rint(matrix, out=matrix, where=mask)
+
+    population.invalidate(np.flatnonzero(mask.any(axis=1)))
+
+
+def select_vasconcelos_matrix(task, args):
+    """ Realiza cruzas con el método Vasconcelos (mejor contra peor), con
+    probabilidad *cp*, cruzando todas las parejas elegidas de una sola vez
+    sobre la matriz de genomas. Los hijos sustituyen a los padres.
+
+    Si la población no es una *MatrixPopulation*, se usa
+    *select_vasconcelos* con la función de cruza de la tarea.
+
+    Args:
+        task (Task): Una referencia la tarea invoulcrada.
+        args (dict): Un arreglo con los argumentos propios de la función. *cp*
+            indica la propabilidad de cruzamiento. *points* (1 por omisión)
+            indica si la cruza es de uno o dos puntos de corte.
+
+    """
+
+    population = task.get_population()
+    if not isinstance(population, MatrixPopulation):
+        select_vasconcelos(task, args)
+        return
+
+    cp = args['cp']
+    points = args.get('points', 1)
+    matrix = population.get_genome_matrix()
+    n, width = matrix.shape
+    gen = _generator(task_random(task))
+
+    # Parejas mejor contra peor, y las que efectivamente se cruzan
+    mayor = n - 1
+    minor = np.arange(mayor // 2 + 1)
+    chosen = gen.random(minor.shape[0]) < cp
+    rows_a = minor[chosen]
+    rows_b = mayor - rows_a
+    if not rows_a.shape[0]:
+        return
+
+    # Máscara de genes que cada hijo izquierdo toma del padre 'b'
+    columns = np.arange(width)
+    if points == 1:
+        cuts = gen.integers(1, width, rows_a.shape[0])
+        from_b = columns >= cuts[:, None]
+    else:
+        cut_a = gen.integers(0, width, rows_a.shape[0])
+        cut_b = gen.integers(0, width - 1, rows_a.shape[0])
+        cut_b += cut_b >= cut_a
+        low = np.minimum(cut_a, cut_b)
+        high = np.maximum(cut_a, cut_b)
+        from_b = (columns >= low[:, None]) & (columns < high[:, None])
+
+    parents_a = matrix[rows_a]
+    parents_b = matrix[rows_b]
+    matrix[rows_a] = np.where(from_b, parents_b, parents_a)
+    matrix[rows_b] = np.where(from_b, parents_a, parents_b)
+
+    population.invalidate(np.concatenate((rows_a, rows_b)))